@@ -0,0 +1,73 @@
+"""
+Throughput of the CSV engines of PDLoader on synthetic datasets
+
+Usage:
+    python benchmarks/csv_engines.py [--rows 1000000] [--repeat 3]
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from file_navigator import loaders
+
+ENGINES = ('c', 'pyarrow', 'polars')
+
+def _datasets(rows, seed = 0):
+    """
+    Private generator creating the synthetic datasets.
+
+    Returns
+    -------
+    Generator[Tuple[str, pandas.DataFrame]]
+        Generator containing the dataset name and its data.
+    """
+    rng = np.random.default_rng(seed)
+    yield 'numeric', pd.DataFrame(rng.normal(size=(rows, 8)),
+                                  columns=[f'f{i}' for i in range(8)])
+    yield 'mixed', pd.DataFrame({
+        'timestamp': pd.date_range('2020-01-01', periods=rows, freq='s').astype(str),
+        'symbol': rng.choice(['EURUSD', 'GBPUSD', 'USDJPY', 'AUDCAD'], rows),
+        'bid': rng.normal(1, 0.01, rows).round(5),
+        'ask': rng.normal(1, 0.01, rows).round(5),
+        'volume': rng.integers(0, 10000, rows)})
+    yield 'wide', pd.DataFrame(rng.integers(0, 1000, size=(max(rows // 20, 1), 200)),
+                               columns=[f'c{i}' for i in range(200)])
+
+def _available(engine):
+    """
+    Private function checking whether an engine is installed, so it won't fall back.
+    """
+    if engine == 'pyarrow':
+        return loaders.pa is not None
+    if engine == 'polars':
+        return loaders._pl is not None and loaders.pa is not None
+    return True
+
+def main(rows, repeat):
+    print(f"{'dataset':<10}{'engine':<10}{'MB':>8}{'seconds':>10}{'MB/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, data in _datasets(rows):
+            path = os.path.join(tmp, f'{name}.csv')
+            data.to_csv(path, index=False)
+            size = os.path.getsize(path) / 2 ** 20
+            for engine in ENGINES:
+                if not _available(engine):
+                    print(f'{name:<10}{engine:<10}{"not installed":>28}')
+                    continue
+                best = min(_timed(path, engine) for _ in range(repeat))
+                print(f'{name:<10}{engine:<10}{size:>8.1f}{best:>10.3f}{size / best:>10.1f}')
+
+def _timed(path, engine):
+    # the loading function is timed directly, BaseLoader.load caches its results
+    start = time.perf_counter()
+    loaders._read_csv(path, engine=engine)
+    return time.perf_counter() - start
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -1,9 +1,33 @@
 #
-from .abc_loader import ABLoader, BaseLoader
-from .loaders import PDLoader
-from .pathfinder import PathFinder
+import sys
 
-__all__ = ['PathFinder','ABLoader', 'BaseLoader', 'PDLoader']
+__all__ = ['PathFinder', 'Q', 'Query', 'ABLoader', 'BaseLoader', 'PDLoader', 'ArrowLoader',
+           'LoadTelemetry']
+
+# public objects are imported from their modules on first access, so that
+# the daemon client doesn't pay for pandas, asyncio and the rest of the package
+# (module __getattr__ requires Python 3.7)
+_LAZY = {'PathFinder': 'pathfinder', 'Q': 'query', 'Query': 'query',
+         'ABLoader': 'abc_loader', 'BaseLoader': 'abc_loader',
+         'PDLoader': 'loaders', 'ArrowLoader': 'loaders', 'LoadTelemetry': 'telemetry'}
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name in _LAZY:
+            from importlib import import_module
+            value = getattr(import_module(f'.{_LAZY[name]}', __name__), name)
+            globals()[name] = value
+            return value
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY))
+else:
+    from .abc_loader import ABLoader, BaseLoader
+    from .loaders import ArrowLoader, PDLoader
+    from .pathfinder import PathFinder
+    from .query import Q, Query
+    from .telemetry import LoadTelemetry
 
 __version__ = "0.1.5"
 __author__ = "Qomp4ss"
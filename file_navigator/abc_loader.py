@@ -2,9 +2,33 @@
 Abstract & Concrete Loader classes
 """
 from abc import ABC, abstractmethod
+import bz2
+import gzip
 import inspect
+import lzma
+from contextlib import ExitStack
 from pathlib import Path
 from functools import lru_cache
+from .archive import _open_member, _split_member
+from .telemetry import _measure
+
+try:
+    import zstandard as _zstd
+except ImportError:
+    _zstd = None
+
+def _zstd_reader(file):
+    """
+    Private function returning a streaming zstd decompressor of a binary file.
+    """
+    if _zstd is None:
+        raise ImportError('zstandard package is required to load .zst files')
+    return _zstd.ZstdDecompressor().stream_reader(file)
+
+_DECOMPRESSORS = {'.gz': lambda file: gzip.GzipFile(fileobj=file, mode='rb'),
+                  '.bz2': bz2.BZ2File,
+                  '.xz': lzma.LZMAFile,
+                  '.zst': _zstd_reader}
 
 class ABLoader(ABC):
     """
@@ -25,34 +49,71 @@ class ABLoader(ABC):
         """
         raise NotImplementedError("This has to be implemented")
 
+    def schema(self, path, **kwargs):
+        """
+        Function for reading the schema of data without loading all of it.
+
+        Loaders don't have to implement it, _PathManager.schemas requires it.
+
+        Parameters
+        ----------
+        path: path-like object.
+        kwargs: dict
+
+        Returns
+        -------
+        Hashable
+            Schema of the data, e.g. a tuple with column names and types.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} doesn't support reading schemas")
+
 class BaseLoader(ABLoader):
     """
     Simple Loader Factory
     
     Class that implements ABLoader interface allowing to dynamically create loader objects, 
     based on a dictionary with loading functions and extension_type(s) pairs.
+    Extension types can be compound (e.g. '.csv.gz'), the longest registered
+    suffix of a file name is used. Files compressed with gzip, bz2, xz or zstd
+    (e.g. '.csv.gz' when only '.csv' is registered) are decompressed while
+    they are read by the loading function.
     
     Parameters:
         func_ftype_dict (Dict[callable : str | list][default=None]): Dictionary 
             with loading functions and extension_type(s) pairs.
+        schema_ftype_dict (Dict[callable : str | list][default=None]): Dictionary
+            with schema reading functions and extension_type(s) pairs.
     
     Attributes:
         _mapp (dict): Empty dict to which loading functions and extension_type(s)
             pairs will be added.
+        _schema_mapp (dict): Empty dict to which schema reading functions and
+            extension_type(s) pairs will be added.
+        telemetry (Callable[[_LoadRecord], Any], default=None): Opt-in callback,
+            e.g. telemetry.LoadTelemetry, receiving a record of each file read by load.
+            Results returned from the load cache are not recorded.
     
     Methods:
         add_functions (func_ftype_dict: Dict[callable : str | list]]): Function
             to add at least one loading function and extension_type(s) entry.
+        add_schema_functions (func_ftype_dict: Dict[callable : str | list]]): Function
+            to add at least one schema reading function and extension_type(s) entry.
         load (path: str, kwargs: dict): Function for loading data specified by 
             a file path, distributing matching key-value arguments to all of the 
             available loader functions.            
+        schema (path: str, kwargs: dict): Function for reading the schema of data
+            specified by a file path, reading only the file metadata or its first rows.
     """
-    def __init__(self, func_ftype_dict = None):
+    def __init__(self, func_ftype_dict = None, schema_ftype_dict = None):
         self._mapp = {}
+        self._schema_mapp = {}
+        self.telemetry = None
         if func_ftype_dict is not None:
             self.add_functions(func_ftype_dict)
+        if schema_ftype_dict is not None:
+            self.add_schema_functions(schema_ftype_dict)
 
-    def _add(self, func, file_type):
+    def _add(self, func, file_type, mapp = None):
         """
         Private function for adding single mapping of loader function and file type.
         
@@ -65,11 +126,14 @@ class BaseLoader(ABLoader):
             Loading function.
         file_type: str | list
             String or list of strings representing file types (extensions).
+        mapp: dict, default=None
+            Mapping to which the entry is added, defaults to the loading functions.
         
         Returns
         -------
         None
         """
+        mapp = self._mapp if mapp is None else mapp
         if not callable(func):
             raise TypeError(f"{func} is not callable")
 
@@ -80,9 +144,9 @@ class BaseLoader(ABLoader):
             for f_t in set(file_type):
                 if not isinstance(f_t, str):
                     raise TypeError(f"{f_t} must be passed as a string")
-                self._mapp[f_t] = func
+                mapp[f_t] = func
         else:
-            self._mapp[file_type] = func
+            mapp[file_type] = func
 
     def add_functions(self, func_ftype_dict):
         """
@@ -105,6 +169,27 @@ class BaseLoader(ABLoader):
         for k, v in func_ftype_dict.items():
             self._add(k, v)
 
+    def add_schema_functions(self, func_ftype_dict):
+        """
+        Function for adding multiple schema reading function and file type mappings.
+        
+        Schema reading functions accept the same path argument as loading
+        functions and return a hashable schema of the data.
+        
+        Parameters
+        ----------
+        func_ftype_dict: Dict[callable : str | list]
+            Dictionary with schema reading functions and extension_type(s) pairs.
+        
+        Returns
+        -------
+        None
+        """
+        if not isinstance(func_ftype_dict, dict):
+            raise TypeError('func_ftype_dict must be of dictionary type')
+        for k, v in func_ftype_dict.items():
+            self._add(k, v, self._schema_mapp)
+
     def _inspect(self, function):
         """
         Private function for returning all of the parameters accepted by a loader function.
@@ -121,6 +206,74 @@ class BaseLoader(ABLoader):
         """
         return inspect.signature(function).parameters.keys()
 
+    def _dispatch(self, path, mapp = None):
+        """
+        Private function for finding the loader function of a file.
+
+        Suffixes of the file name are tried from the longest to the shortest.
+        A suffix is matched either directly, or without the compression suffix
+        when the file is compressed, e.g. 'events.csv.gz' is matched with
+        '.csv.gz', then with '.csv' (decompressed) and then with '.gz'.
+
+        Parameters
+        ----------
+        path: str
+            Path-like string pointing to a file.
+        mapp: dict, default=None
+            Mapping of the functions, defaults to the loading functions.
+
+        Returns
+        -------
+        Tuple[Callable, str | None]
+            Loader function and the compression suffix of the file, None when
+            the function reads the file as it is.
+        """
+        mapp = self._mapp if mapp is None else mapp
+        suffixes = Path(path).suffixes
+        compression = suffixes[-1] if suffixes and suffixes[-1] in _DECOMPRESSORS else None
+        for i in range(len(suffixes)):
+            suffix = ''.join(suffixes[i:])
+            if suffix in mapp:
+                return mapp[suffix], None
+            inner = ''.join(suffixes[i:-1])
+            if compression is not None and inner and inner in mapp:
+                return mapp[inner], compression
+        raise KeyError(Path(path).suffix)
+
+    def _call(self, func, compression, path, kwargs):
+        """
+        Private function calling a loading function with a path or a file object.
+
+        Parameters
+        ----------
+        func: Callable
+            Loading function returned by _dispatch.
+        compression: str | None
+            Compression suffix returned by _dispatch.
+        path: str
+            Path-like string pointing to an existing file or archive member.
+        kwargs: dict
+            Key, value arguments, only the ones accepted by the function are passed.
+
+        Returns
+        -------
+        obj
+            Object returned by the function.
+        """
+        kwargs = {k:v for k, v in kwargs.items() if k in self._inspect(func)}
+        # archive suffixes are checked on the path string first, so regular files cost no stat
+        member = _split_member(path)
+        if (member is None or not member[1]) and compression is None:
+            return func(path, **kwargs)
+        with ExitStack() as stack:
+            if member is not None and member[1]:
+                file = stack.enter_context(_open_member(*member))
+            else:
+                file = stack.enter_context(open(path, 'rb'))
+            if compression is not None:
+                file = stack.enter_context(_DECOMPRESSORS[compression](file))
+            return func(file, **kwargs)
+
     @lru_cache(maxsize=128)
     def load(self, path, **kwargs):
         """
@@ -131,10 +284,16 @@ class BaseLoader(ABLoader):
         from a file specified by a path-like string, distributing matching key-value 
         arguments to all of the available loader functions.
         
+        Paths below a zip or tar archive, e.g. 'data/2019.zip/eur/rates.csv',
+        point to archive members, which are streamed to the loader function as
+        binary file objects without extracting them to disk. Compressed files
+        without a loader function of their own are passed as binary file objects
+        decompressing the data as it is read.
+        
         Parameters
         ----------
         path: str
-            Path-like string pointing to an existing file.
+            Path-like string pointing to an existing file or archive member.
         kwargs: dict
             Key, value arguments to be distributed to loader functions.
         
@@ -143,5 +302,30 @@ class BaseLoader(ABLoader):
         obj
             Object loaded by the delegate function.
         """
-        func = self._mapp[Path(path).suffix]
-        return func(path, **{k:v for k, v in kwargs.items() if k in self._inspect(func)})
+        func, compression = self._dispatch(path)
+        if self.telemetry is None:
+            return self._call(func, compression, path, kwargs)
+        return _measure(self.telemetry, path, func,
+                        lambda: self._call(func, compression, path, kwargs))
+
+    def schema(self, path, **kwargs):
+        """
+        Reads the schema of data specified by a path-like string.
+        
+        Function delegating to a schema reading function based on the pre-defined
+        file type, the same way as load, distributing matching key-value arguments.
+        Files without a schema reading function raise KeyError.
+        
+        Parameters
+        ----------
+        path: str
+            Path-like string pointing to an existing file or archive member.
+        kwargs: dict
+            Key, value arguments to be distributed to schema reading functions.
+        
+        Returns
+        -------
+        Hashable
+            Schema returned by the delegate function.
+        """
+        return self._call(*self._dispatch(path, self._schema_mapp), path, kwargs)
@@ -0,0 +1,205 @@
+"""
+Indexing of zip and tar archive members, exposed as virtual paths
+"""
+import os
+import posixpath
+import tarfile
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+
+_ZIP_SUFFIXES = ('.zip',)
+_TAR_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+_INDEX = {}
+_INDEX_LOCK = threading.Lock()
+
+def _is_archive(path):
+    """
+    Private function checking whether a file name has an archive suffix.
+    """
+    return path.lower().endswith(_ZIP_SUFFIXES + _TAR_SUFFIXES)
+
+def _member_name(name):
+    """
+    Private function normalizing an archive member name.
+
+    Returns
+    -------
+    str | None
+        Relative member name with '/' separators, None for names pointing
+        outside of the archive.
+    """
+    name = posixpath.normpath(name.replace('\\', '/'))
+    if name.startswith(('/', '../')) or name in ('.', '..'):
+        return None
+    return name
+
+def _read_members(path):
+    """
+    Private function listing the file members of an archive.
+
+    Zip archives are listed from the central directory, without reading
+    member data. Tar archives have no central directory, so all of the
+    member headers are read once, and the TarInfo of every member is kept,
+    so opening a member later seeks to its data instead of scanning the headers.
+
+    Parameters
+    ----------
+    path: str
+        Path-like string pointing to an existing archive.
+
+    Returns
+    -------
+    List[Tuple[str, int, float, str | tarfile.TarInfo]]
+        Normalized member name, size, modification time and the member name
+        stored in the archive (zip), or the member header (tar).
+    """
+    members = []
+    if path.lower().endswith(_ZIP_SUFFIXES):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                name = _member_name(info.filename)
+                if name is not None and not info.is_dir():
+                    members.append((name, info.file_size,
+                                    time.mktime(info.date_time + (0, 0, -1)), info.filename))
+    else:
+        with tarfile.open(path, 'r:*') as archive:
+            for info in archive:
+                name = _member_name(info.name)
+                if name is not None and info.isfile():
+                    members.append((name, info.size, float(info.mtime), info))
+    return members
+
+def _archive_members(path):
+    """
+    Private function returning the indexed file members of an archive.
+
+    The index is cached per process and reused for as long as the modification
+    time and size of the archive stay the same. Archives that can't be read
+    are indexed as empty.
+
+    Parameters
+    ----------
+    path: str
+        Path-like string pointing to an existing archive.
+
+    Returns
+    -------
+    Dict[str: List[Tuple[str, int, float, str | tarfile.TarInfo]]]
+        Dictionary with member directories ('' for the top level) and their
+        members, as (file name, size, modification time, stored name or
+        TarInfo) tuples.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return {}
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _INDEX_LOCK:
+        cached = _INDEX.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    index = {}
+    try:
+        members = _read_members(path)
+    except (OSError, EOFError, zipfile.BadZipFile, tarfile.TarError):
+        members = []
+    for name, size, mtime, stored in members:
+        directory, file = posixpath.split(name)
+        index.setdefault(directory, []).append((file, size, mtime, stored))
+    with _INDEX_LOCK:
+        _INDEX[path] = (key, index)
+    return index
+
+def _virtual_root(path, directory):
+    """
+    Private function returning the virtual path of a member directory.
+
+    Parameters
+    ----------
+    path: str
+        Path-like string pointing to the archive.
+    directory: str
+        Member directory, '' for the top level of the archive.
+
+    Returns
+    -------
+    str
+        Path-like string of the directory below the archive path,
+        e.g. 'data/2019.zip/eur' for the 'eur' directory of 'data/2019.zip'.
+    """
+    return os.path.join(path, *directory.split('/')) if directory else path
+
+def _split_member(path):
+    """
+    Private function splitting a virtual path into the archive and the member name.
+
+    Parameters
+    ----------
+    path: str
+        Path-like string, e.g. 'data/2019.zip/eur/rates.csv'.
+
+    Returns
+    -------
+    Tuple[str, str] | None
+        Path of the innermost existing archive containing the path and the
+        member name relative to it ('' for the archive itself), None if the
+        path is not below an archive.
+    """
+    head, parts = path, []
+    while True:
+        if _is_archive(head) and os.path.isfile(head):
+            return head, '/'.join(reversed(parts))
+        head, tail = os.path.split(head)
+        if not tail:
+            return None
+        parts.append(tail)
+
+def _find_member(path, member):
+    """
+    Private function looking up an indexed archive member.
+
+    Returns
+    -------
+    Tuple[str, int, float, str | tarfile.TarInfo] | None
+        File name, size, modification time and stored name (zip) or TarInfo (tar)
+        of the member, None if the archive has no such file member.
+    """
+    directory, file = posixpath.split(member)
+    for item in _archive_members(path).get(directory, ()):
+        if item[0] == file:
+            return item
+    return None
+
+@contextmanager
+def _open_member(path, member):
+    """
+    Private context manager opening an archive member for streamed reading.
+
+    The member is decompressed as it is read, nothing is extracted to disk.
+    Tar members are read from the offset recorded in the index, so opening
+    every member of an archive doesn't rescan its headers each time.
+
+    Parameters
+    ----------
+    path: str
+        Path-like string pointing to an existing archive.
+    member: str
+        Normalized member name, as returned by _split_member.
+
+    Returns
+    -------
+    ContextManager[BinaryIO]
+        Binary file object of the member.
+    """
+    item = _find_member(path, member)
+    if item is None:
+        raise FileNotFoundError(f'{member} is not a file in {path}')
+    if path.lower().endswith(_ZIP_SUFFIXES):
+        with zipfile.ZipFile(path) as archive, archive.open(item[3]) as file:
+            yield file
+    else:
+        with tarfile.open(path, 'r:*') as archive, archive.extractfile(item[3]) as file:
+            yield file
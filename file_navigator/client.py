@@ -0,0 +1,155 @@
+"""
+Command line client of the file-navigator daemon
+
+The client imports only standard library modules used for the socket
+communication, so it starts in milliseconds. The daemon is started with:
+
+    python -m file_navigator.daemon DIRECTORY [DIRECTORY ...]
+
+Usage:
+    python -m file_navigator.client find NAME EXT [--name-type regex] [--ext-type eq]
+    python -m file_navigator.client select NAME EXT PATTERN [--match-type isin]
+    python -m file_navigator.client groupby NAME EXT {ext,name,path}
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+
+_SOCKET_ENV = 'FILE_NAVIGATOR_SOCKET'
+
+def _default_socket():
+    """
+    Private function returning the default socket path of the daemon.
+
+    Returns
+    -------
+    str
+        Path from the FILE_NAVIGATOR_SOCKET environment variable, otherwise
+        a per-user path in XDG_RUNTIME_DIR or /tmp.
+    """
+    if os.environ.get(_SOCKET_ENV):
+        return os.environ[_SOCKET_ENV]
+    directory = os.environ.get('XDG_RUNTIME_DIR') or '/tmp'
+    return os.path.join(directory, f'file-navigator-{os.getuid()}.sock')
+
+def request(message, socket_path = None, timeout = 60):
+    """
+    Sends a single request to the daemon and returns its result.
+
+    Parameters
+    ----------
+    message: dict
+        JSON-serializable request, with the operation under the 'op' key,
+        e.g. {'op': 'find', 'name': 'EUR', 'ext': 'csv', 'name_type': 'isin'}.
+    socket_path: str, default=None
+        Path-like string pointing to the socket of the daemon,
+        defaults to _default_socket().
+    timeout: float, default=60
+        Maximum number of seconds to wait for the response.
+
+    Returns
+    -------
+    Any
+        Result of the operation, e.g. a list of path-like strings for 'find'.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        raise OSError('Unix domain sockets are not supported on this platform')
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path or _default_socket())
+        sock.sendall(json.dumps(message).encode() + b'\n')
+        with sock.makefile('rb') as file:
+            line = file.readline()
+    if not line:
+        raise ConnectionError('The daemon closed the connection without a response')
+    response = json.loads(line)
+    if not response['ok']:
+        raise RuntimeError(response['error'])
+    return response['result']
+
+def _range(value):
+    """
+    Private function parsing a 'MIN:MAX' range argument, either bound can be empty.
+    """
+    low, _, high = value.partition(':')
+    return [float(low) if low else None, float(high) if high else None]
+
+def _parser():
+    """
+    Private function building the argument parser of the client.
+    """
+    parser = argparse.ArgumentParser(prog='file-navigator',
+                                     description='Queries a running file-navigator daemon.')
+    parser.add_argument('--socket', default=None, help='socket path of the daemon')
+    parser.add_argument('--json', action='store_true', help='print the raw JSON result')
+    commands = parser.add_subparsers(dest='op')
+    commands.required = True
+    commands.add_parser('ping', help='check that the daemon is running')
+    commands.add_parser('dirs', help='list the registered directories')
+    commands.add_parser('stop', help='stop the daemon')
+    add = commands.add_parser('add_dir', help='register a directory')
+    add.add_argument('directory')
+    add.add_argument('--deep', dest='traverse_subdirs', action='store_true',
+                     help='scan the subdirectories as well')
+    delete = commands.add_parser('del_dir', help='unregister a directory')
+    delete.add_argument('directory')
+
+    for op in ('find', 'select', 'groupby'):
+        command = commands.add_parser(op, help=f'{op} the matching files')
+        command.add_argument('name', help='file name pattern')
+        command.add_argument('ext', help='file type pattern')
+        command.add_argument('--name-type', default='eq')
+        command.add_argument('--ext-type', default='eq')
+        command.add_argument('--size', type=_range, help='MIN:MAX size in bytes')
+        command.add_argument('--age', type=_range, help='MIN:MAX seconds since modification')
+        command.add_argument('--archives', action='store_true')
+        command.add_argument('--follow-symlinks', action='store_true')
+        if op == 'select':
+            command.add_argument('pattern', help='path pattern the matches are selected by')
+            command.add_argument('--match-type', default='eq')
+        elif op == 'groupby':
+            command.add_argument('by', choices=('ext', 'name', 'path'))
+            command.add_argument('--pattern', default=None)
+            command.add_argument('--match-type', default='eq')
+    return parser
+
+def main(argv = None):
+    """
+    Entry point of the command line client.
+
+    Paths are printed one per line, groups and directories as tab-separated
+    key and value pairs.
+
+    Returns
+    -------
+    int
+        Exit status: 0 on success, 1 when the request failed.
+    """
+    args = vars(_parser().parse_args(argv))
+    socket_path, raw = args.pop('socket'), args.pop('json')
+    if args['op'] == 'select':
+        args['op'] = 'select_paths'
+    message = {k: v for k, v in args.items() if v is not None and v is not False}
+    try:
+        result = request(message, socket_path)
+    except (OSError, RuntimeError) as error:
+        print(f'file-navigator: {error}', file=sys.stderr)
+        return 1
+
+    if isinstance(result, str) and not raw:
+        print(result)
+    elif raw or not isinstance(result, (list, dict)):
+        print(json.dumps(result))
+    elif isinstance(result, dict):
+        for key, values in result.items():
+            for value in values if isinstance(values, list) else [values]:
+                print(f'{key}\t{value}')
+    else:
+        for path in result:
+            print(path)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
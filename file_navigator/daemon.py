@@ -0,0 +1,323 @@
+"""
+Long-running daemon answering PathFinder queries over a Unix domain socket
+
+The daemon keeps a listing of the registered directories warm: every request only
+rescans the directories whose modification time changed (see _PathManager.refresh)
+and filters the listing in memory, so lookups from scripts take milliseconds
+instead of a full directory walk, whatever the query.
+Requests and responses are single-line JSON objects, see client.request.
+
+Usage:
+    python -m file_navigator.daemon DIRECTORY [DIRECTORY ...] [--flat DIRECTORY] [--socket PATH]
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from collections import OrderedDict
+from .client import _default_socket
+from .pathfinder import PathFinder, _dedupe_inodes, _range_query
+from .query import Q, _TRUE
+
+_FIND_ARGS = ('name', 'ext', 'name_type', 'ext_type', 'size', 'mtime', 'ctime', 'age',
+              'follow_symlinks', 'dedupe', 'archives')
+
+def _ranges(kwargs):
+    """
+    Private function converting JSON lists of metadata ranges into tuples.
+    """
+    return {k: tuple(v) if isinstance(v, list) else v for k, v in kwargs.items()}
+
+def _full_paths(pm):
+    """
+    Private function returning the full path-like strings of a _PathManager.
+    """
+    return [os.path.join(root, file) for file, root in pm.paths]
+
+class _Index:
+    """
+    Private class answering the daemon requests from warm directory listings.
+
+    The registered directories are listed once, with the metadata of every file
+    and the modification times of every directory. Every request refreshes
+    the listing, which rescans only the directories that changed, and filters it
+    with the query of the request, so a query that was never seen before doesn't
+    walk the directories either. A listing is kept for every combination of
+    the follow_symlinks and archives flags that was requested.
+
+    Parameters:
+        directories (Dict[str: bool]): Directories and traverse_subdirs flags
+            registered in the PathFinder.
+        cache_size (int, default=32): Maximum number of listings kept warm.
+        dir_timeout (float, default=None): dir_timeout of the listings, so that
+            a stalled mount doesn't block the requests, see PathFinder.find.
+
+    Attributes:
+        finder (PathFinder): PathFinder with the registered directories. It is
+            replaced, not modified, when directories are added or removed, so
+            requests that are being answered keep scanning a consistent registry.
+        stopped (bool): Flag set by a stop request.
+
+    Methods:
+        dispatch (line: bytes): Answers a single JSON request, returning the JSON response.
+        listing (follow_symlinks: bool, archives: bool): Returns the refreshed listing
+            of all of the files in the registered directories.
+        find (name: str, ext: str, **kwargs): Returns the files matching the arguments
+            of PathFinder.find, filtered from the refreshed listing.
+    """
+    def __init__(self, directories, cache_size = 32, dir_timeout = None):
+        self.finder = PathFinder(directories)
+        self._listings = OrderedDict()
+        self._cache_size = cache_size
+        self._dir_timeout = dir_timeout
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.stopped = False
+
+    def listing(self, follow_symlinks = False, archives = False):
+        """
+        Returns the listing of the registered directories, following the filesystem.
+
+        The lock of the index is held only while the listings are read and
+        updated, so a slow scan doesn't delay the other requests.
+
+        Parameters
+        ----------
+        follow_symlinks: bool, default=False
+            Flag indicating whether symlinked subdirectories are listed.
+        archives: bool, default=False
+            Flag indicating whether members of zip and tar archives are listed.
+
+        Returns
+        -------
+        _PathManager
+            Tracked result of PathFinder.find with the metadata of all files,
+            empty when the directories hold no files.
+        """
+        key = (bool(follow_symlinks), bool(archives))
+        with self._lock:
+            listing, finder, generation = self._listings.get(key), self.finder, self._generation
+
+        if listing is None:
+            listing = finder.find(_TRUE, stat=True, track=True, dir_timeout=self._dir_timeout,
+                                  follow_symlinks=key[0], archives=key[1])
+        else:
+            listing = listing.refresh()[0]
+
+        with self._lock:
+            # listings of a replaced registry are not kept
+            if generation == self._generation:
+                self._listings[key] = listing
+                self._listings.move_to_end(key)
+                while len(self._listings) > self._cache_size:
+                    self._listings.popitem(last=False)
+        return listing
+
+    def find(self, name, ext = None, name_type = 'eq', ext_type = 'eq', size = None,
+             mtime = None, ctime = None, age = None, follow_symlinks = False,
+             dedupe = None, archives = False):
+        """
+        Finds the matching files in the refreshed listing.
+
+        Parameters
+        ----------
+        name, ext, name_type, ext_type, size, mtime, ctime, age, follow_symlinks,
+        dedupe, archives:
+            Arguments of PathFinder.find.
+
+        Returns
+        -------
+        _PathManager
+            Matching paths, empty when no file matches.
+        """
+        if dedupe not in (None, 'inode'):
+            raise ValueError('"dedupe" argument must be None or \'inode\'')
+        query = _range_query(self.finder._query(name, ext, name_type, ext_type),
+                             size, mtime, ctime, age)
+        result = self.listing(follow_symlinks, archives)._select(query)
+        if dedupe is not None:
+            found = _dedupe_inodes({p: result._stat(p) for p in result._paths})
+            result = result._result(list(found), found)
+        return result
+
+    def _register(self, op, message):
+        """
+        Private function changing the registered directories, which drops the listings.
+        """
+        with self._lock:
+            finder = PathFinder(dict(self.finder.directories))
+            if op == 'add_dir':
+                finder.add_dir(message['directory'],
+                               bool(message.get('traverse_subdirs', False)))
+            else:
+                finder.del_dir(message['directory'])
+            self.finder = finder
+            self._listings.clear()
+            self._generation += 1
+            return dict(finder.directories.items())
+
+    def _answer(self, message):
+        """
+        Private function returning the result of a decoded request.
+        """
+        op = message.get('op')
+        if op == 'ping':
+            return 'pong'
+        if op == 'stop':
+            self.stopped = True
+            return 'stopped'
+        if op == 'dirs':
+            with self._lock:
+                return dict(self.finder.directories.items())
+        if op in ('add_dir', 'del_dir'):
+            return self._register(op, message)
+        if op not in ('find', 'select_paths', 'groupby'):
+            raise ValueError(f'Unknown operation: {op}')
+
+        pm = self.find(**_ranges({k: message[k] for k in _FIND_ARGS if k in message}))
+        if op == 'find':
+            return _full_paths(pm)
+        if op == 'select_paths':
+            if message.get('pattern') is not None:
+                pm = pm._select(Q.path(message['pattern'], message.get('match_type', 'eq')))
+            return _full_paths(pm)
+        groups = pm.groupby(message['by'], message.get('pattern'),
+                            message.get('match_type', 'eq'))
+        return {str(key): _full_paths(group) for key, group in groups.items()}
+
+    def dispatch(self, line):
+        """
+        Answers a single request.
+
+        Parameters
+        ----------
+        line: bytes
+            JSON object with the operation under the 'op' key and its arguments.
+
+        Returns
+        -------
+        bytes
+            JSON line with the result under the 'result' key, or the error
+            under the 'error' key, and an 'ok' flag.
+        """
+        try:
+            response = {'ok': True, 'result': self._answer(json.loads(line))}
+        except Exception as error:
+            response = {'ok': False, 'error': f'{type(error).__name__}: {error}'}
+        return json.dumps(response).encode() + b'\n'
+
+class _Handler(socketserver.StreamRequestHandler):
+    """
+    Private request handler answering JSON lines until the client disconnects.
+    """
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            self.wfile.write(self.server.index.dispatch(line))
+            self.wfile.flush()
+            if self.server.index.stopped:
+                self.server.shutdown()
+                return
+
+def _make_server(socket_path, directories, cache_size = 32, dir_timeout = None):
+    """
+    Private function binding the daemon server to a Unix domain socket.
+
+    A socket file left by a daemon that is no longer running is replaced.
+    The socket is created accessible only to the current user.
+
+    Parameters
+    ----------
+    socket_path: str
+        Path-like string of the socket file.
+    directories: Dict[str: bool]
+        Directories and traverse_subdirs flags to be registered.
+    cache_size: int, default=32
+        Maximum number of listings kept warm.
+    dir_timeout: float, default=None
+        dir_timeout of the listings, see PathFinder.find.
+
+    Returns
+    -------
+    socketserver.ThreadingUnixStreamServer
+        Bound server, with the _Index under the index attribute.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        raise OSError('Unix domain sockets are not supported on this platform')
+    index = _Index(directories, cache_size, dir_timeout)
+    if os.path.exists(socket_path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(socket_path)
+            except OSError:
+                os.unlink(socket_path)
+            else:
+                raise OSError(f'A daemon is already listening on {socket_path}')
+    umask = os.umask(0o177)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(socket_path, _Handler)
+    finally:
+        os.umask(umask)
+    server.daemon_threads = True
+    server.index = index
+    return server
+
+def serve(directories, socket_path = None, cache_size = 32, dir_timeout = None):
+    """
+    Runs the daemon until it receives a stop request or is interrupted.
+
+    Parameters
+    ----------
+    directories: Dict[str: bool]
+        Directories and traverse_subdirs flags to be registered.
+    socket_path: str, default=None
+        Path-like string of the socket file, defaults to client._default_socket().
+    cache_size: int, default=32
+        Maximum number of listings kept warm.
+    dir_timeout: float, default=None
+        dir_timeout of the listings, see PathFinder.find.
+
+    Returns
+    -------
+    None
+    """
+    socket_path = socket_path or _default_socket()
+    server = _make_server(socket_path, directories, cache_size, dir_timeout)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+def main(argv = None):
+    """
+    Entry point of the daemon.
+    """
+    parser = argparse.ArgumentParser(prog='file-navigator-daemon',
+                                     description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directories', nargs='*', help='directories scanned with subdirectories')
+    parser.add_argument('--flat', action='append', default=[],
+                        help='directory scanned without subdirectories')
+    parser.add_argument('--socket', default=None, help='socket path of the daemon')
+    parser.add_argument('--cache-size', type=int, default=32)
+    parser.add_argument('--dir-timeout', type=float, default=None,
+                        help='seconds after which a stalled directory is skipped')
+    args = parser.parse_args(argv)
+    directories = dict.fromkeys(args.directories, True)
+    directories.update(dict.fromkeys(args.flat, False))
+    try:
+        serve(directories, args.socket, args.cache_size, args.dir_timeout)
+    except (OSError, ValueError) as error:
+        print(f'file-navigator-daemon: {error}', file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
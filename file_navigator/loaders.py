@@ -1,10 +1,370 @@
 """
-Pandas Loader - Impementation of Base Loader class
+Pandas and Arrow Loaders - Impementations of Base Loader class
 """
+import inspect
+import os
+import tempfile
+import weakref
+from functools import partial
 import pandas as pd
 from .abc_loader import BaseLoader
 
-PDLoader = BaseLoader({pd.read_csv: ['.csv', '.txt'],
+try:
+    import pyarrow as pa
+    from pyarrow import feather as _feather, parquet as _parquet
+except ImportError:
+    pa = None
+
+try:
+    import polars as _pl
+except ImportError:
+    _pl = None
+
+# engine tried next when an engine is not installed or doesn't support the options
+_CSV_FALLBACKS = {'polars': 'pyarrow', 'pyarrow': None}
+# pandas option: polars option
+_POLARS_OPTIONS = {'sep': 'separator', 'delimiter': 'separator', 'usecols': 'columns',
+                   'nrows': 'n_rows', 'skiprows': 'skip_rows', 'encoding': 'encoding'}
+# phrases of the pandas errors raised for options an engine doesn't support
+_UNSUPPORTED = ('is not supported with the', 'does not support', 'does not allow')
+
+class _UnsupportedOption(ValueError):
+    """
+    Private exception raised when a CSV engine doesn't support a passed option.
+    """
+
+def _unsupported(error, engine):
+    """
+    Private function checking whether an engine failed on an option rather than on the data.
+
+    Parameters
+    ----------
+    error: Exception
+        Exception raised by the engine.
+    engine: str
+        Name of the engine.
+
+    Returns
+    -------
+    bool
+        True for missing engines and unsupported options, False for parse
+        errors, which are raised instead of being retried with another engine.
+    """
+    if isinstance(error, (ImportError, _UnsupportedOption)):
+        return True
+    if isinstance(error, pd.errors.ParserError) or not isinstance(error, ValueError):
+        return False
+    message = str(error)
+    return engine in message and any(phrase in message for phrase in _UNSUPPORTED)
+
+def _polars_csv(path, kwargs):
+    """
+    Private function reading a CSV file with polars into a pandas DataFrame.
+
+    Parameters
+    ----------
+    path: str | BinaryIO
+        Path-like string pointing to an existing file, or a binary file object.
+    kwargs: dict
+        pandas.read_csv options, translated to their polars counterparts.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Loaded data.
+    """
+    if _pl is None:
+        raise ImportError('polars package is required to use the polars engine')
+    header = kwargs.pop('header', 'infer')
+    if header not in ('infer', 0, None):
+        raise _UnsupportedOption("Only header=0 or header=None is supported with the 'polars' engine")
+    options = {'has_header': header is not None}
+    for option, value in kwargs.items():
+        if option not in _POLARS_OPTIONS:
+            raise _UnsupportedOption(f"The '{option}' option is not supported with the 'polars' engine")
+        options[_POLARS_OPTIONS[option]] = value
+    try:
+        return _pl.read_csv(path, **options).to_pandas()
+    except _pl.exceptions.PolarsError as error:
+        raise ValueError(str(error)) from error
+
+def _read_csv(path, engine = None, **kwargs):
+    """
+    Private function loading a CSV file with a selectable parser engine.
+
+    Next to the pandas engines ('c', 'python', 'pyarrow'), the 'polars' engine
+    reads the file with polars' multi-threaded parser. Engines that are not
+    installed, or don't support the passed options, fall back to the next
+    engine: 'polars' to 'pyarrow', and 'pyarrow' to the default pandas parser.
+    Errors in the data are raised by the requested engine, a malformed file
+    is never parsed again by a more lenient one.
+
+    Parameters
+    ----------
+    path: str | BinaryIO
+        Path-like string pointing to an existing file, or a binary file object.
+    engine: str, default=None
+        Parser engine, the default pandas parser when None.
+    kwargs: dict
+        pandas.read_csv options.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Loaded data.
+    """
+    while True:
+        try:
+            if engine == 'polars':
+                return _polars_csv(path, dict(kwargs))
+            return pd.read_csv(path, engine=engine, **kwargs)
+        except (ImportError, ValueError) as error:
+            if engine not in _CSV_FALLBACKS or not _unsupported(error, engine):
+                raise
+            if hasattr(path, 'read'):
+                if not (hasattr(path, 'seekable') and path.seekable()):
+                    raise
+                path.seek(0)
+            engine = _CSV_FALLBACKS[engine]
+
+def _frame_schema(df):
+    """
+    Private function returning the schema of a pandas DataFrame.
+
+    Returns
+    -------
+    Tuple[Tuple[str, str]]
+        Column names and dtypes.
+    """
+    return tuple((str(column), str(dtype)) for column, dtype in df.dtypes.items())
+
+def _arrow_schema(schema, to_pandas):
+    """
+    Private function returning the schema of a pyarrow.Schema.
+
+    Parameters
+    ----------
+    schema: pyarrow.Schema
+        Schema read from the file metadata.
+    to_pandas: bool
+        Flag indicating whether the dtypes of the converted pandas DataFrame
+        should be returned instead of the Arrow types.
+
+    Returns
+    -------
+    Tuple[Tuple[str, str]]
+        Column names and Arrow types (or pandas dtypes).
+    """
+    if to_pandas:
+        return _frame_schema(schema.empty_table().to_pandas())
+    return tuple((field.name, str(field.type)) for field in schema)
+
+def _ipc_schema(path, to_pandas = False):
+    """
+    Private function reading the schema of a Feather or Arrow IPC file from its footer.
+
+    Feather v1 files, which have no IPC footer, are memory-mapped instead.
+
+    Returns
+    -------
+    Tuple[Tuple[str, str]]
+        Column names and Arrow types (or pandas dtypes).
+    """
+    if pa is None:
+        raise ImportError('pyarrow package is required to read Feather schemas')
+    source = pa.memory_map(path) if isinstance(path, str) else path
+    try:
+        schema = pa.ipc.open_file(source).schema
+    except pa.ArrowInvalid:
+        if not isinstance(path, str):
+            path.seek(0)
+        schema = _feather.read_table(path, memory_map=isinstance(path, str)).schema
+    return _arrow_schema(schema, to_pandas)
+
+def _parquet_schema(path, to_pandas = False):
+    """
+    Private function reading the schema of a Parquet file from its footer.
+
+    Returns
+    -------
+    Tuple[Tuple[str, str]]
+        Column names and Arrow types (or pandas dtypes).
+    """
+    if pa is None:
+        raise ImportError('pyarrow package is required to read Parquet schemas')
+    return _arrow_schema(_parquet.read_schema(path, memory_map=isinstance(path, str)),
+                         to_pandas)
+
+def _csv_schema(path, nrows = 100, **kwargs):
+    """
+    Private function reading the schema of a CSV file from its first rows.
+
+    Parameters
+    ----------
+    path: str | BinaryIO
+        Path-like string pointing to an existing file, or a binary file object.
+    nrows: int, default=100
+        Number of rows the dtypes are inferred from.
+    kwargs: dict
+        pandas.read_csv options.
+
+    Returns
+    -------
+    Tuple[Tuple[str, str]]
+        Column names and dtypes.
+    """
+    return _frame_schema(_read_csv(path, nrows=nrows, **kwargs))
+
+def _excel_schema(path, nrows = 0, **kwargs):
+    """
+    Private function reading the column names of every sheet of an Excel file.
+
+    Returns
+    -------
+    Tuple[Tuple[str, Tuple[str]]]
+        Sheet names and their column names.
+    """
+    kwargs['sheet_name'] = None
+    sheets = pd.read_excel(path, nrows=nrows, **kwargs)
+    return tuple((str(sheet), tuple(map(str, df.columns))) for sheet, df in sheets.items())
+
+def _hdf_schema(path):
+    """
+    Private function reading the keys of an HDF5 file.
+
+    Returns
+    -------
+    Tuple[str]
+        Sorted keys of the stored objects.
+    """
+    with pd.HDFStore(path, mode='r') as store:
+        return tuple(sorted(store.keys()))
+
+def _compact_dtypes(df, category_ratio = 0.5, float32 = False):
+    """
+    Private function inferring compact dtypes that can be applied at parse time.
+
+    Integer columns are not included: a sample doesn't bound their range and
+    pandas parsers wrap out-of-range values around silently, so they are
+    downcast after parsing by _compact instead.
+
+    Parameters
+    ----------
+    df: pandas.DataFrame
+        Sample of the data, or the whole data.
+    category_ratio: float, default=0.5
+        Maximum ratio of unique to non-null values of a string column
+        stored as a categorical.
+    float32: bool, default=False
+        Flag indicating whether float columns should be stored as float32,
+        which keeps only about 7 significant digits.
+
+    Returns
+    -------
+    Dict[str: str]
+        Column names and compact dtypes: 'category' for low-cardinality strings,
+        Arrow strings ('string[pyarrow]', when pyarrow is installed) for the other
+        string columns, and optionally 'float32'.
+    """
+    dtypes = {}
+    for column, series in df.items():
+        if series.dtype.kind == 'f' and float32:
+            dtypes[column] = 'float32'
+        elif series.dtype.kind == 'O' and not isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.dropna()
+            if len(values) and values.nunique() <= category_ratio * len(values):
+                dtypes[column] = 'category'
+            elif pa is not None and all(isinstance(value, str) for value in values):
+                dtypes[column] = 'string[pyarrow]'
+    return dtypes
+
+def _compact(df, dtypes = None):
+    """
+    Private function compacting a loaded pandas DataFrame.
+
+    Parameters
+    ----------
+    df: Any
+        Loaded object, objects other than pandas DataFrames are returned unchanged.
+    dtypes: Dict[str: str], default=None
+        Dtypes returned by _compact_dtypes, applied to the existing columns.
+
+    Returns
+    -------
+    Any
+        DataFrame with the dtypes applied and integer columns downcast
+        to the smallest type holding all of their values.
+    """
+    if not isinstance(df, pd.DataFrame):
+        return df
+    if dtypes:
+        df = df.astype({c: d for c, d in dtypes.items() if c in df.columns
+                        and str(df[c].dtype) != d})
+    for column, series in df.items():
+        if series.dtype.kind in 'iu' and len(series):
+            df[column] = pd.to_numeric(series, downcast='unsigned' if series.min() >= 0
+                                       else 'integer')
+    return df
+
+def _memory(obj):
+    """
+    Private function returning the memory used by a loaded object in bytes.
+    """
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(obj.memory_usage(deep=True).sum())
+    if pa is not None and isinstance(obj, pa.Table):
+        return obj.nbytes
+    return 0
+
+def _discard(path):
+    """
+    Private function removing a spilled file.
+
+    On Windows a file can't be removed while columns taken from its table
+    still map it, so the file is then left to the temporary directory cleanup.
+    """
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _spill(df, directory):
+    """
+    Private function moving a pandas DataFrame to a Feather file on disk.
+
+    Parameters
+    ----------
+    df: pandas.DataFrame
+        Data to be spilled.
+    directory: str
+        Path-like string pointing to the directory of the Feather files.
+
+    Returns
+    -------
+    pyarrow.Table
+        Table memory-mapped from the written file, its pages are read from
+        the page cache only when they are accessed. The file is removed
+        when the table is garbage collected.
+    """
+    if pa is None:
+        raise ImportError('pyarrow package is required to spill data to disk')
+    fd, path = tempfile.mkstemp(suffix='.feather', dir=directory)
+    try:
+        with open(fd, 'wb') as file:
+            _feather.write_feather(df, file)
+        table = _feather.read_table(path, memory_map=True)
+    except BaseException:
+        os.remove(path)
+        raise
+    weakref.finalize(table, _discard, path)
+    return table
+
+# exposes pandas.read_csv options to BaseLoader, which passes only the accepted ones
+_read_csv.__signature__ = inspect.signature(pd.read_csv)
+_csv_schema.__signature__ = inspect.signature(pd.read_csv)
+_excel_schema.__signature__ = inspect.signature(pd.read_excel)
+
+PDLoader = BaseLoader({_read_csv: ['.csv', '.txt'],
                        pd.read_excel: ['.xlsx', '.xls'],
                        pd.read_feather: '.feather',
                        pd.read_hdf:['.h5', '.hdf5'],
@@ -13,4 +373,112 @@ PDLoader = BaseLoader({pd.read_csv: ['.csv', '.txt'],
                        pd.read_pickle: '.pkl',
                        pd.read_sas: '.sas7bdat',
                        pd.read_stata: '.dta',
-                       pd.read_html: '.html'})
+                       pd.read_html: '.html'},
+                      {_csv_schema: ['.csv', '.txt'],
+                       _excel_schema: ['.xlsx', '.xls'],
+                       _hdf_schema: ['.h5', '.hdf5'],
+                       partial(_ipc_schema, to_pandas=True): '.feather',
+                       partial(_parquet_schema, to_pandas=True): '.gzip'})
+
+def _arrow_output(table, to_pandas, arrow_dtypes):
+    """
+    Private function converting a pyarrow.Table into the requested output.
+
+    Parameters
+    ----------
+    table: pyarrow.Table
+        Loaded table.
+    to_pandas: bool
+        Flag indicating whether a pandas DataFrame should be returned.
+    arrow_dtypes: bool
+        Flag indicating whether the DataFrame columns should keep the Arrow
+        buffers (pandas.ArrowDtype) instead of being converted to NumPy.
+
+    Returns
+    -------
+    pyarrow.Table | pandas.DataFrame
+        Table, or a DataFrame converted with self_destruct, which releases
+        every column of the table as soon as it is converted.
+    """
+    if not to_pandas:
+        return table
+    if arrow_dtypes:
+        return table.to_pandas(types_mapper=pd.ArrowDtype, self_destruct=True)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+def _read_ipc(path, columns = None, use_threads = True, memory_map = True,
+              to_pandas = False, arrow_dtypes = False):
+    """
+    Private function loading a Feather (v1 or v2) or Arrow IPC file with pyarrow.
+
+    Files passed as paths are memory-mapped, so uncompressed columns reference
+    the page cache directly instead of being copied into memory.
+
+    Parameters
+    ----------
+    path: str | BinaryIO
+        Path-like string pointing to an existing file, or a binary file object.
+    columns: Tuple[str], default=None
+        Names of the columns to be loaded, all columns when None. Passed as
+        a tuple, since BaseLoader.load arguments must be hashable.
+    use_threads: bool, default=True
+        Flag indicating whether columns should be read with multiple threads.
+    memory_map: bool, default=True
+        Flag indicating whether the file should be memory-mapped.
+    to_pandas: bool, default=False
+        Flag indicating whether a pandas DataFrame should be returned.
+    arrow_dtypes: bool, default=False
+        Flag indicating whether the DataFrame should keep Arrow-backed columns.
+
+    Returns
+    -------
+    pyarrow.Table | pandas.DataFrame
+        Loaded data.
+    """
+    if pa is None:
+        raise ImportError('pyarrow package is required to use ArrowLoader')
+    table = _feather.read_table(path, columns=None if columns is None else list(columns),
+                                memory_map=memory_map and isinstance(path, str),
+                                use_threads=use_threads)
+    return _arrow_output(table, to_pandas, arrow_dtypes)
+
+def _read_parquet(path, columns = None, use_threads = True, memory_map = True,
+                  to_pandas = False, arrow_dtypes = False):
+    """
+    Private function loading a Parquet file with pyarrow.
+
+    Files passed as paths are memory-mapped and column chunks are decoded
+    with multiple threads.
+
+    Parameters
+    ----------
+    path: str | BinaryIO
+        Path-like string pointing to an existing file, or a binary file object.
+    columns: Tuple[str], default=None
+        Names of the columns to be loaded, all columns when None. Passed as
+        a tuple, since BaseLoader.load arguments must be hashable.
+    use_threads: bool, default=True
+        Flag indicating whether columns should be decoded with multiple threads.
+    memory_map: bool, default=True
+        Flag indicating whether the file should be memory-mapped.
+    to_pandas: bool, default=False
+        Flag indicating whether a pandas DataFrame should be returned.
+    arrow_dtypes: bool, default=False
+        Flag indicating whether the DataFrame should keep Arrow-backed columns.
+
+    Returns
+    -------
+    pyarrow.Table | pandas.DataFrame
+        Loaded data.
+    """
+    if pa is None:
+        raise ImportError('pyarrow package is required to use ArrowLoader')
+    table = _parquet.read_table(path, columns=None if columns is None else list(columns),
+                                memory_map=memory_map and isinstance(path, str),
+                                use_threads=use_threads)
+    return _arrow_output(table, to_pandas, arrow_dtypes)
+
+ArrowLoader = BaseLoader({_read_ipc: ['.feather', '.arrow', '.ipc'],
+                          _read_parquet: ['.parquet', '.gzip']},
+                         {_ipc_schema: ['.feather', '.arrow', '.ipc'],
+                          _parquet_schema: ['.parquet', '.gzip']})
@@ -1,9 +1,105 @@
 """
-Module with matching functions
+Module with matching functions and the registry of matchers
 """
+import os
 import re
+import difflib
+import fnmatch as _fnmatch
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    from rapidfuzz import fuzz as _fuzz
+except ImportError:
+    _fuzz = None
+
+_COMPRESSION_SUFFIXES = ('.gz', '.bz2', '.xz', '.zst')
+
+@lru_cache(maxsize=128)
+def _resolve_ext(string):
+    """
+    Private function for standardizing file type strings.
+
+    Only the dot prefix is removed (also from every alternative of a pattern
+    separated with |), so compound file types keep their inner dots,
+    e.g. '.csv.gz' is standardized to 'csv.gz'.
+
+    Parameters
+    ----------
+    string: str
+        File extension string to be standardized.
+
+    Returns
+    -------
+    str
+        Standardized file extension without the dot prefix.
+    """
+    return '|'.join(part[1:] if part.startswith('.') else part
+                    for part in string.split('|'))
+
+def _split_name(name):
+    """
+    Private function splitting a file name into the name and the file type.
+
+    The file type is the last suffix of the name, or the last two suffixes
+    when the last one is a compression suffix, e.g. 'events.csv.gz' is split
+    into ('events', '.csv.gz') while 'report.2019.csv' is split into
+    ('report.2019', '.csv').
+
+    Parameters
+    ----------
+    name: str
+        File name combined with the file extension.
+
+    Returns
+    -------
+    Tuple[str, str]
+        File name without the file type, and the file type with the dot prefix.
+    """
+    path = Path(name)
+    stem, suffix = path.stem, path.suffix
+    if suffix in _COMPRESSION_SUFFIXES:
+        inner = Path(stem)
+        if inner.suffix:
+            return inner.stem, inner.suffix + suffix
+    return stem, suffix
+
+def _resolve_range(bounds, arg_name):
+    """
+    Private function for standardizing (min, max) metadata ranges.
+
+    Parameters
+    ----------
+    bounds: Tuple[Any, Any] | None
+        Two-element tuple with lower and upper bounds, either of which can be None.
+        datetime bounds are converted to timestamps and timedelta bounds to seconds.
+    arg_name: str
+        Name of the argument used in the error message.
+
+    Returns
+    -------
+    Tuple[float | None, float | None] | None
+        Standardized range or None when no range was passed.
+    """
+    if bounds is None:
+        return None
+    if not (isinstance(bounds, tuple) and len(bounds) == 2):
+        raise TypeError(f'"{arg_name}" argument must be a (min, max) tuple')
+    return tuple(b.timestamp() if isinstance(b, datetime)
+                 else b.total_seconds() if isinstance(b, timedelta)
+                 else b
+                 for b in bounds)
+
+def _in_range(value, bounds):
+    """
+    Private function checking whether a value lies in inclusive (min, max) bounds.
+    """
+    return bounds is None or (
+        (bounds[0] is None or value >= bounds[0])
+        and (bounds[1] is None or value <= bounds[1])
+        )
+
 def eq(string, pattern):
     """
     Equality matching function.
@@ -75,3 +171,428 @@ def glob(string, pattern):
         True/False if glob pattern was found in the string.
     """
     return Path(string).match(pattern)
+
+def ieq(string, pattern):
+    """
+    Case-insensitive equality matching function.
+
+    Parameters
+    ----------
+    string: str
+        String with which pattern will be compared.
+    pattern: str
+        String pattern to be matched.
+
+    Returns
+    -------
+    bool
+        True/False if string and a pattern are equal, ignoring case.
+    """
+    return string.casefold() == pattern.casefold()
+
+def iisin(string, pattern):
+    """
+    Case-insensitive inclusion matching function.
+
+    Parameters
+    ----------
+    string: str
+        String in which pattern will be searched.
+    pattern: str
+        String pattern to be searched.
+
+    Returns
+    -------
+    bool
+        True/False if pattern is in the string, ignoring case.
+    """
+    return pattern.casefold() in string.casefold()
+
+def startswith(string, pattern):
+    """
+    Prefix matching function.
+
+    Parameters
+    ----------
+    string: str
+        String whose beginning will be compared.
+    pattern: str
+        String prefix to be matched.
+
+    Returns
+    -------
+    bool
+        True/False if string starts with the pattern.
+    """
+    return string.startswith(pattern)
+
+def endswith(string, pattern):
+    """
+    Suffix matching function.
+
+    Parameters
+    ----------
+    string: str
+        String whose end will be compared.
+    pattern: str
+        String suffix to be matched.
+
+    Returns
+    -------
+    bool
+        True/False if string ends with the pattern.
+    """
+    return string.endswith(pattern)
+
+def _is_below(path, directory):
+    """
+    Private function checking whether a path-like string is strictly below a directory.
+    """
+    separators = (os.sep, os.altsep) if os.altsep else (os.sep,)
+    return any(path.startswith(directory if directory.endswith(sep) else directory + sep)
+               for sep in separators)
+
+def _eq_reachable(directory, pattern):
+    """
+    Private function checking whether the directory or a path below it can equal the pattern.
+    """
+    if not isinstance(pattern, str):
+        return True
+    return directory == pattern or _is_below(pattern, directory)
+
+def _startswith_reachable(directory, pattern):
+    """
+    Private function checking whether the directory or a path below it can start with the pattern.
+    """
+    if not isinstance(pattern, str):
+        return True
+    return directory.startswith(pattern) or _is_below(pattern, directory)
+
+class Matcher:
+    """
+    Matcher Base Class
+
+    Interface which all of the registered matchers implement. A matcher is
+    called with a single string and a pattern, and matches a whole batch of
+    strings, e.g., a directory listing, with match_many.
+
+    Attributes:
+        cost (float): Relative cost of matching a single string, used by
+            the query planner to evaluate cheap checks first.
+        hereditary (bool): Flag indicating that a directory path matched by
+            the matcher implies that every path below it is matched as well,
+            which allows the query planner to prune directory traversal.
+
+    Methods:
+        __call__ (string: str, pattern: Any): Scalar matching function.
+        match_many (strings: Sequence[str], pattern: Any): Batch matching
+            function returning a list of booleans (mask) aligned with strings.
+        reachable (directory: str, pattern: Any): Checks whether the directory
+            path or any path below it can still be matched, which allows the query
+            planner to prune directory traversal. Defaults to True.
+    """
+    cost = 10
+    hereditary = False
+
+    def reachable(self, directory, pattern):
+        """
+        Function checking whether a directory path or a path below it can be matched.
+
+        The default implementation is conservative and never rules a directory out.
+
+        Parameters
+        ----------
+        directory: str
+            Directory path.
+        pattern: Any
+            Pattern to be matched.
+
+        Returns
+        -------
+        bool
+            False only when neither the directory path nor any path below it
+            can be matched.
+        """
+        return True
+
+    def __call__(self, string, pattern):
+        """
+        Abstract scalar matching function.
+
+        Parameters
+        ----------
+        string: str
+            String to be matched.
+        pattern: Any
+            Pattern to be matched.
+        """
+        raise NotImplementedError("This has to be implemented")
+
+    def match_many(self, strings, pattern):
+        """
+        Batch matching function.
+
+        The default implementation calls the scalar function for every string,
+        subclasses override it to prepare the pattern only once per batch.
+
+        Parameters
+        ----------
+        strings: Sequence[str]
+            Strings to be matched.
+        pattern: Any
+            Pattern to be matched.
+
+        Returns
+        -------
+        List[bool]
+            Mask aligned with strings.
+        """
+        return [self(string, pattern) for string in strings]
+
+class FunctionMatcher(Matcher):
+    """
+    Matcher adapting a scalar matching function.
+
+    Parameters:
+        func (Callable[[str, Any], bool]): Scalar matching function.
+        many (Callable[[Sequence[str], Any], List[bool]], default=None): Optional
+            batch matching function, defaults to calling func for every string.
+        cost (float, default=10): Relative cost of matching a single string.
+        hereditary (bool, default=False): Flag indicating that a matched directory
+            path implies that every path below it is matched as well.
+        reachable (Callable[[str, Any], bool], default=None): Optional function
+            checking whether a directory path or a path below it can be matched,
+            see Matcher.reachable.
+    """
+    def __init__(self, func, many = None, cost = 10, hereditary = False, reachable = None):
+        if not callable(func):
+            raise TypeError(f"{func} is not callable")
+        self.func = func
+        self.many = many
+        self.cost = cost
+        self.hereditary = hereditary
+        self._reachable = reachable
+
+    def __call__(self, string, pattern):
+        return self.func(string, pattern)
+
+    def match_many(self, strings, pattern):
+        if self.many is None:
+            return super().match_many(strings, pattern)
+        return self.many(strings, pattern)
+
+    def reachable(self, directory, pattern):
+        if self._reachable is None:
+            return True
+        return self._reachable(directory, pattern)
+
+class RegexMatcher(Matcher):
+    """
+    Regex matcher compiling the pattern once per batch.
+
+    Parameters:
+        flags (int, default=0): Flags of the re module, e.g., re.IGNORECASE.
+    """
+    cost = 5
+
+    def __init__(self, flags = 0):
+        self.flags = flags
+
+    def __call__(self, string, pattern):
+        return bool(re.search(pattern, string, self.flags))
+
+    def match_many(self, strings, pattern):
+        search = re.compile(pattern, self.flags).search
+        return [bool(search(string)) for string in strings]
+
+class FnmatchMatcher(Matcher):
+    """
+    Shell-style wildcard matcher matching the whole string.
+
+    Unlike glob, which matches file path parts from the right, the pattern
+    has to match the whole string. The pattern is translated to a regular
+    expression once per batch.
+
+    Parameters:
+        case_sensitive (bool, default=True): Flag indicating whether case matters.
+    """
+    cost = 4
+
+    def __init__(self, case_sensitive = True):
+        self.case_sensitive = case_sensitive
+
+    def _compile(self, pattern):
+        return re.compile(_fnmatch.translate(pattern),
+                          0 if self.case_sensitive else re.IGNORECASE).match
+
+    def __call__(self, string, pattern):
+        return self._compile(pattern)(string) is not None
+
+    def match_many(self, strings, pattern):
+        match = self._compile(pattern)
+        return [match(string) is not None for string in strings]
+
+class FuzzyMatcher(Matcher):
+    """
+    Fuzzy matcher based on the similarity ratio of two strings.
+
+    Uses rapidfuzz if it is installed, falling back to difflib otherwise.
+
+    Parameters:
+        threshold (float, default=80): Minimum similarity ratio (0-100)
+            for a string to be matched.
+    """
+    cost = 20
+
+    def __init__(self, threshold = 80):
+        self.threshold = threshold
+
+    def __call__(self, string, pattern):
+        return self.match_many([string], pattern)[0]
+
+    def match_many(self, strings, pattern):
+        if _fuzz is not None:
+            ratio = _fuzz.ratio
+            return [ratio(string, pattern) >= self.threshold for string in strings]
+        matcher = difflib.SequenceMatcher(b=pattern, autojunk=False)
+        result = []
+        for string in strings:
+            matcher.set_seq1(string)
+            result.append(matcher.ratio() * 100 >= self.threshold)
+        return result
+
+class RangeMatcher(Matcher):
+    """
+    Numeric range matcher.
+
+    Matches strings representing numbers, e.g., dates in file names, against
+    an inclusive range passed either as a 'min:max' string, with either bound
+    optional, or as a (min, max) tuple. Non-numeric strings are not matched.
+    """
+    cost = 3
+
+    @staticmethod
+    def _bounds(pattern):
+        if isinstance(pattern, str):
+            pattern = pattern.split(':')
+        low, high = pattern
+        return (None if low in (None, '') else float(low),
+                None if high in (None, '') else float(high))
+
+    def __call__(self, string, pattern):
+        return self.match_many([string], pattern)[0]
+
+    def match_many(self, strings, pattern):
+        low, high = self._bounds(pattern)
+        result = []
+        for string in strings:
+            try:
+                value = float(string)
+            except ValueError:
+                result.append(False)
+                continue
+            result.append((low is None or value >= low) and (high is None or value <= high))
+        return result
+
+_REGISTRY = {
+    'eq': FunctionMatcher(
+        eq, lambda strings, pattern: [s == pattern for s in strings], cost=1,
+        reachable=_eq_reachable),
+    'isin': FunctionMatcher(
+        isin, lambda strings, pattern: [pattern in s for s in strings],
+        cost=2, hereditary=True),
+    'regex': RegexMatcher(),
+    'glob': FunctionMatcher(glob, cost=8),
+    'ieq': FunctionMatcher(
+        ieq, lambda strings, pattern: [s.casefold() == pattern.casefold() for s in strings],
+        cost=3),
+    'iisin': FunctionMatcher(
+        iisin, lambda strings, pattern: [pattern.casefold() in s.casefold() for s in strings],
+        cost=3, hereditary=True),
+    'iregex': RegexMatcher(re.IGNORECASE),
+    'fnmatch': FnmatchMatcher(),
+    'ifnmatch': FnmatchMatcher(case_sensitive=False),
+    'startswith': FunctionMatcher(
+        startswith, lambda strings, pattern: [s.startswith(pattern) for s in strings],
+        cost=1, hereditary=True, reachable=_startswith_reachable),
+    'endswith': FunctionMatcher(
+        endswith, lambda strings, pattern: [s.endswith(pattern) for s in strings], cost=1),
+    'fuzzy': FuzzyMatcher(),
+    'range': RangeMatcher()
+    }
+
+def register(name, matcher, overwrite = False):
+    """
+    Function for adding a matcher to the registry.
+
+    Parameters
+    ----------
+    name: str
+        Name under which the matcher can be used as name_type, ext_type
+        or match_type.
+    matcher: Matcher | Callable[[str, Any], bool]
+        Matcher object or a scalar matching function, which is adapted
+        with FunctionMatcher.
+    overwrite: bool, default=False
+        Flag indicating whether an already registered matcher can be replaced.
+
+    Returns
+    -------
+    None
+    """
+    if not isinstance(name, str):
+        raise TypeError('"name" argument must be string type')
+    if name in _REGISTRY and not overwrite:
+        raise ValueError(f'"{name}" matcher is already registered')
+    if not isinstance(matcher, Matcher):
+        matcher = FunctionMatcher(matcher)
+    _REGISTRY[name] = matcher
+
+def unregister(name):
+    """
+    Function for removing a matcher from the registry.
+
+    Parameters
+    ----------
+    name: str
+        Name of a registered matcher.
+
+    Returns
+    -------
+    None
+    """
+    del _REGISTRY[name]
+
+def available():
+    """
+    Function returning the names of all registered matchers.
+
+    Returns
+    -------
+    List[str]
+        Names of the registered matchers.
+    """
+    return list(_REGISTRY)
+
+def get_matcher(match_type):
+    """
+    Function returning a registered matcher.
+
+    Parameters
+    ----------
+    match_type: str | Matcher
+        Name of a registered matcher or a Matcher object, which is returned as is.
+
+    Returns
+    -------
+    Matcher
+        Matcher object.
+    """
+    if isinstance(match_type, Matcher):
+        return match_type
+    if not isinstance(match_type, str):
+        raise TypeError('match type must be passed as a string or a Matcher')
+    try:
+        return _REGISTRY[match_type]
+    except KeyError:
+        raise ValueError(f'"{match_type}" must be one of {", ".join(_REGISTRY)}') from None
@@ -2,12 +2,1085 @@
 Main module with PathFinder object
 """
 import os
-from itertools import chain, filterfalse, groupby
-from functools import lru_cache, partial
-from pathlib import Path
-import inspect
+import json
+import asyncio
+import time
+import threading
+import heapq
+import hashlib
+import mmap
+from collections import ChainMap, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
+from itertools import chain, filterfalse, groupby, islice
 from . import matching
-from .abc_loader import ABLoader
+from .abc_loader import ABLoader, BaseLoader
+from .archive import _archive_members, _find_member, _is_archive, _split_member, _virtual_root
+from .matching import _resolve_range, _split_name
+from .query import Q, Query, _Batch, _FALSE, _Plan, _Term, _TRUE
+from .registry import _DirectoryTrie
+from .snapshot import _Snapshot
+from .storage import _open_paths, _save_paths
+from .telemetry import _measure
+
+# loop of the running coroutine, get_event_loop returns it on Python 3.6
+_running_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+def _select_files(plan, root, names, stat = None):
+    """
+    Private function for matching a batch of files in a single directory with a query plan.
+
+    File path terms are evaluated once for the whole directory, and the
+    remaining terms are evaluated on the batch (e.g., a directory listing)
+    with the batch form of the matchers, cheapest terms first.
+
+    Parameters
+    ----------
+    plan: query._Plan
+        Compiled query.
+    root: str
+        Path-like string pointing to the directory of the files.
+    names: Sequence[str]
+        File names combined with file extensions.
+    stat: Callable[[int], _FileStat | None], default=None
+        Function returning the metadata of the i-th file, None if it can't be
+        retrieved. Required only when the plan has metadata terms.
+
+    Returns
+    -------
+    List[int]
+        Indexes of the matching files, in ascending order.
+    """
+    query = plan.for_directory(root)
+    if query is _FALSE:
+        return []
+    return plan.select(query, _Batch(root, names, stat, plan.now))
+
+_FileStat = namedtuple('_FileStat', ['size', 'mtime', 'ctime', 'ino', 'dev'])
+_MemoryReport = namedtuple('_MemoryReport', ['uncompacted', 'compacted', 'saved', 'spilled'])
+
+def _file_stat(stat):
+    """
+    Private function for compacting an os.stat_result into _FileStat.
+
+    Parameters
+    ----------
+    stat: os.stat_result
+        Result of os.stat or os.DirEntry.stat.
+
+    Returns
+    -------
+    _FileStat
+        Named tuple with size, mtime, ctime, inode and device of a file.
+    """
+    return _FileStat(stat.st_size, stat.st_mtime, stat.st_ctime, stat.st_ino, stat.st_dev)
+
+def _member_stat(size, mtime):
+    """
+    Private function creating _FileStat of an archive member.
+
+    Archive members have no change time, inode or device, so the modification
+    time is reused as the change time and both identifiers are set to 0.
+    """
+    return _FileStat(size, mtime, mtime, 0, 0)
+
+# guards the check and update of visited sets shared by the threads of isolated scans
+_VISITED_LOCK = threading.Lock()
+
+def _claim(visited, key):
+    """
+    Private function adding a (device, inode) pair of a directory to the visited set.
+
+    The check and the update are a single atomic step, so threads sharing the set
+    never both claim the same physical directory and iterate over it twice.
+
+    Returns
+    -------
+    bool
+        True if the pair was added, False if it was already in the set.
+    """
+    with _VISITED_LOCK:
+        if key in visited:
+            return False
+        visited.add(key)
+        return True
+
+def _walk_entries(directory, traverse_subdirs, prune = None, mtimes = None,
+                  follow_symlinks = False, visited = None):
+    """
+    Private generator iterating over file entries with os.scandir.
+
+    The generator follows os.walk semantics: symlinked directories are not
+    descended into (unless follow_symlinks is set) and unreadable directories
+    are skipped, but it yields the os.DirEntry objects so their cached stat
+    information can be reused.
+
+    Parameters
+    ----------
+    directory: str
+        Path-like string pointing to an existing directory.
+    traverse_subdirs: bool
+        Flag indicating whether all subdirectories should be iterated over.
+    prune: Callable[[str], bool], default=None
+        Function returning True for subdirectories that should not be
+        iterated over.
+    mtimes: Dict[str: int], default=None
+        Dictionary to which the modification time (in nanoseconds) of every
+        iterated directory is written, retrieved before the directory is listed.
+    follow_symlinks: bool, default=False
+        Flag indicating whether symlinked subdirectories should be iterated over.
+    visited: Set[Tuple[int, int]], default=None
+        Set of (device, inode) pairs of the directories iterated over so far,
+        updated by the generator. Directories already in the set are skipped,
+        which breaks symlink cycles and prevents iterating over the same
+        physical directory reached through bind mounts or symlinks twice.
+
+    Returns
+    -------
+    Generator[Tuple[root[str], List[os.DirEntry]]]
+        Generator containing a 2-element tuple with the root directory
+        and all of its file entries.
+    """
+    stack = [directory]
+    while stack:
+        root = stack.pop()
+        try:
+            root_stat = None
+            if mtimes is not None or visited is not None:
+                root_stat = os.stat(root)
+            if visited is not None and not _claim(visited, (root_stat.st_dev,
+                                                            root_stat.st_ino)):
+                continue
+            subdirs, files = _list_entries(root, traverse_subdirs, prune, follow_symlinks)
+        except OSError:
+            continue
+        if mtimes is not None:
+            mtimes[root] = root_stat.st_mtime_ns
+        stack.extend(subdirs)
+        yield root, files
+
+def _list_entries(root, traverse_subdirs, prune = None, follow_symlinks = False):
+    """
+    Private function listing a single directory with os.scandir.
+
+    Parameters
+    ----------
+    root: str
+        Path-like string pointing to an existing directory.
+    traverse_subdirs: bool
+        Flag indicating whether subdirectories should be returned.
+    prune: Callable[[str], bool], default=None
+        Function returning True for subdirectories that should not be returned.
+    follow_symlinks: bool, default=False
+        Flag indicating whether symlinked subdirectories should be returned.
+
+    Returns
+    -------
+    Tuple[List[str], List[os.DirEntry]]
+        Paths of the subdirectories to be iterated over (symlinks excluded
+        unless follow_symlinks is set) and the file entries of the directory.
+    """
+    with os.scandir(root) as entries:
+        entries = list(entries)
+    subdirs, files = [], []
+    for entry in entries:
+        try:
+            if entry.is_dir():
+                if traverse_subdirs and (follow_symlinks or not entry.is_symlink()) \
+                        and not (prune and prune(entry.path)):
+                    subdirs.append(entry.path)
+            elif entry.is_file():
+                files.append(entry)
+        except OSError:
+            continue
+    return subdirs, files
+
+def _entry_stat(entries):
+    """
+    Private function returning a cached metadata getter of os.scandir entries.
+
+    Parameters
+    ----------
+    entries: Sequence[os.DirEntry]
+        File entries of a single directory.
+
+    Returns
+    -------
+    Callable[[int], _FileStat | None]
+        Function returning the metadata of the i-th entry, None if it can't
+        be retrieved.
+    """
+    cache = {}
+    def stat(i):
+        if i not in cache:
+            try:
+                cache[i] = _file_stat(entries[i].stat())
+            except OSError:
+                cache[i] = None
+        return cache[i]
+    return stat
+
+def _match_entries(plan, root, entries, collect):
+    """
+    Private generator matching os.scandir file entries of a single directory.
+
+    Parameters
+    ----------
+    plan: query._Plan
+        Compiled query.
+    root: str
+        Path-like string pointing to the directory of the entries.
+    entries: Sequence[os.DirEntry]
+        File entries of the directory.
+    collect: bool
+        Flag indicating whether metadata of the matching files should be
+        yielded as well. Files whose metadata can't be retrieved are skipped.
+
+    Returns
+    -------
+    Generator[Tuple[Tuple[root[str], file[str]], _FileStat | None]]
+        Generator containing the matching path and its metadata
+        (None when collect is False).
+    """
+    stat = _entry_stat(entries)
+    for i in _select_files(plan, root, [entry.name for entry in entries], stat):
+        if not collect:
+            yield (root, entries[i].name), None
+            continue
+        file_stat = stat(i)
+        if file_stat is not None:
+            yield (root, entries[i].name), file_stat
+    if plan.archives:
+        for entry in entries:
+            if _is_archive(entry.name):
+                yield from _match_archive(plan, entry.path, collect)
+
+def _match_archive(plan, path, collect):
+    """
+    Private generator matching the file members of a zip or tar archive.
+
+    Members are matched as files of virtual directories below the archive
+    path, with the metadata stored in the archive index.
+
+    Parameters
+    ----------
+    plan: query._Plan
+        Compiled query.
+    path: str
+        Path-like string pointing to the archive.
+    collect: bool
+        Flag indicating whether metadata of the matching members should be
+        yielded as well.
+
+    Returns
+    -------
+    Generator[Tuple[Tuple[root[str], file[str]], _FileStat | None]]
+        Generator containing the matching virtual path and its metadata
+        (None when collect is False).
+    """
+    for directory, members in _archive_members(path).items():
+        root = _virtual_root(path, directory)
+        stats = [_member_stat(size, mtime) for _, size, mtime, _ in members]
+        for i in _select_files(plan, root, [member[0] for member in members],
+                               stats.__getitem__):
+            yield (root, members[i][0]), stats[i] if collect else None
+
+def _scan_entries(directory, traverse_subdirs, plan, collect = False, mtimes = None,
+                  follow_symlinks = False, visited = None):
+    """
+    Private generator matching os.scandir file entries with a query plan.
+
+    Subdirectories are pruned from the traversal when the plan proves that
+    none of the files below them can match.
+
+    Parameters
+    ----------
+    directory: str
+        Path-like string pointing to an existing directory.
+    traverse_subdirs: bool
+        Flag indicating whether all subdirectories should be iterated over.
+    plan: query._Plan
+        Compiled query.
+    collect: bool, default=False
+        Flag indicating whether metadata of the matching files should be
+        yielded as well.
+    mtimes: Dict[str: int], default=None
+        Dictionary to which the modification times of the iterated
+        directories are written.
+    follow_symlinks: bool, default=False
+        Flag indicating whether symlinked subdirectories should be iterated over.
+    visited: Set[Tuple[int, int]], default=None
+        Set of (device, inode) pairs of the directories iterated over so far,
+        see _walk_entries.
+
+    Returns
+    -------
+    Generator[Tuple[Tuple[root[str], file[str]], _FileStat | None]]
+        Generator containing the matching path and its metadata
+        (None when collect is False).
+    """
+    for root, entries in _walk_entries(directory, traverse_subdirs, plan.prunes, mtimes,
+                                       follow_symlinks, visited):
+        yield from _match_entries(plan, root, entries, collect)
+
+def _scan_subtree(directory, plan, collect = False, track = False, follow_symlinks = False,
+                  visited = None):
+    """
+    Private worker function for nested directory iteration in a separate process.
+
+    Parameters
+    ----------
+    directory: str
+        Path-like string pointing to an existing directory.
+    plan: query._Plan
+        Compiled query.
+    collect: bool, default=False
+        Flag indicating whether metadata of the matching files should be
+        sent back as well.
+    track: bool, default=False
+        Flag indicating whether modification times of the iterated
+        directories should be sent back as well.
+    follow_symlinks: bool, default=False
+        Flag indicating whether symlinked subdirectories should be iterated over.
+    visited: Set[Tuple[int, int]], default=None
+        Set of (device, inode) pairs of the directories iterated over by
+        the parent process, see _walk_entries. The worker updates its own copy.
+
+    Returns
+    -------
+    Tuple[List[Tuple[root[str], Tuple[file[str]], Tuple[_FileStat] | None]], Dict[str: int] | None]
+        Compact batches with a root directory, all of its matching files and
+        their metadata, so the root string is sent back to the parent process
+        only once, and the directory modification times (None when track is False).
+    """
+    batches, mtimes = [], {} if track else None
+    for root, group in groupby(_scan_entries(directory, True, plan, collect, mtimes,
+                                             follow_symlinks, visited),
+                               key=lambda item: item[0][0]):
+        paths, stats = zip(*group)
+        batches.append((root, tuple(p[1] for p in paths), stats if collect else None))
+    return batches, mtimes
+
+def _collect_batches(futures, mtimes = None):
+    """
+    Private generator unpacking the results of _scan_subtree workers.
+
+    Parameters
+    ----------
+    futures: List[concurrent.futures.Future]
+        Futures of the submitted _scan_subtree calls.
+    mtimes: Dict[str: int], default=None
+        Dictionary updated with the directory modification times sent back
+        by the workers.
+
+    Returns
+    -------
+    Generator[Tuple[Tuple[root[str], file[str]], _FileStat | None]]
+        Generator containing the matching path and its metadata.
+    """
+    for future in futures:
+        batches, subtree_mtimes = future.result()
+        if mtimes is not None:
+            mtimes.update(subtree_mtimes)
+        for root, files, stats in batches:
+            yield from zip(((root, file) for file in files), stats or (None,) * len(files))
+
+def _owner(root, directories):
+    """
+    Private function returning the registered directory whose scan includes a directory.
+
+    Returns
+    -------
+    str | None
+        The directory itself when it is registered, otherwise its closest
+        registered parent scanned with subdirectories, None when there is none.
+    """
+    head = root
+    while True:
+        if head in directories and (head == root or directories[head]):
+            return head
+        parent = os.path.dirname(head)
+        if parent == head:
+            return None
+        head = parent
+
+def _rescan_roots(roots, directory, traverse_subdirs, plan, known, collect,
+                  follow_symlinks, visited):
+    """
+    Private function rescanning the changed directories of a single registered directory.
+
+    Parameters
+    ----------
+    roots: List[str]
+        Directories with a recorded modification time belonging to the scan
+        of the registered directory.
+    directory: str | None
+        Registered directory, iterated fully when it has no recorded modification
+        time. None for directories no longer covered by any registered directory.
+    traverse_subdirs: bool
+        traverse_subdirs flag of the registered directory.
+
+    The remaining parameters are the same as in _rescan.
+
+    Returns
+    -------
+    Tuple[Set[str], Dict[str: int], Dict[Tuple[str, str]: _FileStat | None]]
+        Same as _rescan, for the registered directory.
+    """
+    unchanged, mtimes, changed = set(), {}, []
+    for root in roots:
+        try:
+            current = os.stat(root).st_mtime_ns
+        except OSError:
+            continue
+        if current == known[root]:
+            unchanged.add(root)
+            mtimes[root] = current
+        else:
+            changed.append((root, traverse_subdirs if root == directory else True))
+    if directory is not None and directory not in known:
+        changed.append((directory, traverse_subdirs))
+
+    found = {}
+    prune = lambda path: path in known or plan.prunes(path)
+    for root, deep in changed:
+        for path, entries in _walk_entries(root, deep, prune, mtimes,
+                                           follow_symlinks, visited):
+            found.update(_match_entries(plan, path, entries, collect))
+    return unchanged, mtimes, found
+
+def _rescan(directories, plan, known = None, collect = False, follow_symlinks = False,
+            visited = None, timeout = None, dir_timeout = None):
+    """
+    Private function rescanning only the directories that changed since a previous scan.
+
+    Directories whose modification time differs from the recorded one are listed
+    again, new subdirectories and registered directories without a recorded
+    modification time are iterated fully, and directories that no longer exist
+    are dropped.
+
+    Parameters
+    ----------
+    directories: Dict[str: bool]
+        Registered directories and traverse_subdirs flags.
+    plan: query._Plan
+        Compiled query.
+    known: Dict[str: int], default=None
+        Modification times (in nanoseconds) recorded during the previous scan.
+        All directories are iterated when None.
+    collect: bool, default=False
+        Flag indicating whether metadata of the matching files should be
+        collected as well.
+    follow_symlinks: bool, default=False
+        Flag indicating whether symlinked subdirectories should be iterated over.
+    visited: Set[Tuple[int, int]], default=None
+        Set of (device, inode) pairs of the directories iterated over so far,
+        see _walk_entries.
+    timeout: float, default=None
+        Maximum number of seconds for all of the directories. When set, or when
+        dir_timeout is set, every registered directory is checked and rescanned
+        in the worker pool of _run_isolated. A registered directory that doesn't
+        finish in time keeps its previous state: its directories are returned
+        as unchanged with their recorded modification times, so they are
+        rescanned by the next call.
+    dir_timeout: float, default=None
+        Maximum number of seconds for every single registered directory.
+
+    Returns
+    -------
+    Tuple[Set[str], Dict[str: int], Dict[Tuple[str, str]: _FileStat | None], List[str]]
+        Directories whose listings are unchanged, current modification times
+        of all scanned directories, the matching paths found in the rescanned
+        directories with their metadata, and the registered directories that
+        timed out.
+    """
+    known = {} if known is None else known
+    groups = {directory: [] for directory in directories}
+    for root in known:
+        groups.setdefault(_owner(root, directories), []).append(root)
+    tasks = [partial(_rescan_roots, roots, directory, directories.get(directory, True), plan,
+                     known, collect, follow_symlinks, visited)
+             for directory, roots in groups.items()]
+
+    if timeout is None and dir_timeout is None:
+        results, timed_out = [(True, task()) for task in tasks], []
+    else:
+        results, timed_out = _run_isolated(tasks, timeout, dir_timeout)
+
+    unchanged, mtimes, found = set(), {}, {}
+    for (directory, roots), result in zip(groups.items(), results):
+        if result is None:
+            unchanged.update(roots)
+            mtimes.update((root, known[root]) for root in roots)
+            continue
+        if not result[0]:
+            raise result[1]
+        unchanged.update(result[1][0])
+        mtimes.update(result[1][1])
+        found.update(result[1][2])
+    return unchanged, mtimes, found, [list(groups)[i] for i in timed_out]
+
+def _read_checkpoint(path):
+    """
+    Private function reading the state of PathFinder.stream from a checkpoint file.
+
+    Parameters
+    ----------
+    path: str | None
+        Path-like string of the checkpoint file. A missing file or None
+        results in an empty state.
+
+    Returns
+    -------
+    Tuple[Set[Tuple[str, str]], Dict[Tuple[str, str]: Tuple[int, float, int]], Dict[str: int] | None]
+        Processed paths, pending paths with their last observed size,
+        modification time and number of polls they were unchanged for,
+        and directory modification times (None when nothing was scanned yet).
+    """
+    if path is None or not os.path.exists(path):
+        return set(), {}, None
+    with open(path, 'r', encoding='utf-8') as file:
+        lines = file.read().splitlines()
+    state = json.loads(lines[0])
+    if state.get('version') == 1:
+        processed = {tuple(p) for p in state['processed']}
+    else:
+        processed, state = set(), {'pending': [], 'mtimes': None}
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # last record torn by an interrupted append
+                break
+            if 'processed' in record:
+                processed.add(tuple(record['processed']))
+            else:
+                state = record
+    return (processed,
+            {(root, name): (size, mtime, seen)
+             for root, name, size, mtime, seen in state['pending']},
+            state['mtimes'])
+
+def _checkpoint_state(pending, mtimes):
+    """
+    Private function returning the checkpoint record of pending paths and directory times.
+    """
+    return {'pending': [list(p) + list(v) for p, v in pending.items()], 'mtimes': mtimes}
+
+def _write_checkpoint(path, processed, pending, mtimes):
+    """
+    Private function atomically writing the state of PathFinder.stream to a checkpoint file.
+
+    The checkpoint is a journal of JSON lines: a header, a record for every
+    processed path and records of the pending paths and directory modification
+    times, the last of which is the current one. This function writes
+    a compacted journal, later changes are appended by _append_checkpoint.
+
+    Parameters
+    ----------
+    path: str | None
+        Path-like string of the checkpoint file. Nothing is written when None.
+    processed: Set[Tuple[str, str]]
+        Processed paths.
+    pending: Dict[Tuple[str, str]: Tuple[int, float, int]]
+        Pending paths with their last observed size, modification time
+        and number of polls they were unchanged for.
+    mtimes: Dict[str: int] | None
+        Directory modification times.
+
+    Returns
+    -------
+    None
+    """
+    if path is None:
+        return
+    with open(path + '.tmp', 'w', encoding='utf-8') as file:
+        file.write(json.dumps({'version': 2}) + '\n')
+        for p in sorted(processed):
+            file.write(json.dumps({'processed': p}) + '\n')
+        file.write(json.dumps(_checkpoint_state(pending, mtimes)) + '\n')
+    os.replace(path + '.tmp', path)
+
+def _append_checkpoint(path, records):
+    """
+    Private function appending records to a checkpoint file written by _write_checkpoint.
+
+    Parameters
+    ----------
+    path: str | None
+        Path-like string of the checkpoint file. Nothing is written when None.
+    records: List[dict]
+        Records of newly processed paths and of the changed state.
+
+    Returns
+    -------
+    None
+    """
+    if path is None or not records:
+        return
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write(''.join(json.dumps(r) + '\n' for r in records))
+
+def _run_isolated(tasks, timeout = None, dir_timeout = None, workers = None):
+    """
+    Private function running tasks in a bounded pool of daemon threads, with timeouts.
+
+    At most workers tasks run at the same time. A task that doesn't finish
+    within dir_timeout seconds from its start, or before timeout seconds elapse
+    for the whole call, is abandoned. Python threads can't be interrupted, so
+    the worker running an abandoned task keeps running until the blocking call
+    returns, e.g. until a hung mount responds, and it is replaced by a new worker.
+    Workers are daemon threads, so they never block the interpreter exit, and they
+    don't start tasks that were not started before the call returned.
+
+    Parameters
+    ----------
+    tasks: List[Callable[[], Any]]
+        Functions without arguments.
+    timeout: float, default=None
+        Maximum number of seconds for all of the tasks.
+    dir_timeout: float, default=None
+        Maximum number of seconds for every single task.
+    workers: int, default=None
+        Maximum number of tasks running at the same time, defaults to
+        min(32, os.cpu_count() + 4).
+
+    Returns
+    -------
+    Tuple[List[Tuple[bool, Any] | None], List[int]]
+        Result of every task, as a (True, returned value) or (False, raised
+        exception) tuple, None for the tasks that timed out, and the indexes
+        of the tasks that timed out.
+    """
+    workers = min(len(tasks), workers or min(32, (os.cpu_count() or 1) + 4))
+    queue, lock, closed = list(range(len(tasks)))[::-1], threading.Lock(), threading.Event()
+    started, results = [None] * len(tasks), [None] * len(tasks)
+    done = [threading.Event() for _ in tasks]
+
+    def work():
+        while not closed.is_set():
+            with lock:
+                if not queue:
+                    return
+                i = queue.pop()
+                started[i] = time.monotonic()
+            try:
+                results[i] = (True, tasks[i]())
+            except Exception as error:
+                results[i] = (False, error)
+            done[i].set()
+
+    def spawn():
+        threading.Thread(target=work, name='file-navigator scan', daemon=True).start()
+
+    for _ in range(workers):
+        spawn()
+    end = float('inf') if timeout is None else time.monotonic() + timeout
+    timed_out = []
+    for i, event in enumerate(done):
+        while not event.is_set():
+            with lock:
+                begun = started[i]
+            if dir_timeout is not None and begun is None:
+                # dir_timeout of a queued task counts from its start, so it is polled until then
+                deadline, poll = end, 0.01
+            else:
+                deadline, poll = end if dir_timeout is None else min(end, begun + dir_timeout), None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            waits = [t for t in (remaining, poll) if t is not None and t != float('inf')]
+            event.wait(min(waits) if waits else None)
+        with lock:
+            if event.is_set():
+                continue
+            if started[i] is None:
+                queue.remove(i)
+            else:
+                spawn()
+        results[i] = None
+        timed_out.append(i)
+    closed.set()
+    return results, timed_out
+
+def _scan_isolated(directories, plan, collect, timeout = None, dir_timeout = None,
+                   mtimes = None, follow_symlinks = False, visited = None):
+    """
+    Private function iterating over the directories in a pool of daemon threads, with timeouts.
+
+    A directory that doesn't finish within dir_timeout seconds from its start,
+    or before timeout seconds elapse for the whole call, is abandoned: paths found
+    in it so far are kept, and its worker thread keeps running until the blocking
+    call returns (see _run_isolated), so a hung mount blocks neither the other
+    directories nor the interpreter exit.
+
+    Parameters
+    ----------
+    directories: Dict[str: bool]
+        Registered directories and traverse_subdirs flags.
+    plan: query._Plan
+        Compiled query.
+    collect: bool
+        Flag indicating whether metadata of the matching files should be
+        collected as well.
+    timeout: float, default=None
+        Maximum number of seconds for all of the directories.
+    dir_timeout: float, default=None
+        Maximum number of seconds for every single directory.
+    mtimes: Dict[str: int], default=None
+        Dictionary to which the modification times of the iterated directories
+        are written, only for the directories that finished.
+    follow_symlinks: bool, default=False
+        Flag indicating whether symlinked subdirectories should be iterated over.
+    visited: Set[Tuple[int, int]], default=None
+        Set of (device, inode) pairs of the directories iterated over so far,
+        shared by all of the threads and updated atomically with _claim,
+        see _walk_entries.
+
+    Returns
+    -------
+    Tuple[Dict[Tuple[str, str]: _FileStat | None], List[str]]
+        Matching paths with their metadata, and the directories that timed out.
+    """
+    def scan(directory, traverse_subdirs, found, dir_mtimes):
+        for item in _scan_entries(directory, traverse_subdirs, plan, collect, dir_mtimes,
+                                  follow_symlinks, visited):
+            found.append(item)
+
+    states = [(directory, traverse_subdirs, [], None if mtimes is None else {})
+              for directory, traverse_subdirs in directories.items()]
+    results, timed_out = _run_isolated([partial(scan, *state) for state in states],
+                                       timeout, dir_timeout)
+    found = {}
+    for (directory, _, items, dir_mtimes), result in zip(states, results):
+        if result is not None and not result[0]:
+            raise result[1]
+        if result is not None and mtimes is not None:
+            mtimes.update(dir_mtimes)
+        found.update(list(items))
+    return found, [states[i][0] for i in timed_out]
+
+def _dedupe_inodes(found, seen = None):
+    """
+    Private function keeping only the first path of every physical file.
+
+    Parameters
+    ----------
+    found: Dict[Tuple[str, str]: _FileStat]
+        Paths and their metadata, in order of precedence.
+    seen: Set[Tuple[int, int]], default=None
+        (device, inode) pairs of files that are already kept elsewhere.
+
+    Returns
+    -------
+    Dict[Tuple[str, str]: _FileStat]
+        Paths pointing to distinct (device, inode) pairs and their metadata.
+        Metadata without inodes (os.DirEntry.stat on Windows) is retrieved
+        again with os.stat, archive members are always kept.
+    """
+    seen = set() if seen is None else seen
+    unique = {}
+    for path, stat in found.items():
+        if not stat.ino:
+            try:
+                stat = _file_stat(os.stat(os.path.join(*path)))
+            except OSError:
+                if _split_member(os.path.join(*path)) is not None:
+                    unique[path] = stat
+                continue
+        key = (stat.dev, stat.ino)
+        if key not in seen:
+            seen.add(key)
+            unique[path] = stat
+    return unique
+
+def _range_query(query, size = None, mtime = None, ctime = None, age = None):
+    """
+    Private function combining a query with metadata range terms.
+
+    Parameters
+    ----------
+    query: query.Query | None
+        Query to be combined, None for no query.
+    size: Tuple[int, int], default=None
+        Inclusive range of file sizes in bytes.
+    mtime: Tuple[float | datetime, float | datetime], default=None
+        Inclusive range of file modification times.
+    ctime: Tuple[float | datetime, float | datetime], default=None
+        Inclusive range of file change times.
+    age: Tuple[float | timedelta, float | timedelta], default=None
+        Inclusive range of seconds elapsed since the file modification.
+
+    Returns
+    -------
+    query.Query | None
+        Conjunction of the query and the range terms, None if both are missing.
+    """
+    for field, bounds in (('size', size), ('mtime', mtime), ('ctime', ctime), ('age', age)):
+        if bounds is None:
+            continue
+        term = _Term(field, _resolve_range(bounds, field))
+        query = term if query is None else query & term
+    return query
+
+def _scan_directory(root, traverse_subdirs, plan, collect = False):
+    """
+    Private worker function listing and matching a single directory.
+
+    Parameters
+    ----------
+    root: str
+        Path-like string pointing to an existing directory.
+    traverse_subdirs: bool
+        Flag indicating whether subdirectories should be returned.
+    plan: query._Plan
+        Compiled query.
+    collect: bool, default=False
+        Flag indicating whether metadata of the matching files should be
+        returned as well.
+
+    Returns
+    -------
+    Tuple[List[str], List[Tuple[Tuple[root[str], file[str]], _FileStat | None]]]
+        Subdirectories to be iterated over, and the matching paths with their
+        metadata. Both are empty when the directory can't be listed.
+    """
+    try:
+        subdirs, files = _list_entries(root, traverse_subdirs, plan.prunes)
+    except OSError:
+        return [], []
+    return subdirs, list(_match_entries(plan, root, files, collect))
+
+async def _atraverse(executor, directory, traverse_subdirs, plan, collect, limit, queue):
+    """
+    Private coroutine iterating over a registered directory in an executor.
+
+    Every directory is listed and matched as a separate executor job, so
+    cancellation stops the traversal after the jobs in flight. Directories
+    waiting to be listed are kept in a queue consumed by limit worker tasks,
+    so at most limit directories of the tree are listed at the same time and
+    the number of tasks doesn't grow with the tree. Matching paths are put
+    into a bounded queue, which suspends the traversal while the queue is full.
+
+    Parameters
+    ----------
+    executor: concurrent.futures.Executor | None
+        Executor running the jobs, None for the default executor of the loop.
+    directory: str
+        Path-like string pointing to an existing directory.
+    traverse_subdirs: bool
+        Flag indicating whether all subdirectories should be iterated over.
+    plan: query._Plan
+        Compiled query.
+    collect: bool
+        Flag indicating whether metadata of the matching files should be
+        collected as well.
+    limit: int
+        Maximum number of directories of the tree listed at the same time.
+    queue: asyncio.Queue
+        Queue to which the matching paths and their metadata are put.
+
+    Returns
+    -------
+    None
+    """
+    loop = _running_loop()
+    pending = asyncio.Queue()
+    pending.put_nowait(directory)
+
+    async def work():
+        while True:
+            root = await pending.get()
+            try:
+                subdirs, found = await loop.run_in_executor(
+                    executor, _scan_directory, root, traverse_subdirs, plan, collect)
+                for subdir in subdirs:
+                    pending.put_nowait(subdir)
+                for item in found:
+                    await queue.put(item)
+            finally:
+                pending.task_done()
+
+    workers = [asyncio.ensure_future(work()) for _ in range(limit)]
+    joined = asyncio.ensure_future(pending.join())
+    try:
+        done, _ = await asyncio.wait(workers + [joined], return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            # workers finish only by raising
+            task.result()
+    finally:
+        for task in workers + [joined]:
+            task.cancel()
+        await asyncio.gather(*workers, joined, return_exceptions=True)
+
+def _concat(objects):
+    """
+    Private function concatenating loaded data objects.
+
+    Parameters
+    ----------
+    objects: List[Any]
+        Objects loaded from the files of a single group.
+
+    Returns
+    -------
+    Any
+        pandas objects concatenated with pandas.concat, pyarrow tables
+        concatenated with pyarrow.concat_tables, or chained lists.
+    """
+    module = type(objects[0]).__module__.split('.')[0]
+    if module == 'pandas':
+        import pandas
+        return pandas.concat(objects)
+    if module == 'pyarrow':
+        import pyarrow
+        return pyarrow.concat_tables(objects)
+    if isinstance(objects[0], list):
+        return list(chain.from_iterable(objects))
+    raise TypeError(f'{type(objects[0]).__name__} objects can\'t be concatenated, '
+                    'pass concat=False or a concatenating function')
+
+def _digest(path, size, sample = None):
+    """
+    Private function hashing a file through a read-only memory map.
+
+    Parameters
+    ----------
+    path: str
+        Path-like string pointing to an existing, non-empty file.
+    size: int
+        Size of the file in bytes.
+    sample: int, default=None
+        Number of bytes hashed from both the beginning and the end of the file.
+        The whole file is hashed when None or when the file is not larger
+        than two samples.
+
+    Returns
+    -------
+    bytes | None
+        BLAKE2b digest of the file or None if the file could not be read.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    try:
+        with open(path, 'rb') as file, \
+             mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                if sample is None or size <= 2 * sample:
+                    for offset in range(0, len(view), 1 << 24):
+                        digest.update(view[offset:offset + (1 << 24)])
+                else:
+                    digest.update(view[:sample])
+                    digest.update(view[-sample:])
+            finally:
+                view.release()
+    except (OSError, ValueError):
+        return None
+    return digest.digest()
+
+def _load_path(loader, path, kwargs):
+    """
+    Private function loading a single file, recording its telemetry when the loader has a callback.
+
+    BaseLoader objects record their own telemetry (see BaseLoader.telemetry),
+    other loaders with a telemetry attribute are measured around their load method.
+
+    Parameters
+    ----------
+    loader: abc_loader.ABLoader
+        Object that has a load method defined.
+    path: str
+        Path-like string pointing to the file.
+    kwargs: dict
+        Key-value parameters passed to the load method.
+
+    Returns
+    -------
+    Any
+        Loaded data object.
+    """
+    telemetry = getattr(loader, 'telemetry', None)
+    if telemetry is None or isinstance(loader, BaseLoader):
+        return loader.load(path, **kwargs)
+    return _measure(telemetry, path, f'{type(loader).__name__}.load',
+                    partial(loader.load, path, **kwargs))
+
+class _LoadHandle:
+    """
+    Private class deferring the loading of a single file until first access.
+
+    Parameters:
+        path (str): Path-like string pointing to the file.
+        loader (abc_loader.ABLoader): Object that has a load method defined.
+        kwargs (dict): Key-value parameters passed to the load method.
+
+    Attributes:
+        path (str): Path-like string pointing to the file.
+        loaded (bool): Flag indicating whether the data is currently held in memory.
+
+    Methods:
+        load (): Loads the data on the first call and returns the cached result
+            afterwards. Concurrent first calls load the file only once.
+        release (): Drops the cached result, the next load reads the file again.
+        to_delayed (): Wraps the load in a dask.delayed object, usable as
+            a partition of dask.dataframe.from_delayed (requires dask).
+    """
+    __slots__ = ('path', '_loader', '_kwargs', '_data', '_loaded', '_lock')
+
+    def __init__(self, path, loader, kwargs):
+        self.path = path
+        self._loader = loader
+        self._kwargs = kwargs
+        self._data = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'_LoadHandle({self.path!r}, loaded={self._loaded})'
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def load(self):
+        """
+        Loads the data from the file, or returns the cached result.
+
+        Returns
+        -------
+        Any
+            Loaded data object, e.g., pandas DataFrame.
+        """
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._data = _load_path(self._loader, self.path, self._kwargs)
+                    self._loaded = True
+        return self._data
+
+    def release(self):
+        """
+        Drops the cached result, releasing its memory when nothing else references it.
+        """
+        with self._lock:
+            self._data = None
+            self._loaded = False
+
+    def to_delayed(self):
+        """
+        Wraps the load in a dask.delayed object.
+
+        Returns
+        -------
+        dask.delayed.Delayed
+            Delayed object loading the file when it is computed. The handle's
+            cache is shared, so a file loaded before is not read again.
+        """
+        try:
+            from dask import delayed
+        except ImportError:
+            raise ImportError('dask package is required to create delayed partitions') from None
+        return delayed(self.load, pure=True)(dask_key_name=f'load-{self.path}')
 
 class _PathManager:
     """
@@ -16,16 +1089,23 @@ class _PathManager:
     Parameters:
         paths (List[Tuple[str, str]]): Two-element Tuple or List of Tuples,
             containing path-like strings and file names combined with file extensions.
+        stats (Dict[Tuple[str, str]: _FileStat], default=None): Metadata of
+            the paths collected during the directory scan. Missing entries
+            are retrieved with os.stat on first use and cached.
 
     Attributes:
         paths (List[Tuple[str, str]]): Returns the list of the paths attribute,
             that the class was instantiated with in reversed order (file name is
             the first item in the tuple instead of the file path).
         matching_eng (Type(matching)): Class with the matching functions.
+        timed_out (Tuple[str]): Registered directories whose traversal timed out
+            in PathFinder.find, so the paths are partial. Empty for complete results.
 
     Methods:
-        select_paths (pattern: str, match_type: str): Allows filtering of the file paths
-            based on the given pattern and matching function from matching_eng.
+        select_paths (pattern: str | Query, match_type: str, size, mtime, ctime, age): Allows
+            filtering of the file paths based on the given pattern and matching
+            function from matching_eng, or on a query built with Q,
+            as well as on (min, max) ranges of file metadata.
             Default match type is equality check: 'eq'.
             The method returns a new instance of _PathManager.
         groupby (by: str, pattern: str, match_type: str): Allows grouping
@@ -34,7 +1114,47 @@ class _PathManager:
             and matching functions from matching_eng.
             The method returns a dictionary with the group key and a new instance of _PathManager
             instantiated with group values.
+        top (k: int, by: str, reverse: bool): Selects k paths with the largest
+            (or smallest) modification time, size or name without a full sort.
+            The method returns a new instance of _PathManager.
+        top_by (group: str, k: int, by: str, reverse: bool, pattern: str, match_type: str):
+            Group-wise variant of top, grouping the paths the same way as groupby.
+            The method returns a dictionary with the group key and a new instance
+            of _PathManager with the top k paths of the group.
+        duplicates (workers: int, sample: int): Finds groups of files with
+            identical content, hashing only the files whose size and sampled
+            content collide. The method returns a list of new instances of _PathManager.
+        save (path: str, stat: bool): Saves the paths and optional metadata
+            in a compact, memory-mappable binary file.
+        open (path: str): Class method creating a new instance from a file
+            written by save, without copying the paths into memory.
+        refresh (): Rescans only the directories that changed since the instance
+            was found by PathFinder.find. The method returns a new instance of
+            _PathManager with the updated paths, and the added and removed paths.
+        __or__, __and__, __sub__ (other: _PathManager): Union, intersection
+            and difference of the paths, keeping the order of the left operand.
+            Membership is checked with a hash index built once per instance.
+            The methods return a new instance of _PathManager, which is empty
+            when no path is left, e.g. for the difference of equal operands.
+        __contains__ (path: Tuple[str, str] | str): Checks whether a (file name,
+            file path) tuple, in the same order as in paths, or a full path-like
+            string is one of the paths.
+        __iter__: Iterates over the paths in the same order as paths.
         load (Loader, **kwargs): Loads data from the file specified by a single path.
+            The telemetry callback of the loader, e.g. LoadTelemetry, receives
+            a record of the size, load time and memory of each file.
+        load_lazy (Loader, **kwargs): Returns handles loading each file only when
+            first accessed, so files that are never accessed are never read.
+        load_compact (Loader, budget: int, sample: int, category_ratio: float,
+            float32: bool, spill: str, **kwargs): Loads data with compact pandas
+            dtypes within a memory budget, returning the data and a memory report.
+        schemas (Loader, workers: int, **kwargs): Groups the paths by the schema
+            sniffed from each file. The method returns a dictionary with the schema
+            key and a new instance of _PathManager.
+        aload (Loader, executor, limit: int, **kwargs): Coroutine loading data
+            from all of the paths in an executor, at most limit at the same time.
+        aiter_load (Loader, executor, limit: int, **kwargs): Async generator
+            yielding paths and loaded data objects in order of completion.
         path (pattern: str, match_type: str, it): Key function for grouping paths
             by file path.
         name (pattern: str, match_type: str, it): Key function for grouping paths
@@ -42,92 +1162,863 @@ class _PathManager:
         ext (pattern: str, match_type: str, it): Key function for grouping paths
             by file type.
     """
-    def __init__(self, paths):
+    def __init__(self, paths, stats = None):
         if len(paths) == 0:
             raise ValueError('"paths" parameter is empty.')
+        self._setup(paths, stats)
+
+    def _setup(self, paths, stats):
+        """
+        Private function initializing the attributes of a new instance.
+        """
+        if isinstance(paths, tuple):
+            self._paths = [paths]
+        else:
+            self._paths = paths
+        self._stats = {} if stats is None else stats
+        self._index = None
+        self._source = None
+        self._mtimes = None
+        self.timed_out = ()
+        self.matching_eng = matching
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __iter__(self):
+        return (tuple(reversed(p)) for p in self._paths)
+
+    def __contains__(self, path):
+        if isinstance(path, tuple):
+            path = tuple(reversed(path))
+        elif isinstance(path, (str, os.PathLike)):
+            path = os.path.split(os.fspath(path))
+        else:
+            return False
+        return path in self._members()
+
+    @classmethod
+    def _result(cls, paths, stats = None):
+        """
+        Private function creating a new instance that may hold no paths.
+
+        Empty paths are rejected by the constructor, but they are a routine
+        outcome of set operations and refreshes, e.g. a - a or a refresh after
+        all of the matched files were deleted.
+
+        Parameters
+        ----------
+        paths: List[Tuple[str, str]]
+            Two-element tuples with the root directory and the file name.
+        stats: Dict[Tuple[str, str]: _FileStat], default=None
+            Metadata cache of the paths.
+
+        Returns
+        -------
+        _PathManager
+            New instance of _PathManager.
+        """
+        self = cls.__new__(cls)
+        self._setup(paths, stats)
+        return self
+
+    def _members(self):
+        """
+        Private function returning the hash index of the paths.
+
+        The index is built on first use and kept for the lifetime of the
+        instance, so repeated membership tests and set operations cost O(1)
+        per path.
+
+        Returns
+        -------
+        frozenset
+            Set of two-element tuples with the root directory and the file name.
+        """
+        if self._index is None:
+            self._index = frozenset(self._paths)
+        return self._index
+
+    def _combine(self, other, paths):
+        """
+        Private function creating a new instance from the result of a set operation.
+
+        Metadata caches of both operands are chained, without copying,
+        so metadata collected by either of them is reused.
+
+        Parameters
+        ----------
+        other: _PathManager
+            The other operand of the set operation.
+        paths: List[Tuple[str, str]]
+            Paths resulting from the set operation.
+
+        Returns
+        -------
+        _PathManager
+            New instance of _PathManager, empty when no path is left.
+        """
+        stats = self._stats
+        if other._stats is not stats:
+            stats = ChainMap(stats, other._stats)
+        return self._result(paths, stats)
+
+    def __or__(self, other):
+        if not isinstance(other, _PathManager):
+            return NotImplemented
+        members = self._members()
+        return self._combine(other, list(chain(self._paths,
+                                               (p for p in other._paths if p not in members))))
+
+    def __and__(self, other):
+        if not isinstance(other, _PathManager):
+            return NotImplemented
+        members = other._members()
+        return self._combine(other, [p for p in self._paths if p in members])
+
+    def __sub__(self, other):
+        if not isinstance(other, _PathManager):
+            return NotImplemented
+        members = other._members()
+        return self._combine(other, [p for p in self._paths if p not in members])
+
+    def _spawn(self, paths):
+        """
+        Private function creating a new instance from a subset of the paths.
+
+        The new instance shares the metadata cache, so no metadata is
+        retrieved again for the paths that were already scanned.
+
+        Parameters
+        ----------
+        paths: List[Tuple[str, str]]
+            Subset of the paths of this instance.
+
+        Returns
+        -------
+        _PathManager
+            New instance of _PathManager.
+        """
+        return self.__class__(paths, self._stats)
+
+    def _stat(self, path):
+        """
+        Private function returning cached metadata of a single path.
+
+        Parameters
+        ----------
+        path: Tuple[str, str]
+            Two-element tuple with the root directory and the file name.
+
+        Returns
+        -------
+        _FileStat
+            Metadata collected during the scan, or retrieved with os.stat
+            (or from the archive index for archive members) and cached
+            when it was not collected.
+        """
+        stat = self._stats.get(path)
+        if stat is None:
+            try:
+                stat = _file_stat(os.stat(os.path.join(*path)))
+            except OSError:
+                member = _split_member(os.path.join(*path))
+                item = member and member[1] and _find_member(*member)
+                if not item:
+                    raise
+                stat = _member_stat(item[1], item[2])
+            self._stats[path] = stat
+        return stat
+
+    def save(self, path, stat = None):
+        """
+        Saves the paths in a compact, memory-mappable binary file.
+
+        The file stores a deduplicated directory table, packed file name
+        columns and an optional metadata column, so it can be opened by many
+        processes with _PathManager.open at nearly zero cost.
+
+        Parameters
+        ----------
+        path: str
+            Path-like string of the file to be written.
+        stat: bool, default=None
+            Flag indicating whether the metadata column should be saved.
+            True retrieves missing metadata with os.stat, False omits the column
+            and None saves it only when metadata of every path is cached.
+
+        Returns
+        -------
+        None
+        """
+        paths = list(self._paths)
+        if stat is None:
+            stat = all(p in self._stats for p in paths)
+        _save_paths(path, paths, [self._stat(p) for p in paths] if stat else None)
+
+    @classmethod
+    def open(cls, path):
+        """
+        Creates a new instance from a file written by _PathManager.save.
+
+        The file is memory-mapped: directory strings are decoded once,
+        file names and metadata are read from the mapping on access.
+
+        Parameters
+        ----------
+        path: str
+            Path-like string of a file written by _PathManager.save.
+
+        Returns
+        -------
+        _PathManager
+            New instance of _PathManager.
+        """
+        paths, stats = _open_paths(path, _FileStat)
+        return cls._result(paths, stats)
+
+    def refresh(self):
+        """
+        Updates a result of PathFinder.find to follow the filesystem.
+
+        This method reruns the query of the find call that created the instance,
+        but rescans only the directories whose modification time changed since
+        they were scanned, as well as new subdirectories, and drops the paths of
+        the directories that no longer exist. Paths of unchanged directories are
+        kept with their cached metadata: content changes of existing files don't
+        change directory modification times, so metadata terms are not
+        reevaluated for them. Results found without the track flag are rescanned
+        fully on the first refresh. Archive members are kept for as long as the
+        directory of their archive is unchanged. Timeouts of the find call apply
+        to the refresh as well: the paths of a registered directory that timed out
+        are kept as they were, and the directory is listed in the timed_out
+        attribute of the returned _PathManager.
+
+        Returns
+        -------
+        Tuple[_PathManager, _PathManager | None, _PathManager | None]
+            New instance of _PathManager with the updated paths, empty when all
+            of the matched files were removed, followed by new instances with
+            the added and the removed paths (None when there are no such paths).
+            An empty result can be refreshed as well.
+        """
+        if self._source is None:
+            raise ValueError('Only results of PathFinder.find can be refreshed')
+        (directories, query, collect, follow_symlinks, dedupe, archives,
+         timeout, dir_timeout) = self._source
+        plan = _Plan(query, archives)
+
+        unchanged, mtimes, found, timed_out = _rescan(directories, plan, self._mtimes, collect,
+                                                      follow_symlinks,
+                                                      set() if follow_symlinks or dedupe
+                                                      else None, timeout, dir_timeout)
+        if archives:
+            roots = {root: _split_member(root) for root, _ in self._paths}
+            unchanged = unchanged | {root for root, member in roots.items()
+                                     if member and os.path.dirname(member[0]) in unchanged}
+        stalled = set(timed_out)
+        retained = [p for p in self._paths if p[0] in unchanged
+                    or (stalled and _owner(p[0], directories) in stalled)]
+
+        stats = {p: self._stats[p] for p in retained if p in self._stats}
+        if dedupe is not None:
+            found = _dedupe_inodes(found, {(s.dev, s.ino) for s in stats.values()})
+        if collect:
+            stats.update(found)
+        result = self._result(retained + list(found), stats)
+        result._source, result._mtimes = self._source, mtimes
+        result.timed_out = tuple(timed_out)
+
+        members, updated = self._members(), result._members()
+        added = [p for p in found if p not in members]
+        removed = [p for p in self._paths if p not in updated]
+        return (result,
+                result._spawn(added) if added else None,
+                self._spawn(removed) if removed else None)
+
+    def load(self, loader, **kwargs):
+        """"
+        Loads data from the file specified by a single path-like string.
+
+        This method uses dependency injection to leverage an object following
+        abc_Loader.ABLoader interface, to load data from all of the paths
+        that the _PathManager was instantiated with. When the loader has
+        a telemetry callback, e.g. BaseLoader.telemetry set to
+        telemetry.LoadTelemetry, it receives a record of each loaded file.
+
+        Parameters
+        ----------
+        loader: type[abc_Loader.ABLoader]
+            Object that has a load method defined.
+        kwargs: dict
+            Key-value parameters that are supported by the loader object.
+
+        Returns
+        -------
+        list
+            List of the loaded data objects, e.g., pandas DataFrames.
+        """
+        if not isinstance(loader, ABLoader):
+            raise TypeError("Incorrect Loader type. It must be ABLoader type")
+        return [_load_path(loader, os.path.join(*p), kwargs) for p in self._paths]
+
+    def load_lazy(self, loader, **kwargs):
+        """
+        Returns handles deferring the loading of every file until first access.
+
+        A file is read only when its handle is first loaded, so files that are
+        never accessed are never read. Handles cache the loaded data until
+        they are released.
+
+        Parameters
+        ----------
+        loader: type[abc_Loader.ABLoader]
+            Object that has a load method defined.
+        kwargs: dict
+            Key-value parameters that are supported by the loader object.
+
+        Returns
+        -------
+        List[_LoadHandle]
+            List of handles, in the same order as paths.
+        """
+        if not isinstance(loader, ABLoader):
+            raise TypeError("Incorrect Loader type. It must be ABLoader type")
+        return [_LoadHandle(os.path.join(*p), loader, kwargs) for p in self._paths]
+
+    def load_compact(self, loader, budget = None, sample = 1000, category_ratio = 0.5,
+                     float32 = False, spill = None, **kwargs):
+        """
+        Loads data with compact pandas dtypes, within a memory budget.
+
+        Files whose loading function accepts nrows and dtype arguments
+        (e.g. CSV and Excel files of PDLoader) are sampled first: compact
+        dtypes are inferred from the first rows and applied at parse time,
+        and the memory of the whole data is projected from the sample and the
+        file size, so the call fails before anything is loaded when the projection
+        exceeds the budget. Other files are compacted after loading. Integer
+        columns are always downcast after parsing. Results are not cached by
+        the loader.
+
+        Parameters
+        ----------
+        loader: abc_loader.BaseLoader
+            BaseLoader returning pandas DataFrames, e.g. PDLoader.
+        budget: int, default=None
+            Maximum number of bytes of the loaded data, no limit when None.
+        sample: int, default=1000
+            Number of rows the dtypes and the memory are inferred from.
+        category_ratio: float, default=0.5
+            Maximum ratio of unique to non-null values of a string column
+            stored as a categorical. Other string columns are stored as Arrow
+            strings when pyarrow is installed.
+        float32: bool, default=False
+            Flag indicating whether float columns should be stored as float32,
+            which keeps only about 7 significant digits.
+        spill: str, default=None
+            Path-like string pointing to a directory. When set, data exceeding
+            the budget is written to Feather files in the directory and returned
+            as memory-mapped pyarrow Tables (requires pyarrow), instead of
+            raising MemoryError. A file is removed when its Table is garbage
+            collected.
+        kwargs: dict
+            Key-value parameters that are supported by the loader object.
+
+        Returns
+        -------
+        Tuple[list, _MemoryReport]
+            List of the loaded data objects, and a named tuple with the memory
+            the data would take with the default dtypes (projected for sampled
+            files), the memory of the compacted data, the difference between
+            the two, and the memory of the data spilled to disk, in bytes.
+        """
+        from .loaders import _compact, _compact_dtypes, _memory, _spill
+
+        if not isinstance(loader, BaseLoader):
+            raise TypeError("Incorrect Loader type. It must be BaseLoader type")
+        if budget is not None and not (isinstance(budget, int) and budget > 0):
+            raise ValueError('"budget" argument must be a positive integer')
+
+        plans, projected, uncompacted = [], 0, 0
+        for p in self._paths:
+            path = os.path.join(*p)
+            func, compression = loader._dispatch(path)
+            params = loader._inspect(func)
+            if 'nrows' not in params or 'dtype' not in params:
+                plans.append((path, func, compression, None))
+                continue
+            head = loader._call(func, compression, path, dict(kwargs, nrows=sample))
+            dtypes = _compact_dtypes(head, category_ratio, float32)
+            rows = len(head)
+            if rows >= sample:
+                line = len(head.to_csv(index=False, header=False).encode()) / rows
+                rows = max(rows, self._stat(p).size / line)
+            scale = rows / max(len(head), 1)
+            uncompacted += _memory(head) * scale
+            projected += _memory(_compact(head, dtypes)) * scale
+            plans.append((path, func, compression, dtypes))
+
+        if budget is not None and spill is None and projected > budget:
+            raise MemoryError(f'Projected memory of {int(projected)} bytes exceeds '
+                              f'the budget of {budget} bytes')
+
+        objects, compacted, spilled = [], 0, 0
+        for path, func, compression, dtypes in plans:
+            args = dict(kwargs)
+            if dtypes is not None:
+                args['dtype'] = dict(dtypes, **(kwargs.get('dtype') or {}))
+            obj = loader._call(func, compression, path, args)
+            if dtypes is None:
+                uncompacted += _memory(obj)
+                obj = _compact(obj, _compact_dtypes(obj, category_ratio, float32)
+                               if hasattr(obj, 'items') else None)
+            else:
+                obj = _compact(obj)
+            size = _memory(obj)
+            if budget is not None and compacted - spilled + size > budget:
+                if spill is None:
+                    raise MemoryError(f'Loaded data exceeds the budget of {budget} bytes')
+                obj, spilled = _spill(obj, spill), spilled + size
+            compacted += size
+            objects.append(obj)
+
+        uncompacted = int(uncompacted)
+        return objects, _MemoryReport(uncompacted, compacted, uncompacted - compacted, spilled)
+
+    async def _aiter_load(self, paths, loader, executor, limit, kwargs):
+        """
+        Private async generator loading the paths in an executor.
+
+        At most limit files are loaded at the same time, and a new file is
+        submitted only after a loaded object was consumed, so a slow consumer
+        suspends loading. Files that were not loaded yet are cancelled
+        when the generator is closed.
+
+        Parameters
+        ----------
+        paths: List[Tuple[str, str]]
+            List of the (file path, file name) tuples, which the returned indexes
+            point to. The paths of find results are held in a set, so callers
+            take a list of them once and index that same list.
+        loader: abc_loader.ABLoader
+            Object that has a load method defined.
+        executor: concurrent.futures.Executor | None
+            Executor running the loads, None for the default executor of the loop.
+        limit: int
+            Maximum number of files loaded at the same time.
+        kwargs: dict
+            Key-value parameters that are supported by the loader object.
+
+        Returns
+        -------
+        AsyncGenerator[Tuple[int, Any]]
+            Async generator containing the index of a path and its loaded data
+            object, in order of completion.
+        """
+        if not isinstance(loader, ABLoader):
+            raise TypeError("Incorrect Loader type. It must be ABLoader type")
+        if not (isinstance(limit, int) and limit > 0):
+            raise ValueError('"limit" argument must be a positive integer')
+
+        loop = _running_loop()
+        paths, pending = enumerate(paths), {}
+
+        def submit(item):
+            i, p = item
+            pending[loop.run_in_executor(executor, partial(loader.load, os.path.join(*p),
+                                                           **kwargs))] = i
+
+        for item in islice(paths, limit):
+            submit(item)
+        try:
+            while pending:
+                done, _ = await asyncio.wait(set(pending),
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    i = pending.pop(future)
+                    yield i, future.result()
+                    item = next(paths, None)
+                    if item is not None:
+                        submit(item)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def aiter_load(self, loader, executor = None, limit = 4, **kwargs):
+        """
+        Asynchronously loads data from the files, yielding objects as they are loaded.
+
+        This method is the asyncio variant of load. Files are loaded in an executor,
+        at most limit at the same time, and new files are submitted only as the
+        loaded objects are consumed.
+
+        Parameters
+        ----------
+        loader: type[abc_Loader.ABLoader]
+            Object that has a load method defined.
+        executor: concurrent.futures.Executor, default=None
+            Executor running the loads, defaults to the default executor of the loop.
+        limit: int, default=4
+            Maximum number of files loaded at the same time.
+        kwargs: dict
+            Key-value parameters that are supported by the loader object.
+
+        Returns
+        -------
+        AsyncGenerator[Tuple[Tuple[str, str], Any]]
+            Async generator containing a (file name, file path) tuple, in the same
+            order as paths, and the loaded data object, in order of completion.
+        """
+        paths = list(self._paths)
+        loaded = self._aiter_load(paths, loader, executor, limit, kwargs)
+        try:
+            async for i, obj in loaded:
+                yield tuple(reversed(paths[i])), obj
+        finally:
+            await loaded.aclose()
+
+    async def aload(self, loader, executor = None, limit = 4, **kwargs):
+        """
+        Asynchronously loads data from all of the files.
+
+        This method is the asyncio variant of load, loading the files in
+        an executor, at most limit at the same time.
+
+        Parameters
+        ----------
+        loader: type[abc_Loader.ABLoader]
+            Object that has a load method defined.
+        executor: concurrent.futures.Executor, default=None
+            Executor running the loads, defaults to the default executor of the loop.
+        limit: int, default=4
+            Maximum number of files loaded at the same time.
+        kwargs: dict
+            Key-value parameters that are supported by the loader object.
+
+        Returns
+        -------
+        list
+            List of the loaded data objects, in the same order as paths.
+        """
+        paths = list(self._paths)
+        result, loaded = [None] * len(paths), self._aiter_load(paths, loader, executor,
+                                                               limit, kwargs)
+        try:
+            async for i, obj in loaded:
+                result[i] = obj
+        finally:
+            await loaded.aclose()
+        return result
+
+    def duplicates(self, workers = None, sample = 4096):
+        """
+        Finds groups of files with identical content.
+
+        This method buckets the paths by cached file size first, then hashes
+        the first and last sample bytes of the files whose sizes collide,
+        and hashes the whole content only of the files which still collide.
+        Files are read through memory maps, hashed in a thread pool.
+        Files that can't be read are skipped.
+
+        Parameters
+        ----------
+        workers: int, default=None
+            Maximum number of hashing threads, defaults to
+            the ThreadPoolExecutor default.
+        sample: int, default=4096
+            Number of bytes hashed from both the beginning and the end
+            of a file in the sampling pass.
+
+        Returns
+        -------
+        List[_PathManager]
+            List of new instances of _PathManager, each with at least two
+            paths pointing to files with identical content.
+        """
+        buckets = {}
+        for p in self._paths:
+            try:
+                size = self._stat(p).size
+            except OSError:
+                continue
+            buckets.setdefault(size, []).append(p)
+
+        groups = [paths for size, paths in buckets.items() if size == 0 and len(paths) > 1]
+        candidates = [(p, size) for size, paths in buckets.items()
+                      if size > 0 and len(paths) > 1 for p in paths]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for full in (False, True):
+                digests = executor.map(
+                    lambda c: _digest(os.path.join(*c[0]), c[1], None if full else sample),
+                    candidates
+                    )
+                buckets = {}
+                for (p, size), digest in zip(candidates, digests):
+                    if digest is not None:
+                        buckets.setdefault((size, digest), []).append(p)
+
+                candidates = []
+                for (size, _), paths in buckets.items():
+                    if len(paths) < 2:
+                        continue
+                    if full or size <= 2 * sample:
+                        groups.append(paths)
+                    else:
+                        candidates.extend((p, size) for p in paths)
+
+        return [self._spawn(paths) for paths in groups]
+
+    def select_paths(self, pattern = None, match_type = 'eq', size = None,
+                     mtime = None, ctime = None, age = None):
+        """"
+        Filters path-like strings based on a specified pattern and creates a new object.
+
+        This method allows filtering file paths based on a given pattern
+        that is supported by the types defined in the matching module,
+        and on (min, max) ranges of file metadata. Metadata collected during
+        the scan is reused, so no new system calls are made for it.
+
+        Parameters
+        ----------
+        pattern: str | query.Query, default=None
+            String that can be matched with a file path, or a query built
+            with Q, combining file path, name, type and metadata terms.
+            None skips path matching.
+        match_type: str, default='eq'
+            String representing a matching function from the matching module.
+        size: Tuple[int, int], default=None
+            Inclusive range of file sizes in bytes. Either bound can be None.
+        mtime: Tuple[float | datetime, float | datetime], default=None
+            Inclusive range of file modification times.
+        ctime: Tuple[float | datetime, float | datetime], default=None
+            Inclusive range of file change times (creation times on Windows).
+        age: Tuple[float | timedelta, float | timedelta], default=None
+            Inclusive range of seconds elapsed since the file modification.
+
+        Returns
+        -------
+        _PathManager
+            New instance of _PathManager with filtered paths.
+            """
+        if isinstance(pattern, Query):
+            query = pattern
+        else:
+            query = None if pattern is None else Q.path(pattern, match_type)
+        query = _range_query(query, size, mtime, ctime, age)
+        if query is None:
+            return self._spawn(list(self._paths))
+        return self._spawn(self._select(query)._paths)
+
+    def _select(self, query):
+        """
+        Private function filtering the paths with a query.
+
+        Unlike select_paths, which rejects a selection without paths, it returns
+        an empty instance when no path matches, e.g. for the daemon answering
+        arbitrary queries from a single listing.
+
+        Parameters
+        ----------
+        query: query.Query
+            Query combining file path, name, type and metadata terms.
+
+        Returns
+        -------
+        _PathManager
+            New instance of _PathManager with the matching paths, sharing
+            the metadata cache of this instance.
+        """
+        paths = list(self._paths)
+        plan = _Plan(query)
+        batch = _Batch([p[0] for p in paths], [p[1] for p in paths],
+                       lambda i: self._stat(paths[i]), plan.now)
+        return self._result([paths[i] for i in plan.select(plan.query, batch)], self._stats)
+
+    @property
+    def paths(self):
+        """
+        Returns a list with file paths and file names in reversed order.
+        """
+        return list(tuple(reversed(p)) for p in self._paths)
+
+    def _group(self, by, pattern, match_type):
+        """
+        Private function grouping paths in a single pass.
+
+        Path parts returned by a key function are matched with the batch form
+        of the matcher (match_many) when a pattern is passed.
+
+        Parameters
+        ----------
+        by: str
+            String representing a key function (path, name, ext).
+        pattern: str
+            String that can be matched with a file path part.
+        match_type: str
+            String representing a matcher registered in the matching module.
+
+        Returns
+        -------
+        Dict[Any: List[Tuple[str, str]]]
+            Dictionary with group keys and lists of paths, in order of appearance.
+        """
+        paths = list(self._paths)
+        keys = [getattr(self, by)(None, match_type, p) for p in paths]
+        if pattern is not None:
+            keys = matching.get_matcher(match_type).match_many(keys, pattern)
+        groups = {}
+        for k, p in zip(keys, paths):
+            groups.setdefault(k, []).append(p)
+        return groups
 
-        if isinstance(paths, tuple):
-            self._paths = [paths]
-        else:
-            self._paths = paths
-        self.matching_eng = matching
+    def groupby(self, by, pattern = None, match_type = 'eq'):
+        """
+        Groups paths by a specified part and pattern.
 
-    def __len__(self):
-        return len(self._paths)
+        This function allows grouping paths by a specified part defined by
+        a key function (file path, file name, and file type) as well as a specified
+        pattern that is supported by the types defined in the matching module.
+        The function returns a dictionary with keys defined by the key function
+        and values which are new instances of _PathManager.
 
-    def load(self, loader, **kwargs):
-        """"
-        Loads data from the file specified by a single path-like string.
+        Parameters
+        ----------
+        by: str
+            String representing a key function (path, name, ext).
+        pattern: str, default=None
+            String that can be matched with a file path part.
+        match_type: str, default='eq'
+            String representing a matching function from the matching module.
 
-        This method uses dependency injection to leverage an object following
-        abc_Loader.ABLoader interface, to load data from all of the paths
-        that the _PathManager was instantiated with.
+        Returns
+        -------
+        dict
+            Dictionary with keys defined by a key function and values which are
+            new instances of _PathManager.
+        """
+        groups = self._group(by, pattern, match_type)
+        return {k: self._spawn(groups[k]) for k in sorted(groups)}
+
+    def schemas(self, loader, workers = None, **kwargs):
+        """
+        Groups paths by the schema of their data, without loading the files.
+
+        This method reads only the file metadata with the schema method of the loader,
+        e.g. Parquet and Feather footers, the first rows of CSV files, HDF5 keys
+        and Excel sheet headers, in a thread pool. Files whose schema can't be
+        read are grouped under None.
 
         Parameters
         ----------
         loader: type[abc_Loader.ABLoader]
-            Object that has a load method defined.
+            Object that has a schema method defined, e.g. PDLoader.
+        workers: int, default=None
+            Maximum number of threads, defaults to the ThreadPoolExecutor default.
         kwargs: dict
-            Key-value parameters that are supported by the loader object.
+            Key-value parameters that are supported by the schema method of
+            the loader object.
 
         Returns
         -------
-        list
-            List of the loaded data objects, e.g., pandas DataFrames.
+        dict
+            Dictionary with schemas and new instances of _PathManager,
+            in order of first appearance.
         """
         if not isinstance(loader, ABLoader):
             raise TypeError("Incorrect Loader type. It must be ABLoader type")
-        return [loader.load(os.path.join(*p), **kwargs) for p in self._paths]
 
-    def select_paths(self, pattern, match_type = 'eq'):
-        """"
-        Filters path-like strings based on a specified pattern and creates a new object.
+        def sniff(path):
+            try:
+                return loader.schema(os.path.join(*path), **kwargs)
+            except NotImplementedError:
+                raise
+            except Exception:
+                return None
 
-        This method allows filtering file paths based on a given pattern
-        that is supported by the types defined in the matching module.
+        paths = list(self._paths)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            groups = {}
+            for p, schema in zip(paths, executor.map(sniff, paths)):
+                groups.setdefault(schema, []).append(p)
+        return {k: self._spawn(v) for k, v in groups.items()}
+
+    def _top_key(self, by):
+        """
+        Private function returning a key function for top selection.
 
         Parameters
         ----------
-        pattern: str
-            String that can be matched with a file path.
-        match_type: str, default='eq'
-            String representing a matching function from the matching module.
+        by: str
+            String representing the sorting key (mtime, ctime, size, name).
 
         Returns
         -------
-        _PathManager
-            New instance of _PathManager with filtered paths.
-            """
-        return self.__class__(
-            list(
-                filter(
-                    lambda p: getattr(self.matching_eng, match_type)(p[0], pattern),
-                    self._paths
-                    )
-                )
-            )
+        Callable
+            Key function returning cached metadata or the file name of a path.
+        """
+        if by == 'name':
+            return lambda p: p[1]
+        if by in ('mtime', 'ctime', 'size'):
+            return lambda p: getattr(self._stat(p), by)
+        raise ValueError('"by" argument must be one of mtime, ctime, size, name')
 
-    @property
-    def paths(self):
+    def _select_top(self, paths, k, key, reverse):
         """
-        Returns a list with file paths and file names in reversed order.
+        Private function selecting k paths with heapq partial selection.
         """
-        return list(tuple(reversed(p)) for p in self._paths)
+        return (heapq.nlargest if reverse else heapq.nsmallest)(k, paths, key=key)
 
-    def groupby(self, by, pattern = None, match_type = 'eq'):
+    def top(self, k, by = 'mtime', reverse = True):
         """
-        Groups paths by a specified part and pattern.
+        Selects top k paths by metadata or file name and creates a new object.
 
-        This function allows grouping paths by a specified part defined by
-        a key function (file path, file name, and file type) as well as a specified
-        pattern that is supported by the types defined in the matching module.
-        The function returns a dictionary with keys defined by the key function
-        and values which are new instances of _PathManager.
+        This method uses heapq partial selection in O(n log k) time, using
+        metadata collected during the scan (or retrieved once and cached),
+        e.g., to get the 5 newest or largest files.
 
         Parameters
         ----------
-        by: str
+        k: int
+            Number of paths to be selected.
+        by: str, default='mtime'
+            String representing the sorting key (mtime, ctime, size, name).
+        reverse: bool, default=True
+            Flag indicating whether the largest (newest) paths should be selected
+            instead of the smallest (oldest) ones.
+
+        Returns
+        -------
+        _PathManager
+            New instance of _PathManager with the selected paths, ordered
+            from the first to the k-th selected path, empty only when this
+            instance is empty.
+        """
+        if not (isinstance(k, int) and k > 0):
+            raise ValueError('"k" argument must be a positive integer')
+        return self._result(self._select_top(self._paths, k, self._top_key(by), reverse),
+                            self._stats)
+
+    def top_by(self, group, k, by = 'mtime', reverse = True, pattern = None, match_type = 'eq'):
+        """
+        Groups paths and selects top k paths of every group.
+
+        This method is a group-wise variant of top. Paths are grouped in
+        a single pass by a key function (file path, file name, and file type)
+        supported by groupby, and top k paths of every group are selected
+        with heapq partial selection, without sorting the groups.
+
+        Parameters
+        ----------
+        group: str
             String representing a key function (path, name, ext).
+        k: int
+            Number of paths to be selected from every group.
+        by: str, default='mtime'
+            String representing the sorting key (mtime, ctime, size, name).
+        reverse: bool, default=True
+            Flag indicating whether the largest (newest) paths should be selected
+            instead of the smallest (oldest) ones.
         pattern: str, default=None
             String that can be matched with a file path part.
         match_type: str, default='eq'
@@ -137,15 +2028,13 @@ class _PathManager:
         -------
         dict
             Dictionary with keys defined by a key function and values which are
-            new instances of _PathManager.
+            new instances of _PathManager with the selected paths.
         """
-        return {
-            k:self.__class__(list(g)) for k, g in groupby(
-                sorted(
-                    self._paths, key= partial(getattr(self, by), pattern, match_type)
-                    ),   partial(getattr(self, by), pattern, match_type)
-                )
-            }
+        if not (isinstance(k, int) and k > 0):
+            raise ValueError('"k" argument must be a positive integer')
+        key = self._top_key(by)
+        return {g: self._spawn(self._select_top(paths, k, key, reverse))
+                for g, paths in self._group(group, pattern, match_type).items()}
 
     #Sorting functions
     def path(self, pattern, match_type, iterable):
@@ -168,7 +2057,7 @@ class _PathManager:
         """
         if pattern is None:
             return iterable[0]
-        return getattr(self.matching_eng, match_type)(iterable[0], pattern)
+        return matching.get_matcher(match_type)(iterable[0], pattern)
 
     def name(self, pattern, match_type, iterable):
         """
@@ -189,8 +2078,8 @@ class _PathManager:
             A file name (without file type).
         """
         if pattern is None:
-            return Path(iterable[1]).stem
-        return getattr(self.matching_eng, match_type)(Path(iterable[1]).stem, pattern)
+            return _split_name(iterable[1])[0]
+        return matching.get_matcher(match_type)(_split_name(iterable[1])[0], pattern)
 
 
     def ext(self, pattern, match_type, iterable):
@@ -209,11 +2098,11 @@ class _PathManager:
         Returns
         -------
         str
-            A file type.
+            A file type, e.g. '.csv', or '.csv.gz' for compressed files.
         """
         if pattern is None:
-            return Path(iterable[1]).suffix
-        return getattr(self.matching_eng, match_type)(Path(iterable[1]).suffix, pattern)
+            return _split_name(iterable[1])[1]
+        return matching.get_matcher(match_type)(_split_name(iterable[1])[1], pattern)
 
 class PathFinder:
     """
@@ -225,8 +2114,9 @@ class PathFinder:
     with directories to be scanned.
 
     Attributes:
-        directories (Dict): Empty dictionary to which directory path and flag
-            for flat or deep scan key, value pairs will be added.
+        directories (_DirectoryTrie): Empty dictionary-like registry to which
+            directory path and flag for flat or deep scan key, value pairs will
+            be added. Parent - child conflicts are resolved in O(depth).
         matching_eng (Type(matching)): Class with the matching functions.
         pm (Type(_PathManager)): Private class for file path operations.
 
@@ -244,13 +2134,26 @@ class PathFinder:
             a collection of directory path and traverse_subdirs flag pairs.
         del_dirs (directories: str | List[str]): Method for deleting a collection 
             of directory path and traverse_subdirs flag pairs.
-        find (name: str, ext: str, name_type: str[default='eq'], ext_type: str[default='eq']):
+        find (name: str | Query, ext: str, name_type: str[default='eq'], ext_type: str[default='eq']):
             Method for iterating through all of the directories collection and matching 
             files based on defined file name and file type patterns, supported 
-            by the matching_eng.
+            by the matching_eng, or on a query built with Q.
+        snapshot (query: Query, path: str, inode: bool, chunk_size: int): Method
+            recording the path, size, modification time and inode of matching files
+            in a snapshot sorted by path, spilling to disk in bounded memory.
+        diff (old: _Snapshot | str, new: _Snapshot | str): Static method returning
+            new instances of _PathManager with the added, removed and modified paths.
+        afind (name: str | Query, ext: str, ..., executor, limit: int, buffer: int):
+            Coroutine variant of find, listing directories in an executor.
+        aiter_find (name: str | Query, ext: str, ..., executor, limit: int, buffer: int):
+            Async generator yielding matching paths as they are found, with
+            backpressure and prompt cancellation.
+        stream (name: str | Query, ext: str, ..., loader: ABLoader, interval: float,
+            settle: int, checkpoint: str): Generator polling the directories and
+            loading new files once they are complete, resuming from a checkpoint file.
     """
     def __init__(self, init_dirs = None):
-        self.directories = {}
+        self.directories = _DirectoryTrie()
         self.matching_eng = matching
         self.path_manager = _PathManager
 
@@ -277,27 +2180,18 @@ class PathFinder:
         -------
         None        
         """
-        if os.path.isdir(directory):
-            if any(self._overlap(directory, traverse_subdirs)):
-                raise ValueError(f"{directory} can't be added due to conflicting "\
-                                "parent - child relationship with already added "\
-                                f"directories: {', '.join(self._overlap(directory, traverse_subdirs))}")
-            self.directories[directory] = traverse_subdirs
-        else:
-            raise ValueError("Specified directory does not exist")
-
         if not (isinstance(traverse_subdirs, (bool, int)) and int(traverse_subdirs) <= 1):
             raise TypeError("'traverse_subdirs' argument must be bool or int: (0,1)")
 
-    @lru_cache(maxsize=128)
-    def _overlap(self, directory, traverse_subdirs):
-        return [d for d, t_s in self.directories.items() if (
-            (
-                (d in directory and t_s ) or (directory in d and traverse_subdirs)
-                )
-            and len(d) != len(directory)
-            )]
+        if not os.path.isdir(directory):
+            raise ValueError("Specified directory does not exist")
 
+        conflicts = self.directories.conflicts(directory, traverse_subdirs)
+        if conflicts:
+            raise ValueError(f"{directory} can't be added due to conflicting "\
+                            "parent - child relationship with already added "\
+                            f"directories: {', '.join(conflicts)}")
+        self.directories[directory] = traverse_subdirs
 
     def del_dir(self, directory):
         """
@@ -359,47 +2253,20 @@ class PathFinder:
         for directory in directories:
             self.del_dir(directory)
 
-    @lru_cache(maxsize=128)
-    def _resolve_ext(self, string):
-        """
-        Private function for standardizing file type strings.
-
-        Parameters
-        ----------
-        string: str
-            File extension string to be standardized.
-
-        Returns
-        -------
-        str
-            Standardized file extension without the dot prefix.
-        """
-        if '.' in string:
-            return string.replace('.', '')
-        return string
-
-
-    def _traverse_subdir(self, directory, name, ext, name_type, ext_type):
+    def _traverse_subdir(self, directory, plan):
         """
         Private function for nested directory iteration and file matching.
         
         This function iterates through a single directory, including all subdirectories,
-        trying to match all files based on the specified name and file type patterns. 
+        trying to match all files with the compiled query. Subdirectories are pruned
+        when none of the files below them can match.
         
         Parameters
         ----------
         directory: str
             Path-like string pointing to an existing directory.
-        name: str
-            File name pattern to be matched.
-        ext: str
-            File type (file extension) pattern to be matched.
-        name_type: str
-            String representing a function in matching_eng for matching 
-            the file name pattern.
-        ext_type: str
-            String representing a function in matching_eng for matching 
-            the file type (extension) pattern.
+        plan: query._Plan
+            Compiled query.
         
         Returns
         -------
@@ -407,35 +2274,25 @@ class PathFinder:
             Generator containing a 2-element tuple with the root directory 
             and the matching file.
         """
-        return ((root, file) for root, _, files in os.walk(directory)
-                for file in files
-                if os.path.isfile(os.path.join(root, file))
-                and getattr(self.matching_eng, ext_type)(self._resolve_ext(Path(file).suffix), ext)
-                and getattr(self.matching_eng, name_type)(Path(file).stem, name))
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = [d for d in dirs if not plan.prunes(os.path.join(root, d))]
+            for i in _select_files(plan, root, files):
+                if os.path.isfile(os.path.join(root, files[i])):
+                    yield root, files[i]
 
-
-
-    def _traverse_dir(self, directory, name, ext, name_type, ext_type):
+    def _traverse_dir(self, directory, plan):
         """
         Private function for flat directory iteration and file matching.
         
         This function iterates through a single directory, trying to match 
-        all files based on the specified name and file type patterns. 
+        all files with the compiled query.
         
         Parameters
         ----------
         directory: str
             Path-like string pointing to an existing directory.
-        name: str
-            File name pattern to be matched.
-        ext: str
-            File type (file extension) pattern to be matched.
-        name_type: str
-            String representing a function in matching_eng for matching 
-            the file name pattern.
-        ext_type: str
-            String representing a function in matching_eng for matching 
-            the file type (extension) pattern.
+        plan: query._Plan
+            Compiled query.
         
         Returns
         -------
@@ -443,89 +2300,674 @@ class PathFinder:
             Generator containing a 2-element tuple with the directory 
             and the matching file.
         """
-        return ((directory, file)  for file in os.scandir(directory)
-                if os.path.isfile(os.path.join(directory, file))
-                and getattr(self.matching_eng, ext_type)(self._resolve_ext(Path(file).suffix), ext)
-                and getattr(self.matching_eng, name_type)(Path(file).stem, name))
+        entries = list(os.scandir(directory))
+        files = [os.path.basename(entry) for entry in entries]
+        return ((directory, files[i]) for i in _select_files(plan, directory, files)
+                if os.path.isfile(entries[i]))
 
-    @lru_cache(maxsize=128)
-    def _get_obj_func(self, obj):
+    def _traverse_parallel(self, executor, directory, plan, collect = False, mtimes = None,
+                           follow_symlinks = False, visited = None):
         """
-        Private function to dynamically return a joined string of a list 
-        containing all available functions in a specified object.
-        
+        Private function for nested directory iteration split across a process pool.
+
+        This function matches the files in the top level of a single directory
+        in the current process and eagerly submits every top-level subdirectory
+        as a separate subtree to be iterated and matched in the worker processes.
+        Symlinked subdirectories are skipped, the same as in os.walk, unless
+        follow_symlinks is set, and so are the subdirectories pruned by the plan.
+
         Parameters
         ----------
-        obj: Any
-            The object whose functions will be retrieved.
-        
+        executor: concurrent.futures.ProcessPoolExecutor
+            Process pool to which the subtrees are submitted.
+        directory: str
+            Path-like string pointing to an existing directory.
+        plan: query._Plan
+            Compiled query.
+        collect: bool, default=False
+            Flag indicating whether metadata of the matching files should be
+            collected as well.
+        mtimes: Dict[str: int], default=None
+            Dictionary to which the modification times of the iterated
+            directories are written.
+        follow_symlinks: bool, default=False
+            Flag indicating whether symlinked subdirectories should be iterated over.
+        visited: Set[Tuple[int, int]], default=None
+            Set of (device, inode) pairs of the directories iterated over so far,
+            see _walk_entries. Every worker receives a copy of the set.
+
         Returns
         -------
-        str
-            String of all object methods joined by commas.
+        Iterator[Tuple[Tuple[root[str], file[str]], _FileStat | None]]
+            Iterator containing the matching path and its metadata (None when
+            collect is False), yielding worker batches as they are collected.
         """
-        return ', '.join(
-            i[0] for i in inspect.getmembers(obj, predicate=inspect.isfunction)
-            )
+        top_files, futures = [], []
+        if mtimes is not None or visited is not None:
+            directory_stat = os.stat(directory)
+            if mtimes is not None:
+                mtimes[directory] = directory_stat.st_mtime_ns
+            if visited is not None and not _claim(visited, (directory_stat.st_dev,
+                                                            directory_stat.st_ino)):
+                return iter(())
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir() and (follow_symlinks or not entry.is_symlink()):
+                    if not plan.prunes(entry.path):
+                        futures.append(executor.submit(_scan_subtree, entry.path, plan,
+                                                       collect, mtimes is not None,
+                                                       follow_symlinks, visited))
+                elif entry.is_file():
+                    top_files.append(entry)
+        local = list(_match_entries(plan, directory, top_files, collect))
+        return chain(local, _collect_batches(futures, mtimes))
+
+    def _query(self, name, ext, name_type, ext_type):
+        """
+        Private function building a query from find arguments.
+
+        Parameters
+        ----------
+        name: str | query.Query
+            File name pattern to be matched, or a query built with Q.
+        ext: str | None
+            File type (file extension) pattern to be matched, None with a query.
+        name_type: str | matching.Matcher
+            Matcher of the file name pattern.
+        ext_type: str | matching.Matcher
+            Matcher of the file type (extension) pattern.
+
+        Returns
+        -------
+        query.Query
+            Query matching both patterns, or the passed query.
+        """
+        if isinstance(name, Query):
+            if ext is not None:
+                raise TypeError('"ext" argument must be None when "name" is a Query')
+            return name
+
+        if not isinstance(name, str):
+            raise TypeError('"name" argument must be string type')
+
+        if not isinstance(ext, str):
+            raise TypeError('"ext" argument must be string type')
 
-    @lru_cache(maxsize=128)
-    def find(self, name, ext, name_type = 'eq', ext_type = 'eq'):
+        return Q.ext(ext, ext_type) & Q.name(name, name_type)
+
+    def find(self, name, ext = None, name_type = 'eq', ext_type = 'eq', processes = None,
+             size = None, mtime = None, ctime = None, age = None, stat = False,
+             track = False, timeout = None, dir_timeout = None, follow_symlinks = False,
+             dedupe = None, archives = False):
         """
         Function for finding files in defined directories.
         
         This function iterates through all directories in the directories attribute, 
         returning a new instance of the _PathManager class instantiated with all 
         unique matching files and paths pointing to them. Files are matched by both 
-        file name and type patterns that are supported by matching_eng.
+        file name and type patterns that are supported by matching_eng, or by
+        a query built with Q, e.g.:
+
+            finder.find(Q.ext('csv') & (Q.name('^EUR', 'regex') | Q.path('data', 'startswith')))
+
+        Queries are compiled by a query planner, which evaluates the cheapest
+        terms first on whole directory listings, evaluates file path terms once
+        per directory and skips subdirectories in which no file can match.
         
         Parameters
         ----------
-        name: str
-            File name pattern to be matched.
-        ext: str
-            File type (file extension) pattern to be matched.
-        name_type: str, default='eq'
-            String representing a function in matching_eng for matching 
+        name: str | query.Query
+            File name pattern to be matched, or a query built with Q.
+        ext: str, default=None
+            File type (file extension) pattern to be matched. Required with
+            a name pattern, must be None with a query.
+        name_type: str | matching.Matcher, default='eq'
+            Name of a matcher registered in the matching module (see 
+            matching.available) or a Matcher object, for matching 
             the file name pattern.
-        ext_type: str, default='eq'
-            String representing a function in matching_eng for matching 
+        ext_type: str | matching.Matcher, default='eq'
+            Name of a matcher registered in the matching module (see 
+            matching.available) or a Matcher object, for matching 
             the file type (extension) pattern.
+        processes: int, default=None
+            Number of worker processes for deep scans. When set, top-level 
+            subtrees of each directory with traverse_subdirs flag are iterated 
+            and matched in a process pool. Flat scans are always sequential. 
+            Matchers registered at runtime are available in the workers only 
+            when processes are forked, otherwise pass a picklable Matcher object.
+        size: Tuple[int, int], default=None
+            Inclusive range of file sizes in bytes. Either bound can be None.
+        mtime: Tuple[float | datetime, float | datetime], default=None
+            Inclusive range of file modification times.
+        ctime: Tuple[float | datetime, float | datetime], default=None
+            Inclusive range of file change times (creation times on Windows).
+        age: Tuple[float | timedelta, float | timedelta], default=None
+            Inclusive range of seconds elapsed since the file modification.
+        stat: bool, default=False
+            Flag indicating whether file metadata should be collected and kept 
+            in the returned _PathManager even when no metadata range is passed. 
+            Metadata is always collected when any range or metadata term is passed,
+            using the stat information of os.scandir entries.
+        track: bool, default=False
+            Flag indicating whether modification times of all iterated directories
+            should be recorded in the returned _PathManager, so that its refresh
+            method rescans only the directories that changed. Results found
+            without tracking are rescanned fully on the first refresh. Tracked
+            results can be empty, so they can be refreshed until files appear.
+        timeout: float, default=None
+            Maximum number of seconds for the whole call. When set, or when
+            dir_timeout is set, every directory is iterated in its own daemon
+            thread, so a slow or hung mount doesn't block the other directories.
+            Paths found in the directories that didn't finish in time are kept,
+            and the directories are listed in the timed_out attribute of
+            the returned _PathManager. Can't be combined with processes.
+        dir_timeout: float, default=None
+            Maximum number of seconds for every single directory.
+        follow_symlinks: bool, default=False
+            Flag indicating whether symlinked subdirectories should be iterated over.
+            (device, inode) pairs of the iterated directories are tracked, so
+            symlink cycles are broken and every physical directory is iterated
+            over only once.
+        dedupe: str, default=None
+            'inode' returns every physical file only once, keeping the first path
+            found for files reachable through hard links, symlinks or bind mounts,
+            and skips directories that were already iterated over through another
+            path. Metadata is collected to compare the inodes. None keeps all paths.
+        archives: bool, default=False
+            Flag indicating whether members of zip and tar archives (.zip, .tar,
+            .tar.gz, .tgz, .tar.bz2, .tar.xz) should be matched as well, as virtual
+            paths below the archive path, e.g. ('rates.csv', 'data/2019.zip/eur').
+            Zip archives are indexed from their central directory, tar archives
+            with a single scan of their headers, and the index is cached until
+            the archive changes. Nothing is extracted to disk; BaseLoader streams
+            the members straight into the loading functions.
         
         Returns
         -------
         Type[_PathManager]
             New instance of the _PathManager class.
         """
-        if not isinstance(name, str):
-            raise TypeError('"name" argument must be string type')
+        query = self._query(name, ext, name_type, ext_type)
 
-        if not isinstance(ext, str):
-            raise TypeError('"ext" argument must be string type')
+        for arg_name, value in (('timeout', timeout), ('dir_timeout', dir_timeout)):
+            if value is not None and not (isinstance(value, (int, float)) and value > 0):
+                raise ValueError(f'"{arg_name}" argument must be a positive number')
+        isolated = timeout is not None or dir_timeout is not None
+        if isolated and processes is not None:
+            raise ValueError('"processes" argument can\'t be combined with timeouts')
 
-        if not hasattr(matching, name_type):
-            raise ValueError(f'"name_type" argument must be one of {self._get_obj_func(matching)}')
+        if dedupe not in (None, 'inode'):
+            raise ValueError('"dedupe" argument must be None or \'inode\'')
 
-        if not hasattr(matching, ext_type):
-            raise ValueError(f'"name_type" argument must be one of {self._get_obj_func(matching)}')
+        if processes is not None and not (isinstance(processes, int) and processes > 0):
+            raise ValueError('"processes" argument must be a positive integer')
 
         if len(self.directories) == 0:
             raise ValueError('There are no dictionaries to be searched.')
 
-
-        return self.path_manager(
+        query = _range_query(query, size, mtime, ctime, age)
+        plan = _Plan(query, archives)
+        collect = bool(stat) or plan.needs_stat or dedupe is not None
+        mtimes, timed_out = {} if track else None, []
+        visited = set() if follow_symlinks or dedupe is not None else None
+        if processes is None and not collect and not track and not isolated \
+                and visited is None and not archives:
+            result = self.path_manager(
                 set(
                     filterfalse(
                         lambda path: path is False,
                         chain.from_iterable(
-                            [self._traverse_subdir(directory,
-                                                   name, self._resolve_ext(ext),
-                                                   name_type, ext_type)
+                            [self._traverse_subdir(directory, plan)
                              if traverse_subdirs
-                             else self._traverse_dir(directory,
-                                                     name, self._resolve_ext(ext),
-                                                     name_type, ext_type)
+                             else self._traverse_dir(directory, plan)
                              for directory, traverse_subdirs in self.directories.items()]
                             )
                         )
                     )
                 )
+        else:
+            if isolated:
+                found, timed_out = _scan_isolated(self.directories, plan, collect,
+                                                  timeout, dir_timeout, mtimes,
+                                                  follow_symlinks, visited)
+                if not found and timed_out:
+                    raise TimeoutError(f"Traversal of {', '.join(timed_out)} timed out "\
+                                       "before any file was found")
+            elif processes is None:
+                found = dict(
+                    chain.from_iterable(
+                        [_scan_entries(directory, traverse_subdirs, plan, collect, mtimes,
+                                       follow_symlinks, visited)
+                         for directory, traverse_subdirs in self.directories.items()]
+                        )
+                    )
+            else:
+                with ProcessPoolExecutor(max_workers=processes) as executor:
+                    found = dict(
+                        chain.from_iterable(
+                            [self._traverse_parallel(executor, directory, plan,
+                                                     collect, mtimes, follow_symlinks,
+                                                     visited)
+                             if traverse_subdirs
+                             else _scan_entries(directory, False, plan, collect, mtimes,
+                                                follow_symlinks, visited)
+                             for directory, traverse_subdirs in self.directories.items()]
+                            )
+                        )
+            if dedupe is not None:
+                found = _dedupe_inodes(found)
+            create = self.path_manager._result if track else self.path_manager
+            result = create(set(found), found if collect else None)
+        result._source = (dict(self.directories), query, collect, follow_symlinks, dedupe,
+                          archives, timeout, dir_timeout)
+        result._mtimes = mtimes
+        result.timed_out = tuple(timed_out)
+        return result
+
+    def snapshot(self, query = None, path = None, inode = False, chunk_size = 1000000):
+        """
+        Function for recording a snapshot of the files in defined directories.
+
+        This function iterates through all directories in the directories attribute
+        and records the path, size, modification time and optionally the inode
+        of every matching file in a file sorted by path. Records are sorted in
+        chunks spilled to disk and merged, so memory use is bounded by chunk_size
+        regardless of the number of files.
+
+        Parameters
+        ----------
+        query: query.Query, default=None
+            Query built with Q selecting the recorded files. All files are
+            recorded when None.
+        path: str, default=None
+            Path-like string of the snapshot file, e.g., to diff it with a later
+            snapshot after a restart. When None, a temporary file is used and
+            removed together with the returned object.
+        inode: bool, default=False
+            Flag indicating whether inodes should be recorded as well.
+        chunk_size: int, default=1000000
+            Maximum number of records kept in memory.
+
+        Returns
+        -------
+        _Snapshot
+            Snapshot that can be passed to PathFinder.diff.
+        """
+        if query is not None and not isinstance(query, Query):
+            raise TypeError('"query" argument must be a Query')
+
+        if len(self.directories) == 0:
+            raise ValueError('There are no dictionaries to be searched.')
+
+        plan = _Plan(_TRUE if query is None else query)
+        return _Snapshot.build(
+            chain.from_iterable(
+                [_scan_entries(directory, traverse_subdirs, plan, True)
+                 for directory, traverse_subdirs in self.directories.items()]
+                ),
+            path, inode, chunk_size
+            )
+
+    @staticmethod
+    def diff(old, new):
+        """
+        Function for comparing two snapshots.
+
+        This function merges two snapshots sorted by path in a single linear pass,
+        reading both of them sequentially from disk.
+
+        Parameters
+        ----------
+        old: _Snapshot | str
+            Older snapshot returned by PathFinder.snapshot, or the path-like
+            string of its file.
+        new: _Snapshot | str
+            Newer snapshot returned by PathFinder.snapshot, or the path-like
+            string of its file.
+
+        Returns
+        -------
+        Tuple[_PathManager | None, _PathManager | None, _PathManager | None]
+            New instances of _PathManager with the added, removed and modified
+            paths (None when there are no such paths).
+        """
+        old, new = (s if isinstance(s, _Snapshot) else _Snapshot(s) for s in (old, new))
+        return tuple(_PathManager(paths) if paths else None for paths in old.diff(new))
+
+    @staticmethod
+    def load_groups(groups, loader, workers = None, concat = True, **kwargs):
+        """
+        Function for loading groups of paths on a single shared thread pool.
+
+        This function schedules every file of every group at once, largest files
+        first (by cached file size), so the workers stay busy across groups of
+        uneven sizes, instead of loading the groups one after another.
+
+        Parameters
+        ----------
+        groups: Dict[Any: _PathManager]
+            Groups of paths, e.g. returned by _PathManager.groupby or
+            _PathManager.schemas.
+        loader: type[abc_Loader.ABLoader]
+            Object that has a load method defined.
+        workers: int, default=None
+            Maximum number of loading threads, defaults to the ThreadPoolExecutor default.
+        concat: bool | Callable[[List[Any]], Any], default=True
+            Flag indicating whether the objects loaded from every group should
+            be concatenated (pandas objects with pandas.concat, pyarrow tables
+            with pyarrow.concat_tables, lists chained), or a function
+            concatenating a list of loaded objects.
+        kwargs: dict
+            Key-value parameters that are supported by the loader object.
+
+        Returns
+        -------
+        dict
+            Dictionary with the group keys and the concatenated objects, or lists
+            of the loaded objects in the same order as the paths of the group.
+        """
+        if not isinstance(loader, ABLoader):
+            raise TypeError("Incorrect Loader type. It must be ABLoader type")
+
+        jobs = []
+        for key, group in groups.items():
+            for i, p in enumerate(group._paths):
+                try:
+                    size = group._stat(p).size
+                except OSError:
+                    size = 0
+                jobs.append((size, key, i, p))
+        jobs.sort(key=lambda job: job[0], reverse=True)
+
+        results = {key: [None] * len(group._paths) for key, group in groups.items()}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(loader.load, os.path.join(*p), **kwargs): (key, i)
+                       for _, key, i, p in jobs}
+            try:
+                for future in as_completed(futures):
+                    key, i = futures[future]
+                    results[key][i] = future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        if not concat:
+            return results
+        concat = _concat if concat is True else concat
+        return {key: concat(objects) for key, objects in results.items()}
+
+    def stream(self, name, ext = None, name_type = 'eq', ext_type = 'eq', loader = None,
+               interval = 60.0, settle = 1, checkpoint = None, workers = None,
+               polls = None, **kwargs):
+        """
+        Generator loading new files as they appear in defined directories.
+
+        This generator polls the directories in the directories attribute every
+        interval seconds, rescanning only the directories whose modification time
+        changed since the previous poll. A new matching file is considered
+        complete once its size and modification time stayed unchanged for
+        settle consecutive polls, and then it is loaded in a thread pool.
+        Already processed and pending files, as well as directory modification
+        times, are recorded in a checkpoint file after every poll, appending only
+        the newly processed files and the state when it changed, so a restarted
+        stream resumes without rescanning unchanged directories or reloading files.
+        A file is recorded as processed once the next item is requested, so
+        the file being handled when the consumer stops is loaded again
+        after a restart.
+
+        Parameters
+        ----------
+        name: str | query.Query
+            File name pattern to be matched, or a query built with Q.
+        ext: str, default=None
+            File type (file extension) pattern to be matched. Required with
+            a name pattern, must be None with a query.
+        name_type: str | matching.Matcher, default='eq'
+            Matcher of the file name pattern.
+        ext_type: str | matching.Matcher, default='eq'
+            Matcher of the file type (extension) pattern.
+        loader: abc_loader.ABLoader, default=None
+            Object that has a load method defined, defaults to loaders.PDLoader.
+        interval: float, default=60.0
+            Number of seconds between polls.
+        settle: int, default=1
+            Number of consecutive polls for which the size and modification
+            time of a new file must be unchanged before it is loaded.
+            0 loads files as soon as they are found.
+        checkpoint: str, default=None
+            Path-like string of the checkpoint file. No state is kept when None.
+        workers: int, default=None
+            Maximum number of loading threads, defaults to the ThreadPoolExecutor
+            default.
+        polls: int, default=None
+            Maximum number of polls, the generator never stops when None.
+        kwargs: dict
+            Key-value parameters that are supported by the loader object.
+
+        Returns
+        -------
+        Generator[Tuple[Tuple[str, str], Any]]
+            Generator containing a (file name, file path) tuple, in the same order
+            as _PathManager.paths, and the loaded data object, in order of completion.
+        """
+        query = self._query(name, ext, name_type, ext_type)
+
+        if loader is None:
+            from .loaders import PDLoader
+            loader = PDLoader
+        if not isinstance(loader, ABLoader):
+            raise TypeError("Incorrect Loader type. It must be ABLoader type")
+
+        if not (isinstance(settle, int) and settle >= 0):
+            raise ValueError('"settle" argument must be a non-negative integer')
+
+        if polls is not None and not (isinstance(polls, int) and polls > 0):
+            raise ValueError('"polls" argument must be a positive integer')
+
+        if len(self.directories) == 0:
+            raise ValueError('There are no dictionaries to be searched.')
+
+        directories = dict(self.directories)
+        processed, pending, mtimes = _read_checkpoint(checkpoint)
+        _write_checkpoint(checkpoint, processed, pending, mtimes)
+        written = _checkpoint_state(pending, mtimes)
+        futures, poll = {}, 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                while True:
+                    for path, (size, mtime, seen) in list(pending.items()):
+                        try:
+                            stat = _file_stat(os.stat(os.path.join(*path)))
+                        except OSError:
+                            del pending[path]
+                            continue
+                        if (stat.size, stat.mtime) == (size, mtime):
+                            pending[path] = (size, mtime, seen + 1)
+                        else:
+                            pending[path] = (stat.size, stat.mtime, 0)
+
+                    _, mtimes, found, _ = _rescan(directories, _Plan(query), mtimes, True)
+                    for path, stat in found.items():
+                        if path not in processed and path not in pending:
+                            pending[path] = (stat.size, stat.mtime, 0)
+
+                    futures = {executor.submit(loader.load, os.path.join(*path), **kwargs): path
+                               for path, (_, _, seen) in pending.items() if seen >= settle}
+                    records = []
+                    for future in as_completed(futures):
+                        path = futures[future]
+                        yield tuple(reversed(path)), future.result()
+                        del pending[path]
+                        processed.add(path)
+                        records.append({'processed': path})
+                    if checkpoint is not None:
+                        state = _checkpoint_state(pending, mtimes)
+                        if state != written:
+                            records.append(state)
+                            written = state
+                        _append_checkpoint(checkpoint, records)
+
+                    poll += 1
+                    if polls is not None and poll >= polls:
+                        return
+                    time.sleep(interval)
+            finally:
+                for future in futures:
+                    future.cancel()
+                _write_checkpoint(checkpoint, processed, pending, mtimes)
+
+    async def _aiter_found(self, name, ext, name_type, ext_type, size, mtime, ctime, age,
+                           stat, executor, limit, buffer):
+        """
+        Private async generator matching files in defined directories in an executor.
+
+        Parameters
+        ----------
+        name, ext, name_type, ext_type, size, mtime, ctime, age, stat:
+            Arguments of PathFinder.find.
+        executor: concurrent.futures.Executor | None
+            Executor listing the directories, None for the default executor of the loop.
+        limit: int
+            Maximum number of directories listed at the same time for each
+            registered directory.
+        buffer: int
+            Maximum number of matching paths waiting to be consumed.
+
+        Returns
+        -------
+        AsyncGenerator[Tuple[Tuple[root[str], file[str]], _FileStat | None]]
+            Async generator containing the matching path and its metadata
+            (None when metadata isn't collected).
+        """
+        query = _range_query(self._query(name, ext, name_type, ext_type),
+                             size, mtime, ctime, age)
+
+        if not (isinstance(limit, int) and limit > 0):
+            raise ValueError('"limit" argument must be a positive integer')
+
+        if not (isinstance(buffer, int) and buffer > 0):
+            raise ValueError('"buffer" argument must be a positive integer')
+
+        if len(self.directories) == 0:
+            raise ValueError('There are no dictionaries to be searched.')
+
+        plan = _Plan(query)
+        collect = bool(stat) or plan.needs_stat
+        queue, done = asyncio.Queue(maxsize=buffer), object()
+
+        async def produce():
+            try:
+                await asyncio.gather(*(_atraverse(executor, directory, traverse_subdirs,
+                                                  plan, collect, limit, queue)
+                                       for directory, traverse_subdirs
+                                       in list(self.directories.items())))
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                await queue.put(error)
+            else:
+                await queue.put(done)
+
+        task = asyncio.ensure_future(produce())
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def aiter_find(self, name, ext = None, name_type = 'eq', ext_type = 'eq',
+                         size = None, mtime = None, ctime = None, age = None,
+                         executor = None, limit = 4, buffer = 1024):
+        """
+        Async generator finding files in defined directories.
+
+        This generator is the asyncio variant of find, yielding matching paths
+        as they are found. Every directory is listed and matched as a separate
+        job in an executor, at most limit directories of each registered
+        directory at the same time. The traversal is suspended when buffer
+        paths are waiting to be consumed, and stops after the jobs in flight
+        when the generator is closed or the consuming task is cancelled.
+
+        Parameters
+        ----------
+        name: str | query.Query
+            File name pattern to be matched, or a query built with Q.
+        ext: str, default=None
+            File type (file extension) pattern to be matched. Required with
+            a name pattern, must be None with a query.
+        name_type: str | matching.Matcher, default='eq'
+            Matcher of the file name pattern.
+        ext_type: str | matching.Matcher, default='eq'
+            Matcher of the file type (extension) pattern.
+        size, mtime, ctime, age: Tuple, default=None
+            Inclusive ranges of file metadata, the same as in find.
+        executor: concurrent.futures.Executor, default=None
+            Executor listing the directories, defaults to the default executor
+            of the loop.
+        limit: int, default=4
+            Maximum number of directories listed at the same time for each
+            registered directory.
+        buffer: int, default=1024
+            Maximum number of matching paths waiting to be consumed.
+
+        Returns
+        -------
+        AsyncGenerator[Tuple[str, str]]
+            Async generator containing (file name, file path) tuples, in the same
+            order as _PathManager.paths. Paths aren't deduplicated.
+        """
+        found = self._aiter_found(name, ext, name_type, ext_type, size, mtime, ctime, age,
+                                  False, executor, limit, buffer)
+        try:
+            async for path, _ in found:
+                yield tuple(reversed(path))
+        finally:
+            await found.aclose()
+
+    async def afind(self, name, ext = None, name_type = 'eq', ext_type = 'eq',
+                    size = None, mtime = None, ctime = None, age = None, stat = False,
+                    executor = None, limit = 4, buffer = 1024):
+        """
+        Coroutine finding files in defined directories.
+
+        This coroutine is the asyncio variant of find, traversing the directories
+        the same way as aiter_find and returning a new instance of the _PathManager
+        class instantiated with all unique matching files.
+
+        Parameters
+        ----------
+        name, ext, name_type, ext_type, size, mtime, ctime, age, stat:
+            Arguments of find.
+        executor: concurrent.futures.Executor, default=None
+            Executor listing the directories, defaults to the default executor
+            of the loop.
+        limit: int, default=4
+            Maximum number of directories listed at the same time for each
+            registered directory.
+        buffer: int, default=1024
+            Maximum number of matching paths waiting to be collected.
+
+        Returns
+        -------
+        Type[_PathManager]
+            New instance of the _PathManager class.
+        """
+        found, items = {}, self._aiter_found(name, ext, name_type, ext_type, size, mtime,
+                                             ctime, age, stat, executor, limit, buffer)
+        try:
+            async for path, file_stat in items:
+                found[path] = file_stat
+        finally:
+            await items.aclose()
+        if any(v is not None for v in found.values()):
+            return self.path_manager(list(found), found)
+        return self.path_manager(list(found))
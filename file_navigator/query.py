@@ -0,0 +1,448 @@
+"""
+Boolean file queries and the query planner
+"""
+import time
+from . import matching
+from .matching import _resolve_ext, _resolve_range, _in_range, _split_name
+
+_STAT_FIELDS = ('size', 'mtime', 'ctime', 'age')
+_STAT_COST = 50
+
+class Query:
+    """
+    Query Base Class
+
+    Boolean expression over file name, file type, file path and file metadata
+    terms, combined with & (AND), | (OR) and ~ (NOT) operators. Terms are
+    created with the Q constructors, e.g.:
+
+        Q.ext('csv') & (Q.name('^EUR', 'regex') | ~Q.size(max=1024))
+
+    Queries are compiled into a single predicate by the query planner, which
+    evaluates cheap checks first and evaluates file path terms once per directory.
+    """
+    def __and__(self, other):
+        return _And(self, other)
+
+    def __or__(self, other):
+        return _Or(self, other)
+
+    def __invert__(self):
+        return _Not(self)
+
+class _Const(Query):
+    """
+    Private class representing a constant query result.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return f'Q.const({self.value})'
+
+_TRUE = _Const(True)
+_FALSE = _Const(False)
+
+class _Term(Query):
+    """
+    Private class representing a single query term.
+
+    Parameters:
+        field (str): Matched file part (name, ext, path) or metadata field
+            (size, mtime, ctime, age).
+        pattern (Any): Pattern matched with the file part, or a standardized
+            (min, max) range of the metadata field.
+        match_type (str | matching.Matcher | None): Matcher of the file part,
+            None for metadata fields.
+    """
+    __slots__ = ('field', 'pattern', 'match_type')
+
+    def __init__(self, field, pattern, match_type = None):
+        if match_type is not None:
+            matching.get_matcher(match_type)
+        self.field = field
+        self.pattern = pattern
+        self.match_type = match_type
+
+    @property
+    def cost(self):
+        if self.field in _STAT_FIELDS:
+            return _STAT_COST
+        return matching.get_matcher(self.match_type).cost
+
+    def __repr__(self):
+        if self.match_type is None:
+            return f'Q.{self.field}{self.pattern}'
+        return f'Q.{self.field}({self.pattern!r}, {self.match_type!r})'
+
+class _And(Query):
+    """
+    Private class representing a conjunction of queries.
+    """
+    __slots__ = ('children',)
+
+    def __init__(self, *children):
+        self.children = tuple(_chain_children(_And, children))
+
+    @property
+    def cost(self):
+        return sum(child.cost for child in self.children)
+
+    def __repr__(self):
+        return '(' + ' & '.join(map(repr, self.children)) + ')'
+
+class _Or(Query):
+    """
+    Private class representing a disjunction of queries.
+    """
+    __slots__ = ('children',)
+
+    def __init__(self, *children):
+        self.children = tuple(_chain_children(_Or, children))
+
+    @property
+    def cost(self):
+        return sum(child.cost for child in self.children)
+
+    def __repr__(self):
+        return '(' + ' | '.join(map(repr, self.children)) + ')'
+
+class _Not(Query):
+    """
+    Private class representing a negated query.
+    """
+    __slots__ = ('child',)
+
+    def __init__(self, child):
+        self.child = child
+
+    @property
+    def cost(self):
+        return self.child.cost
+
+    def __repr__(self):
+        return f'~{self.child!r}'
+
+def _chain_children(kind, children):
+    """
+    Private generator flattening nested conjunctions or disjunctions.
+    """
+    for child in children:
+        if not isinstance(child, Query):
+            raise TypeError(f'{child} is not a Query')
+        if isinstance(child, kind):
+            yield from child.children
+        else:
+            yield child
+
+class Q:
+    """
+    Constructors of query terms.
+
+    Methods:
+        name (pattern: str, match_type: str): Term matching file names (without file type).
+        ext (pattern: str, match_type: str): Term matching file types, standardized
+            the same way as in PathFinder.find. Compressed files have compound
+            file types, e.g. 'csv.gz'.
+        path (pattern: str, match_type: str): Term matching the directory of a file.
+        size (min: int, max: int): Inclusive range of file sizes in bytes.
+        mtime (min: float | datetime, max: float | datetime): Inclusive range of
+            file modification times.
+        ctime (min: float | datetime, max: float | datetime): Inclusive range of
+            file change times (creation times on Windows).
+        age (min: float | timedelta, max: float | timedelta): Inclusive range of
+            seconds elapsed since the file modification.
+    """
+    @staticmethod
+    def name(pattern, match_type = 'eq'):
+        return _Term('name', pattern, match_type)
+
+    @staticmethod
+    def ext(pattern, match_type = 'eq'):
+        return _Term('ext', _resolve_ext(pattern) if isinstance(pattern, str) else pattern,
+                     match_type)
+
+    @staticmethod
+    def path(pattern, match_type = 'eq'):
+        return _Term('path', pattern, match_type)
+
+    @staticmethod
+    def size(min = None, max = None):
+        return _Term('size', _resolve_range((min, max), 'size'))
+
+    @staticmethod
+    def mtime(min = None, max = None):
+        return _Term('mtime', _resolve_range((min, max), 'mtime'))
+
+    @staticmethod
+    def ctime(min = None, max = None):
+        return _Term('ctime', _resolve_range((min, max), 'ctime'))
+
+    @staticmethod
+    def age(min = None, max = None):
+        return _Term('age', _resolve_range((min, max), 'age'))
+
+def _order(query):
+    """
+    Private function ordering query operands by ascending cost.
+
+    Parameters
+    ----------
+    query: Query
+        Query to be ordered.
+
+    Returns
+    -------
+    Query
+        Equivalent query whose conjunctions and disjunctions evaluate
+        the cheapest operands first.
+    """
+    if isinstance(query, (_And, _Or)):
+        return query.__class__(*sorted((_order(c) for c in query.children),
+                                       key=lambda c: c.cost))
+    if isinstance(query, _Not):
+        return _Not(_order(query.child))
+    return query
+
+def _simplify(query, known):
+    """
+    Private function partially evaluating a query.
+
+    Parameters
+    ----------
+    query: Query
+        Query to be simplified.
+    known: Callable[[_Term], bool | None]
+        Function returning the value of a term, or None when it is unknown.
+
+    Returns
+    -------
+    Query
+        Simplified query, _TRUE or _FALSE when the result does not depend
+        on the unknown terms.
+    """
+    if isinstance(query, _Term):
+        value = known(query)
+        return query if value is None else _TRUE if value else _FALSE
+    if isinstance(query, _Not):
+        child = _simplify(query.child, known)
+        if isinstance(child, _Const):
+            return _FALSE if child.value else _TRUE
+        return _Not(child)
+    if isinstance(query, (_And, _Or)):
+        absorbing = isinstance(query, _Or)
+        children = []
+        for child in query.children:
+            child = _simplify(child, known)
+            if isinstance(child, _Const):
+                if child.value is absorbing:
+                    return child
+                continue
+            children.append(child)
+        if not children:
+            return _FALSE if absorbing else _TRUE
+        return children[0] if len(children) == 1 else query.__class__(*children)
+    return query
+
+def _uses(query, fields):
+    """
+    Private function checking whether a query contains terms of given fields.
+    """
+    if isinstance(query, _Term):
+        return query.field in fields
+    if isinstance(query, _Not):
+        return _uses(query.child, fields)
+    if isinstance(query, (_And, _Or)):
+        return any(_uses(c, fields) for c in query.children)
+    return False
+
+class _Batch:
+    """
+    Private class exposing file parts of a batch of files to the query plan.
+
+    File names, file types and metadata are computed lazily, only for
+    the files which reach a term that needs them.
+
+    Parameters:
+        roots (str | List[str]): Directory shared by all of the files,
+            or directories aligned with names.
+        names (List[str]): File names combined with file extensions.
+        stat (Callable[[int], _FileStat | None]): Function returning
+            the metadata of the i-th file, None if it can't be retrieved.
+        now (float): Timestamp that file ages are measured from.
+    """
+    def __init__(self, roots, names, stat, now):
+        self.roots = roots
+        self.names = names
+        self.stat = stat
+        self.now = now
+        self._parts = {}
+
+    def _split(self, i):
+        parts = self._parts.get(i)
+        if parts is None:
+            stem, suffix = _split_name(self.names[i])
+            parts = self._parts[i] = (stem, _resolve_ext(suffix))
+        return parts
+
+    def values(self, field, idx):
+        if field == 'name':
+            return [self._split(i)[0] for i in idx]
+        if field == 'ext':
+            return [self._split(i)[1] for i in idx]
+        if isinstance(self.roots, str):
+            return [self.roots] * len(idx)
+        return [self.roots[i] for i in idx]
+
+    def stat_value(self, field, i):
+        stat = self.stat(i)
+        if stat is None:
+            return None
+        if field == 'age':
+            return self.now - stat.mtime
+        return getattr(stat, field)
+
+class _Plan:
+    """
+    Private class representing a compiled query.
+
+    The plan orders operands of every conjunction and disjunction by cost,
+    evaluates file path terms once per directory and evaluates the remaining
+    terms on whole directory listings with the batch form of the matchers,
+    narrowing the listing after every operand. Directories are pruned from
+    traversal when file path terms already decide the result for every file
+    below them: hereditary matches, e.g. ~Q.path('tmp', 'isin'), and patterns
+    that no path below them can reach, e.g. Q.path('/data/x', 'startswith')
+    for /data/y.
+
+    Parameters:
+        query (Query): Query to be compiled.
+        archives (bool, default=False): Flag indicating whether members of
+            zip and tar archives should be matched as well.
+
+    Attributes:
+        query (Query): Ordered query.
+        archives (bool): Flag indicating whether archive members are matched.
+        now (float): Timestamp that file ages are measured from.
+        needs_stat (bool): Flag indicating whether the query has metadata terms.
+    """
+    def __init__(self, query, archives = False):
+        if not isinstance(query, Query):
+            raise TypeError(f'{query} is not a Query')
+        self.query = _order(query)
+        self.archives = archives
+        self.now = time.time()
+        self.needs_stat = _uses(self.query, _STAT_FIELDS)
+        self._has_path = _uses(self.query, ('path',))
+
+    def _path_value(self, root, hereditary_only):
+        """
+        Private function returning a function evaluating file path terms on a directory.
+
+        With hereditary_only, terms are evaluated for every directory below
+        the root as well: True when a hereditary matcher matches the root,
+        False when the matcher can't reach the root or any path below it.
+        """
+        def known(term):
+            if term.field != 'path':
+                return None
+            matcher = matching.get_matcher(term.match_type)
+            if hereditary_only:
+                if matcher.hereditary and matcher(root, term.pattern):
+                    return True
+                if not matcher.reachable(root, term.pattern):
+                    return False
+                return None
+            return matcher(root, term.pattern)
+        return known
+
+    def for_directory(self, root):
+        """
+        Function returning the query simplified for files of a single directory.
+
+        Parameters
+        ----------
+        root: str
+            Path-like string pointing to the directory.
+
+        Returns
+        -------
+        Query
+            Simplified query, _FALSE when no file of the directory can match.
+        """
+        if not self._has_path:
+            return self.query
+        return _simplify(self.query, self._path_value(root, False))
+
+    def prunes(self, directory):
+        """
+        Function checking whether no file below a directory can match.
+
+        Parameters
+        ----------
+        directory: str
+            Path-like string pointing to the directory.
+
+        Returns
+        -------
+        bool
+            True if the directory can be skipped during traversal.
+        """
+        if not self._has_path:
+            return False
+        return _simplify(self.query, self._path_value(directory, True)) is _FALSE
+
+    def select(self, query, batch, idx = None):
+        """
+        Function returning indexes of the files in a batch matching a query.
+
+        Parameters
+        ----------
+        query: Query
+            Query returned by for_directory, or the ordered query.
+        batch: _Batch
+            File parts of the batch.
+        idx: List[int], default=None
+            Indexes of the files to be evaluated, defaults to the whole batch.
+
+        Returns
+        -------
+        List[int]
+            Indexes of the matching files, in ascending order.
+        """
+        if idx is None:
+            idx = list(range(len(batch.names)))
+        if not idx or query is _TRUE:
+            return idx
+        if query is _FALSE:
+            return []
+        if isinstance(query, _And):
+            for child in query.children:
+                idx = self.select(child, batch, idx)
+                if not idx:
+                    break
+            return idx
+        if isinstance(query, _Or):
+            matched, remaining = set(), idx
+            for child in query.children:
+                found = self.select(child, batch, remaining)
+                matched.update(found)
+                remaining = [i for i in remaining if i not in matched]
+                if not remaining:
+                    break
+            return [i for i in idx if i in matched]
+        if isinstance(query, _Not):
+            found = set(self.select(query.child, batch, idx))
+            return [i for i in idx if i not in found]
+        if query.field in _STAT_FIELDS:
+            selected = []
+            for i in idx:
+                value = batch.stat_value(query.field, i)
+                if value is not None and _in_range(value, query.pattern):
+                    selected.append(i)
+            return selected
+        mask = matching.get_matcher(query.match_type).match_many(
+            batch.values(query.field, idx), query.pattern)
+        return [i for i, m in zip(idx, mask) if m]
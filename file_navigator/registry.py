@@ -0,0 +1,177 @@
+"""
+Directory registry backed by a path-component trie
+"""
+import os
+from collections.abc import MutableMapping
+
+class _Node:
+    """
+    Private class representing a single path component in the trie.
+
+    Attributes:
+        children (Dict[str: _Node]): Child nodes keyed by path component.
+        key (str | None): Directory string registered at this node, if any.
+        count (int): Number of registered directories in the subtree rooted
+            at this node, including the node itself.
+    """
+    __slots__ = ('children', 'key', 'count')
+
+    def __init__(self):
+        self.children = {}
+        self.key = None
+        self.count = 0
+
+class _DirectoryTrie(MutableMapping):
+    """
+    Private mapping of directories and traverse_subdirs flags.
+
+    Mapping that behaves like a dictionary with directory path and flag
+    for flat or deep scan key, value pairs, while indexing the directories
+    in a trie of normalized path components. Insertion, removal and
+    parent - child conflict detection cost O(depth) instead of a scan
+    over all of the registered directories.
+
+    Attributes:
+        _entries (Dict[str: bool]): Registered directories and flags,
+            in insertion order.
+        _parts (Dict[str: Tuple[str]]): Normalized path components of the
+            registered directories, resolved once at registration, so that
+            removal walks the same chain after the working directory changes.
+        _root (_Node): Root node of the trie.
+
+    Methods:
+        conflicts (directory: str, traverse_subdirs: bool): Returns the list of
+            registered directories with conflicting parent - child relationship.
+    """
+    def __init__(self, directories = None):
+        self._entries = {}
+        self._parts = {}
+        self._root = _Node()
+        if directories is not None:
+            self.update(directories)
+
+    @staticmethod
+    def _split(directory):
+        """
+        Private function for splitting a directory into normalized path components.
+
+        Parameters
+        ----------
+        directory: str
+            Path-like string pointing to a directory.
+
+        Returns
+        -------
+        Tuple[str]
+            Path components of the absolute, case-normalized directory.
+            Relative directories are resolved against the current working
+            directory, so the result is not cached.
+        """
+        parts = os.path.normcase(os.path.abspath(directory)).split(os.sep)
+        return tuple([parts[0]] + [p for p in parts[1:] if p])
+
+    def _find(self, parts):
+        """
+        Private function returning the chain of nodes matching path components.
+
+        Parameters
+        ----------
+        parts: Tuple[str]
+            Normalized path components.
+
+        Returns
+        -------
+        List[_Node]
+            Nodes from the root to the deepest existing node along the path.
+        """
+        nodes = [self._root]
+        for part in parts:
+            node = nodes[-1].children.get(part)
+            if node is None:
+                break
+            nodes.append(node)
+        return nodes
+
+    def _descendants(self, node):
+        """
+        Private generator yielding directories registered below a node.
+        """
+        stack = list(node.children.values())
+        while stack:
+            current = stack.pop()
+            if current.key is not None:
+                yield current.key
+            stack.extend(current.children.values())
+
+    def conflicts(self, directory, traverse_subdirs):
+        """
+        Function returning directories conflicting with a new entry.
+
+        A directory conflicts with a new entry when it is a parent of the entry
+        and is scanned deep, or when it is a child of the entry and the entry
+        is scanned deep. The same directory never conflicts with itself.
+
+        Parameters
+        ----------
+        directory: str
+            Path-like string pointing to a directory.
+        traverse_subdirs: bool
+            Flag indicating whether the new entry would be scanned deep.
+
+        Returns
+        -------
+        List[str]
+            Registered directories with conflicting parent - child relationship.
+        """
+        parts = self._split(directory)
+        nodes = self._find(parts)
+        found = [n.key for n in nodes[1:len(parts)]
+                 if n.key is not None and self._entries[n.key]]
+        if traverse_subdirs and len(nodes) == len(parts) + 1:
+            node = nodes[-1]
+            if node.count - (node.key is not None) > 0:
+                found.extend(self._descendants(node))
+        return found
+
+    def __getitem__(self, directory):
+        return self._entries[directory]
+
+    def __setitem__(self, directory, traverse_subdirs):
+        parts = self._split(directory)
+        if self._parts.get(directory, parts) != parts:
+            del self[directory]
+        node = self._root
+        path = [node]
+        for part in parts:
+            node = node.children.setdefault(part, _Node())
+            path.append(node)
+        if node.key is not None:
+            del self._entries[node.key]
+            del self._parts[node.key]
+        else:
+            for n in path:
+                n.count += 1
+        node.key = directory
+        self._entries[directory] = traverse_subdirs
+        self._parts[directory] = parts
+
+    def __delitem__(self, directory):
+        del self._entries[directory]
+        parts = self._parts.pop(directory)
+        nodes = self._find(parts)
+        nodes[-1].key = None
+        for n in nodes:
+            n.count -= 1
+        for parent, part, child in zip(reversed(nodes[:-1]), reversed(parts),
+                                       reversed(nodes[1:])):
+            if child.count == 0:
+                del parent.children[part]
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return repr(self._entries)
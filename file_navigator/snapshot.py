@@ -0,0 +1,246 @@
+"""
+Sorted, disk-backed snapshots of directory scans
+"""
+import heapq
+import os
+import struct
+import tempfile
+import weakref
+
+_MAGIC = b'FNSS'
+_VERSION = 1
+_HAS_INODES = 1
+# magic, version, flags, number of records
+_HEADER = struct.Struct('<4sHHQ')
+# key length, size, mtime, inode
+_RECORD = struct.Struct('<IQdQ')
+
+def _key(root, name):
+    """
+    Private function encoding a path as a sort key.
+
+    The root directory and the file name are separated with a NUL byte,
+    which can't be part of a path, so keys sort by root directory first.
+    """
+    return (root + '\0' + name).encode('utf-8', 'surrogatepass')
+
+def _decode(key):
+    """
+    Private function decoding a sort key into a (root, file name) tuple.
+    """
+    return tuple(key.decode('utf-8', 'surrogatepass').split('\0', 1))
+
+def _write_records(file, records):
+    """
+    Private function writing records to a binary file.
+
+    Parameters
+    ----------
+    file: BinaryIO
+        File opened for binary writing.
+    records: Iterable[Tuple[bytes, int, float, int]]
+        Records with a key, size, modification time and inode.
+
+    Returns
+    -------
+    int
+        Number of written records.
+    """
+    count = 0
+    for key, size, mtime, ino in records:
+        file.write(_RECORD.pack(len(key), size, mtime, ino))
+        file.write(key)
+        count += 1
+    return count
+
+def _read_records(path, offset = 0):
+    """
+    Private generator reading records written by _write_records.
+
+    Parameters
+    ----------
+    path: str
+        Path-like string of the file.
+    offset: int, default=0
+        Offset of the first record.
+
+    Returns
+    -------
+    Generator[Tuple[bytes, int, float, int]]
+        Generator containing records with a key, size, modification time and inode.
+    """
+    with open(path, 'rb') as file:
+        file.seek(offset)
+        while True:
+            head = file.read(_RECORD.size)
+            if not head:
+                return
+            length, size, mtime, ino = _RECORD.unpack(head)
+            yield file.read(length), size, mtime, ino
+
+def _spill(chunk, directory):
+    """
+    Private function sorting a chunk of records and writing it to a temporary run file.
+
+    Parameters
+    ----------
+    chunk: List[Tuple[bytes, int, float, int]]
+        Records to be sorted in place and written.
+    directory: str
+        Directory in which the run file is created.
+
+    Returns
+    -------
+    str
+        Path of the run file.
+    """
+    chunk.sort()
+    fd, run = tempfile.mkstemp(suffix='.run', dir=directory)
+    with os.fdopen(fd, 'wb') as file:
+        _write_records(file, chunk)
+    return run
+
+class _Snapshot:
+    """
+    Private class representing a sorted, disk-backed snapshot of a directory scan.
+
+    Records with the path, size, modification time and optionally the inode
+    of every file are kept in a binary file sorted by path, and are read
+    sequentially, so snapshots of any size are diffed in bounded memory.
+
+    Parameters:
+        path (str): Path-like string of a file written by _Snapshot.build.
+
+    Attributes:
+        path (str): Path-like string of the snapshot file.
+        inode (bool): Flag indicating whether inodes were recorded.
+
+    Methods:
+        build (items, path: str, inode: bool, chunk_size: int): Class method
+            creating a snapshot from scanned paths and metadata.
+        diff (other: _Snapshot): Returns the added, removed and modified paths
+            between the snapshot and a newer one.
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            header = file.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError(f'{path} is not a snapshot file')
+        magic, version, flags, self._count = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f'{path} is not a snapshot file')
+        self.path = path
+        self.inode = bool(flags & _HAS_INODES)
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for key, size, mtime, ino in _read_records(self.path, _HEADER.size):
+            yield _decode(key) + (size, mtime, ino if self.inode else None)
+
+    @classmethod
+    def build(cls, items, path = None, inode = False, chunk_size = 1000000):
+        """
+        Creates a snapshot from scanned paths and metadata.
+
+        Records are buffered in chunks of chunk_size, every full chunk is sorted
+        and spilled to a temporary run file next to the snapshot, and the runs
+        are merged into the snapshot file with a k-way merge.
+
+        Parameters
+        ----------
+        items: Iterable[Tuple[Tuple[str, str], _FileStat]]
+            Scanned paths, as (root directory, file name) tuples, and their metadata.
+        path: str, default=None
+            Path-like string of the snapshot file. When None, a temporary file
+            is created and removed together with the returned object.
+        inode: bool, default=False
+            Flag indicating whether inodes should be recorded, so that replaced
+            files with unchanged size and modification time are detected.
+        chunk_size: int, default=1000000
+            Maximum number of records kept in memory.
+
+        Returns
+        -------
+        _Snapshot
+            New instance of _Snapshot.
+        """
+        if not (isinstance(chunk_size, int) and chunk_size > 0):
+            raise ValueError('"chunk_size" argument must be a positive integer')
+        temporary = path is None
+        if temporary:
+            fd, path = tempfile.mkstemp(suffix='.fnss')
+            os.close(fd)
+        directory = os.path.dirname(os.path.abspath(path))
+
+        runs, chunk, count = [], [], 0
+        try:
+            for (root, name), stat in items:
+                chunk.append((_key(root, name), stat.size, stat.mtime,
+                              stat.ino if inode else 0))
+                count += 1
+                if len(chunk) >= chunk_size:
+                    runs.append(_spill(chunk, directory))
+                    chunk = []
+            if runs:
+                if chunk:
+                    runs.append(_spill(chunk, directory))
+                    chunk = []
+                records = heapq.merge(*(_read_records(run) for run in runs))
+            else:
+                chunk.sort()
+                records = chunk
+            with open(path, 'wb') as file:
+                file.write(_HEADER.pack(_MAGIC, _VERSION,
+                                        _HAS_INODES if inode else 0, count))
+                _write_records(file, records)
+        except BaseException:
+            if temporary:
+                os.remove(path)
+            raise
+        finally:
+            for run in runs:
+                os.remove(run)
+
+        snapshot = cls(path)
+        if temporary:
+            weakref.finalize(snapshot, os.remove, path)
+        return snapshot
+
+    def diff(self, other):
+        """
+        Returns the paths changed between the snapshot and a newer one.
+
+        Both snapshots are read sequentially and merged in a single linear pass.
+        A path is modified when its size or modification time changed, or its
+        inode changed and both snapshots recorded inodes.
+
+        Parameters
+        ----------
+        other: _Snapshot
+            Newer snapshot.
+
+        Returns
+        -------
+        Tuple[List[Tuple[str, str]], List[Tuple[str, str]], List[Tuple[str, str]]]
+            Added, removed and modified paths, as (root directory, file name)
+            tuples sorted by path.
+        """
+        added, removed, modified = [], [], []
+        inode = self.inode and other.inode
+        old = _read_records(self.path, _HEADER.size)
+        new = _read_records(other.path, _HEADER.size)
+        a, b = next(old, None), next(new, None)
+        while a is not None or b is not None:
+            if b is None or (a is not None and a[0] < b[0]):
+                removed.append(_decode(a[0]))
+                a = next(old, None)
+            elif a is None or b[0] < a[0]:
+                added.append(_decode(b[0]))
+                b = next(new, None)
+            else:
+                if a[1:3] != b[1:3] or (inode and a[3] != b[3]):
+                    modified.append(_decode(b[0]))
+                a, b = next(old, None), next(new, None)
+        return added, removed, modified
@@ -0,0 +1,263 @@
+"""
+Compact, memory-mappable storage of file paths and file metadata
+"""
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import MutableMapping, Sequence
+
+_MAGIC = b'FNPM'
+_VERSION = 1
+_HAS_STATS = 1
+_BIG_ENDIAN = 2
+# magic, version, flags, number of directories, number of paths
+_HEADER = struct.Struct('<4sHHIQ')
+_STAT_COLUMNS = (('size', 'Q'), ('mtime', 'd'), ('ctime', 'd'), ('ino', 'Q'), ('dev', 'Q'))
+
+def _pad(file, written):
+    """
+    Private function padding a section to an 8-byte boundary.
+
+    Parameters
+    ----------
+    file: BinaryIO
+        File opened for binary writing.
+    written: int
+        Number of bytes written so far.
+
+    Returns
+    -------
+    int
+        Number of bytes written after padding.
+    """
+    padding = -written % 8
+    file.write(b'\0' * padding)
+    return written + padding
+
+def _write_strings(file, written, strings):
+    """
+    Private function writing packed strings as an offsets column and a blob.
+
+    Parameters
+    ----------
+    file: BinaryIO
+        File opened for binary writing.
+    written: int
+        Number of bytes written so far.
+    strings: Iterable[str]
+        Strings to be packed.
+
+    Returns
+    -------
+    int
+        Number of bytes written after the section.
+    """
+    offsets, blob = array('Q', [0]), bytearray()
+    for string in strings:
+        blob += string.encode('utf-8', 'surrogatepass')
+        offsets.append(len(blob))
+    file.write(offsets.tobytes())
+    file.write(blob)
+    return _pad(file, written + len(offsets) * offsets.itemsize + len(blob))
+
+def _save_paths(path, paths, stats = None):
+    """
+    Private function saving paths and optional metadata in a compact binary format.
+
+    The format consists of a header, a deduplicated directory table, a column
+    of directory indexes, packed file name columns and an optional metadata
+    column per _FileStat field. Every section is aligned to 8 bytes, so
+    the columns can be read straight from a memory map.
+
+    Parameters
+    ----------
+    path: str
+        Path-like string of the file to be written.
+    paths: Sequence[Tuple[str, str]]
+        Two-element tuples with the root directory and the file name.
+    stats: Sequence[_FileStat], default=None
+        Metadata of the paths, in the same order.
+
+    Returns
+    -------
+    None
+    """
+    directories, index = {}, array('I')
+    for root, _ in paths:
+        index.append(directories.setdefault(root, len(directories)))
+    flags = (_HAS_STATS if stats is not None else 0) \
+        | (_BIG_ENDIAN if sys.byteorder == 'big' else 0)
+
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, flags, len(directories), len(paths)))
+        written = _pad(file, _HEADER.size)
+        written = _write_strings(file, written, directories)
+        file.write(index.tobytes())
+        written = _pad(file, written + len(index) * index.itemsize)
+        written = _write_strings(file, written, (name for _, name in paths))
+        if stats is not None:
+            for i, (_, typecode) in enumerate(_STAT_COLUMNS):
+                column = array(typecode, (stat[i] for stat in stats))
+                file.write(column.tobytes())
+
+def _column(view, start, typecode, length, swap):
+    """
+    Private function returning a typed column of a memory map.
+
+    Parameters
+    ----------
+    view: memoryview
+        Byte view of the memory-mapped file.
+    start: int
+        Offset of the column.
+    typecode: str
+        Type code of the column items.
+    length: int
+        Number of items in the column.
+    swap: bool
+        Flag indicating whether the file was written with the other byte order,
+        in which case the column is copied and byte-swapped.
+
+    Returns
+    -------
+    Tuple[memoryview | array, int]
+        Column and the offset right after it.
+    """
+    end = start + length * array(typecode).itemsize
+    if swap:
+        column = array(typecode, view[start:end].tobytes())
+        column.byteswap()
+    else:
+        column = view[start:end].cast(typecode)
+    return column, end + (-end % 8)
+
+class _MappedPaths(Sequence):
+    """
+    Private read-only sequence of paths backed by a memory-mapped file.
+
+    Directory strings are decoded once when the file is opened, file names
+    are decoded on access, so opening a file is close to zero-copy and its
+    pages are shared through the page cache by all processes opening it.
+
+    Parameters:
+        path (str): Path-like string of a file written by _save_paths.
+        stat_type (type, default=tuple): Type the metadata rows are returned as.
+
+    Attributes:
+        stats (_MappedStats | None): Metadata stored in the file, if any.
+    """
+    def __init__(self, path, stat_type = tuple):
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        magic, version, flags, n_dirs, n_paths = _HEADER.unpack_from(view)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f'{path} is not a supported _PathManager file')
+        swap = bool(flags & _BIG_ENDIAN) != (sys.byteorder == 'big')
+
+        offset = _HEADER.size + (-_HEADER.size % 8)
+        dir_offsets, offset = _column(view, offset, 'Q', n_dirs + 1, swap)
+        self._dirs = [bytes(view[offset + dir_offsets[i]:offset + dir_offsets[i + 1]])
+                      .decode('utf-8', 'surrogatepass') for i in range(n_dirs)]
+        offset += dir_offsets[n_dirs]
+        offset += -offset % 8
+        self._index, offset = _column(view, offset, 'I', n_paths, swap)
+        self._offsets, offset = _column(view, offset, 'Q', n_paths + 1, swap)
+        self._names = view[offset:offset + self._offsets[n_paths]]
+        offset += self._offsets[n_paths]
+        offset += -offset % 8
+
+        self.stats = None
+        if flags & _HAS_STATS:
+            columns = []
+            for _, typecode in _STAT_COLUMNS:
+                column, offset = _column(view, offset, typecode, n_paths, swap)
+                columns.append(column)
+            self.stats = _MappedStats(self, columns, stat_type)
+
+    def __len__(self):
+        return len(self._index)
+
+    def _name(self, i):
+        return bytes(self._names[self._offsets[i]:self._offsets[i + 1]]).decode(
+            'utf-8', 'surrogatepass')
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('path index out of range')
+        return (self._dirs[self._index[i]], self._name(i))
+
+    def __iter__(self):
+        dirs, index = self._dirs, self._index
+        for i in range(len(index)):
+            yield (dirs[index[i]], self._name(i))
+
+class _MappedStats(MutableMapping):
+    """
+    Private mapping of paths and metadata backed by memory-mapped columns.
+
+    The path to position index is built on first lookup. Metadata assigned
+    after opening is kept in memory, the file is never modified.
+
+    Parameters:
+        paths (_MappedPaths): Paths stored in the same file.
+        columns (List[memoryview | array]): Metadata columns in _FileStat order.
+        stat_type (type): Type the metadata rows are returned as.
+    """
+    def __init__(self, paths, columns, stat_type):
+        self._paths = paths
+        self._columns = columns
+        self._stat_type = stat_type
+        self._positions = None
+        self._assigned = {}
+
+    def __getitem__(self, path):
+        if path in self._assigned:
+            return self._assigned[path]
+        if self._positions is None:
+            self._positions = {p: i for i, p in enumerate(self._paths)}
+        i = self._positions[path]
+        return self._stat_type(*(column[i] for column in self._columns))
+
+    def __setitem__(self, path, stat):
+        self._assigned[path] = stat
+
+    def __delitem__(self, path):
+        del self._assigned[path]
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, path):
+        try:
+            self[path]
+        except KeyError:
+            return False
+        return True
+
+def _open_paths(path, stat_type = tuple):
+    """
+    Private function opening paths and metadata saved by _save_paths.
+
+    Parameters
+    ----------
+    path: str
+        Path-like string of a file written by _save_paths.
+    stat_type: type, default=tuple
+        Type the metadata rows are returned as.
+
+    Returns
+    -------
+    Tuple[_MappedPaths, _MappedStats | None]
+        Memory-mapped paths and metadata, None if no metadata was saved.
+    """
+    paths = _MappedPaths(path, stat_type)
+    return paths, paths.stats
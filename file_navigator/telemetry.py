@@ -0,0 +1,169 @@
+"""
+Opt-in telemetry of loaded files: size on disk, load time, throughput and memory
+"""
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+from functools import partial
+from .archive import _find_member, _split_member
+from .matching import _split_name
+
+_LoadRecord = namedtuple('_LoadRecord', ['path', 'ext', 'function', 'size', 'seconds',
+                                         'memory', 'throughput'])
+
+def _file_size(path):
+    """
+    Private function returning the size of a file or archive member on disk.
+
+    Returns
+    -------
+    int | None
+        Size in bytes (uncompressed size for archive members), None when
+        the file can't be found.
+    """
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        pass
+    member = _split_member(path)
+    item = _find_member(*member) if member is not None and member[1] else None
+    return None if item is None else item[1]
+
+def _object_memory(obj):
+    """
+    Private function estimating the memory used by a loaded object in bytes.
+    """
+    if hasattr(obj, 'memory_usage'):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, 'sum') else usage)
+    if hasattr(obj, 'nbytes'):
+        return int(obj.nbytes)
+    return sys.getsizeof(obj)
+
+def _function_name(func):
+    """
+    Private function returning the name of a loading function, unwrapping partials.
+    """
+    while isinstance(func, partial):
+        func = func.func
+    return getattr(func, '__name__', type(func).__name__)
+
+def _measure(telemetry, path, function, load):
+    """
+    Private function timing a load and passing its record to a telemetry callback.
+
+    Parameters
+    ----------
+    telemetry: Callable[[_LoadRecord], Any]
+        Callback receiving the record, e.g. LoadTelemetry.
+    path: str
+        Path-like string pointing to the loaded file.
+    function: Callable | str
+        Loading function, or its name.
+    load: Callable[[], Any]
+        Function without arguments loading the data.
+
+    Returns
+    -------
+    Any
+        Object returned by load. Records are passed only for successful loads.
+    """
+    start = time.perf_counter()
+    obj = load()
+    seconds = time.perf_counter() - start
+    size = _file_size(path)
+    throughput = size / 2 ** 20 / seconds if size is not None and seconds > 0 else None
+    name = function if isinstance(function, str) else _function_name(function)
+    telemetry(_LoadRecord(path, _split_name(os.path.basename(path))[1], name, size,
+                          seconds, _object_memory(obj), throughput))
+    return obj
+
+class LoadTelemetry:
+    """
+    Collector of per-file load records.
+
+    An instance is assigned to the telemetry attribute of a BaseLoader, or of
+    another loader passed to _PathManager.load. Each loaded file is
+    recorded with its size on disk, the wall time of reading and parsing it,
+    the memory of the loaded object, the throughput and the loading function.
+
+    Parameters:
+        callback (Callable[[_LoadRecord], Any], default=None): Function called
+            with each record as it is collected, e.g. to forward it to a metrics
+            pipeline.
+
+    Attributes:
+        records (List[_LoadRecord]): Collected records, as named tuples with path,
+            ext, function, size (bytes), seconds, memory (bytes) and throughput (MB/s)
+            fields. Size and throughput are None when the file can't be found.
+
+    Methods:
+        frame (): Returns the records as a pandas DataFrame.
+        summary (by: str): Aggregates the records by 'ext' or 'function',
+            returning a pandas DataFrame with the number of files, the total size,
+            time and memory, and the overall throughput of each group.
+        clear (): Removes the collected records.
+    """
+    def __init__(self, callback = None):
+        if callback is not None and not callable(callback):
+            raise TypeError(f"{callback} is not callable")
+        self._callback = callback
+        self._records = []
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        with self._lock:
+            self._records.append(record)
+        if self._callback is not None:
+            self._callback(record)
+
+    def __len__(self):
+        return len(self._records)
+
+    @property
+    def records(self):
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def frame(self):
+        """
+        Returns the collected records as a DataFrame.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame with one row per loaded file and the record fields as columns.
+        """
+        import pandas as pd
+        return pd.DataFrame(self.records, columns=_LoadRecord._fields)
+
+    def summary(self, by = 'ext'):
+        """
+        Aggregates the collected records.
+
+        Parameters
+        ----------
+        by: str, default='ext'
+            Record field the files are grouped by, 'ext' or 'function'.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame indexed by the group key, with files, size, seconds,
+            memory and throughput (total MB per total second) columns.
+        """
+        if by not in ('ext', 'function'):
+            raise ValueError('"by" argument must be either "ext" or "function"')
+        frame = self.frame()
+        summary = frame.groupby(by, sort=True).agg(files=('path', 'size'),
+                                                   size=('size', 'sum'),
+                                                   seconds=('seconds', 'sum'),
+                                                   memory=('memory', 'sum'))
+        summary['throughput'] = summary['size'] / 2 ** 20 / summary['seconds']
+        return summary
@@ -1,5 +1,14 @@
 import unittest
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
+from unittest.mock import patch
+import pandas as pd
 from file_navigator.abc_loader import BaseLoader
+from file_navigator import loaders
+from file_navigator.telemetry import LoadTelemetry
 
 def load_1(path, kwarg1 = None):
     return f"{path} called with kwargs:{kwarg1}"
@@ -100,7 +109,118 @@ class TestBaseLoader(unittest.TestCase):
             with self.subTest(arg = arg):
                 a,b = arg
                 self.assertCountEqual(bl.load(a,**b), expected[a])
-        
+
+    def test_load_no_stat(self):
+        bl = BaseLoader({(lambda path: path): '.csv'})
+        path = os.path.join('missing', 'rates.csv')
+        with patch('os.stat', side_effect=AssertionError) as mock_stat:
+            self.assertEqual(bl.load(path), path)
+            mock_stat.assert_not_called()
+
+    def test_load_compressed(self):
+        def read(path, kwarg1 = None):
+            if hasattr(path, 'read'):
+                return path.read().decode() + f':{kwarg1}'
+            with open(path) as file:
+                return file.read() + f':{kwarg1}'
+
+        bl = BaseLoader({read: '.csv', load_2: ['.json.gz', '.gz']})
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = {}
+            for suffix, compress in (('', bytes), ('.gz', gzip.compress),
+                                     ('.bz2', bz2.compress), ('.xz', lzma.compress)):
+                paths[suffix] = os.path.join(tmp, f'rates.v2.csv{suffix}')
+                with open(paths[suffix], 'wb') as file:
+                    file.write(compress(b'a,b'))
+
+            for suffix, path in paths.items():
+                with self.subTest(suffix = suffix):
+                    self.assertEqual(bl.load(path, kwarg1=1), 'a,b:1')
+
+            path = os.path.join(tmp, 'events.json.gz')
+            self.assertEqual(bl.load(path), f'{path} called with kwargs:True')
+            path = os.path.join(tmp, 'dump.gz')
+            self.assertEqual(bl.load(path), f'{path} called with kwargs:True')
+            with self.assertRaises(KeyError):
+                bl.load(os.path.join(tmp, 'dump.txt.bz2'))
+
+    def test_arrow_loader(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            feather, parquet = os.path.join(tmp, 'a.feather'), os.path.join(tmp, 'a.parquet')
+            if loaders.pa is None:
+                with self.assertRaises(ImportError):
+                    loaders.ArrowLoader.load(feather)
+                return
+            table = loaders.pa.table({'a': [1, 2], 'b': ['x', 'y']})
+            loaders._feather.write_feather(table, feather)
+            loaders._parquet.write_table(table, parquet)
+
+            for path in (feather, parquet):
+                with self.subTest(path = path):
+                    self.assertTrue(loaders.ArrowLoader.load(path).equals(table))
+                    self.assertEqual(loaders.ArrowLoader.load(path, columns=('b',)).column_names,
+                                     ['b'])
+                    df = loaders.ArrowLoader.load(path, to_pandas=True)
+                    self.assertEqual(df['a'].tolist(), [1, 2])
+
+    def test_csv_engines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'rates.csv')
+            with open(path, 'w') as file:
+                file.write('a;b\n1;2\n3;4\n')
+            expected = loaders.PDLoader.load(path, sep=';')
+            for engine in ('python', 'pyarrow', 'polars'):
+                with self.subTest(engine = engine):
+                    df = loaders.PDLoader.load(path, engine=engine, sep=';')
+                    self.assertEqual(df.values.tolist(), expected.values.tolist())
+                    # unsupported by pyarrow and polars, falls back to the pandas parser
+                    df = loaders.PDLoader.load(path, engine=engine, sep=';', skipfooter=1)
+                    self.assertEqual(df.values.tolist(), [[1, 2]])
+            with self.assertRaises(ValueError):
+                loaders.PDLoader.load(path, engine='unknown')
+
+            # data errors are not retried with a more lenient engine
+            path = os.path.join(tmp, 'bad.csv')
+            with open(path, 'w') as file:
+                file.write('a,b\n1,2,3\n4,5\n')
+            if loaders.pa is not None:
+                with self.assertRaises(pd.errors.ParserError):
+                    loaders._read_csv(path, engine='pyarrow')
+            self.assertTrue(loaders._unsupported(loaders._UnsupportedOption(), 'polars'))
+            self.assertTrue(loaders._unsupported(ImportError(), 'polars'))
+            self.assertFalse(loaders._unsupported(ValueError('could not parse'), 'polars'))
+
+    def test_telemetry(self):
+        received = []
+        telemetry = LoadTelemetry(received.append)
+        loader = BaseLoader({(lambda path, **kwargs: 'x' * 10): '.txt'})
+        loader.telemetry = telemetry
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'a.txt')
+            with open(path, 'w') as file:
+                file.write('abcd')
+            self.assertEqual(loader.load(path), 'x' * 10)
+            # cached results are not read again, so they are not recorded
+            loader.load(path)
+        self.assertEqual(len(telemetry), 1)
+        self.assertEqual(received, telemetry.records)
+        record = telemetry.records[0]
+        self.assertEqual((record.path, record.ext, record.function, record.size),
+                         (path, '.txt', '<lambda>', 4))
+        self.assertGreater(record.memory, 0)
+
+        summary = telemetry.summary(by='function')
+        self.assertEqual(summary.loc['<lambda>', 'files'], 1)
+        self.assertEqual(summary.loc['<lambda>', 'size'], 4)
+        self.assertEqual(list(telemetry.frame().columns),
+                         ['path', 'ext', 'function', 'size', 'seconds', 'memory', 'throughput'])
+        with self.assertRaises(ValueError):
+            telemetry.summary(by='path')
+        telemetry.clear()
+        self.assertEqual(len(telemetry), 0)
+        with self.assertRaises(TypeError):
+            LoadTelemetry('callback')
+
 def suite():
     suite = unittest.TestSuite()
     suite.addTest(TestBaseLoader('test_empty_init'))
@@ -108,6 +228,11 @@ def suite():
     suite.addTest(TestBaseLoader('test_init_bad_args'))
     suite.addTest(TestBaseLoader('test_add_functions_bad_arg'))
     suite.addTest(TestBaseLoader('test_load'))
+    suite.addTest(TestBaseLoader('test_load_no_stat'))
+    suite.addTest(TestBaseLoader('test_load_compressed'))
+    suite.addTest(TestBaseLoader('test_arrow_loader'))
+    suite.addTest(TestBaseLoader('test_csv_engines'))
+    suite.addTest(TestBaseLoader('test_telemetry'))
     return suite
 
 if __name__ == '__main__':
@@ -0,0 +1,129 @@
+import unittest
+import contextlib
+import io
+import os
+import socket
+import tempfile
+import threading
+from unittest.mock import patch
+from file_navigator import client
+from file_navigator.daemon import _Index, _make_server
+from file_navigator.pathfinder import PathFinder
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Unix domain sockets are not supported')
+class TestDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = os.path.join(self.tmp.name, 'data')
+        os.makedirs(os.path.join(self.data, 'eur'))
+        for name in ('EURUSD.csv', 'eur/EURGBP.csv', 'audcad.txt'):
+            with open(os.path.join(self.data, name), 'w') as file:
+                file.write('a,b\n1,2\n')
+        self.socket = os.path.join(self.tmp.name, 'daemon.sock')
+        self.server = _make_server(self.socket, {self.data: True})
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def request(self, **message):
+        return client.request(message, self.socket, timeout=10)
+
+    def test_find(self):
+        self.assertEqual(self.request(op='ping'), 'pong')
+        expected = {os.path.join(self.data, 'EURUSD.csv'),
+                    os.path.join(self.data, 'eur', 'EURGBP.csv')}
+        self.assertEqual(set(self.request(op='find', name='EUR', ext='csv', name_type='isin')),
+                         expected)
+        self.assertEqual(self.request(op='find', name='GBP', ext='parquet'), [])
+
+        # the cached result follows the filesystem
+        with open(os.path.join(self.data, 'EURJPY.csv'), 'w') as file:
+            file.write('a,b\n')
+        expected.add(os.path.join(self.data, 'EURJPY.csv'))
+        self.assertEqual(set(self.request(op='find', name='EUR', ext='csv', name_type='isin')),
+                         expected)
+        self.assertEqual(len(self.request(op='find', name='EUR', ext='csv', name_type='isin',
+                                          size=[5, None])), 2)
+
+    def test_select_groupby(self):
+        selected = self.request(op='select_paths', name='*', ext='*', name_type='glob',
+                                ext_type='glob', pattern='eur', match_type='isin')
+        self.assertEqual(selected, [os.path.join(self.data, 'eur', 'EURGBP.csv')])
+        groups = self.request(op='groupby', name='*', ext='*', name_type='glob',
+                              ext_type='glob', by='ext')
+        self.assertEqual({k: len(v) for k, v in groups.items()}, {'.csv': 2, '.txt': 1})
+
+    def test_dirs_and_errors(self):
+        self.assertEqual(self.request(op='dirs'), {self.data: True})
+        self.assertEqual(self.request(op='del_dir', directory=self.data), {})
+        with self.assertRaises(RuntimeError):
+            self.request(op='find', name='EUR', ext='csv')
+        with self.assertRaises(RuntimeError):
+            self.request(op='unknown')
+        with self.assertRaises(OSError):
+            _make_server(self.socket, {})
+
+    def test_listing(self):
+        index = _Index({self.data: True})
+        with patch.object(PathFinder, 'find', wraps=index.finder.find) as find:
+            self.assertEqual(len(index.find('EUR', 'csv', 'isin')), 2)
+            # new queries, including ones without matches, filter the same listing
+            with patch('file_navigator.pathfinder.os.scandir', wraps=os.scandir) as scandir:
+                self.assertEqual(len(index.find('GBP', 'parquet')), 0)
+                self.assertEqual(len(index.find('*', '*', 'glob', 'glob', size=(5, None))), 3)
+                self.assertEqual(len(index.find('aud', 'txt', 'startswith', age=(0, None))), 1)
+                scandir.assert_not_called()
+            self.assertEqual(find.call_count, 1)
+        with open(os.path.join(self.data, 'GBP.parquet'), 'w') as file:
+            file.write('')
+        self.assertEqual(len(index.find('GBP', 'parquet')), 1)
+
+        empty = os.path.join(self.tmp.name, 'empty')
+        os.makedirs(empty)
+        self.assertEqual(len(_Index({empty: False}).find('*', '*', 'glob', 'glob')), 0)
+
+        # a slow scan doesn't hold the lock of the index
+        started, release = threading.Event(), threading.Event()
+        def slow_find(*args, **kwargs):
+            started.set()
+            release.wait(10)
+            return find(*args, **kwargs)
+        find = index.finder.find
+        with patch.object(index.finder, 'find', slow_find):
+            thread = threading.Thread(target=index.listing, kwargs={'archives': True})
+            thread.start()
+            self.assertTrue(started.wait(10))
+            self.assertEqual(index._register('add_dir', {'directory': empty}),
+                             {self.data: True, empty: False})
+            self.assertEqual(len(index.find('GBP', 'parquet')), 1)
+            release.set()
+            thread.join(10)
+        # the listing of the replaced registry isn't kept
+        self.assertEqual(list(index._listings), [(False, False)])
+
+    def test_cli(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = client.main(['--socket', self.socket, 'find', 'audcad', 'txt'])
+        self.assertEqual(status, 0)
+        self.assertEqual(output.getvalue(), os.path.join(self.data, 'audcad.txt') + '\n')
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(client.main(['--socket', self.socket + '.missing', 'ping']), 1)
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(TestDaemon('test_find'))
+    suite.addTest(TestDaemon('test_select_groupby'))
+    suite.addTest(TestDaemon('test_dirs_and_errors'))
+    suite.addTest(TestDaemon('test_listing'))
+    suite.addTest(TestDaemon('test_cli'))
+    return suite
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
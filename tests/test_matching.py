@@ -0,0 +1,80 @@
+import unittest
+import tempfile
+from pathlib import Path
+from file_navigator import PathFinder, matching
+from file_navigator.pathfinder import _PathManager
+
+class TestMatching(unittest.TestCase):
+
+    def test_match_many(self):
+        strings = ['EURGBP_H4', 'eurgbp', 'Forex', '20220817', 'eurgpb']
+        args = [
+            ('eq', 'eurgbp'),
+            ('isin', 'GBP'),
+            ('regex', '^eur'),
+            ('ieq', 'EURGBP'),
+            ('iisin', 'gbp'),
+            ('iregex', '^eur'),
+            ('fnmatch', 'EUR*'),
+            ('ifnmatch', 'eur*_h4'),
+            ('startswith', 'F'),
+            ('endswith', 'H4'),
+            ('fuzzy', 'eurgbp'),
+            ('range', '20000101:')
+            ]
+        expected = {
+            ('eq', 'eurgbp'): ['eurgbp'],
+            ('isin', 'GBP'): ['EURGBP_H4'],
+            ('regex', '^eur'): ['eurgbp', 'eurgpb'],
+            ('ieq', 'EURGBP'): ['eurgbp'],
+            ('iisin', 'gbp'): ['EURGBP_H4', 'eurgbp'],
+            ('iregex', '^eur'): ['EURGBP_H4', 'eurgbp', 'eurgpb'],
+            ('fnmatch', 'EUR*'): ['EURGBP_H4'],
+            ('ifnmatch', 'eur*_h4'): ['EURGBP_H4'],
+            ('startswith', 'F'): ['Forex'],
+            ('endswith', 'H4'): ['EURGBP_H4'],
+            ('fuzzy', 'eurgbp'): ['eurgbp', 'eurgpb'],
+            ('range', '20000101:'): ['20220817']
+            }
+        for arg in args:
+            with self.subTest(arg = arg):
+                matcher = matching.get_matcher(arg[0])
+                mask = matcher.match_many(strings, arg[1])
+                self.assertEqual([s for s, m in zip(strings, mask) if m], expected[arg])
+                self.assertEqual([matcher(s, arg[1]) for s in strings], mask)
+
+    def test_register(self):
+        matching.register('even', lambda string, pattern: len(string) % 2 == int(pattern))
+        self.addCleanup(matching.unregister, 'even')
+        self.assertIn('even', matching.available())
+        with self.assertRaises(ValueError):
+            matching.register('even', matching.FunctionMatcher(len))
+        with self.assertRaises(TypeError):
+            matching.get_matcher(3)
+        with self.assertRaises(ValueError):
+            matching.get_matcher('odd')
+
+        pm = _PathManager([(r"C:\mock_directory", 'ab.csv'), (r"C:\mock2", 'abc.csv')])
+        self.assertEqual(pm.select_paths('0', 'even').paths, [('abc.csv', r"C:\mock2")])
+        self.assertEqual(pm.select_paths(r"C:\mock_", 'startswith').paths,
+                         [('ab.csv', r"C:\mock_directory")])
+        self.assertCountEqual(pm.groupby('name', '1', 'even'), [True, False])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for f in ('Forex.XLSX', 'forex.csv', 'euro.csv'):
+                Path(tmp, f).touch()
+            pf = PathFinder({tmp: False})
+            self.assertCountEqual([p[0] for p in pf.find('FOREX', 'xlsx', 'ieq', 'ieq').paths],
+                                  ['Forex.XLSX'])
+            self.assertCountEqual([p[0] for p in pf.find('1', 'csv', 'even').paths],
+                                  ['forex.csv'])
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(TestMatching('test_match_many'))
+    suite.addTest(TestMatching('test_register'))
+    return suite
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
@@ -1,7 +1,18 @@
 import unittest
-from file_navigator import PathFinder
+import asyncio
+import json
+import os
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from file_navigator import PathFinder, Q, BaseLoader, matching
+from file_navigator.archive import _archive_members, _open_member
+from file_navigator.pathfinder import _claim, _read_checkpoint, _run_isolated
 from pathlib import Path
 from unittest.mock import patch
+from functools import partial
 from itertools import chain
 
 class TestPathFinder(unittest.TestCase):
@@ -96,6 +107,59 @@ class TestPathFinder(unittest.TestCase):
                     pf.add_dirs(arg[1])
         
 
+    @patch('file_navigator.pathfinder.os.path.isdir')
+    def test_add_dirs_sibling_names(self, mock_isdir):
+        mock_isdir.return_value = True
+        pf = PathFinder({"/data/a": True})
+        pf.add_dirs({"/data/ab": True, "/data/abc/a": False})
+        self.assertEqual(pf.directories, {"/data/a": True,
+                                          "/data/ab": True,
+                                          "/data/abc/a": False})
+        with self.assertRaises(ValueError):
+            pf.add_dir("/data/a/b", False)
+        with self.assertRaises(ValueError):
+            pf.add_dir("/data", True)
+
+    @patch('file_navigator.pathfinder.os.path.isdir')
+    def test_add_dirs_after_del_dirs(self, mock_isdir):
+        mock_isdir.return_value = True
+        pf = PathFinder({"/data/a": True})
+        with self.assertRaises(ValueError):
+            pf.add_dir("/data/a/b", False)
+        pf.del_dir("/data/a")
+        pf.add_dir("/data/a/b", False)
+        pf.add_dir("/data/a", False)
+        self.assertEqual(pf.directories, {"/data/a/b": False, "/data/a": False})
+
+    @patch('file_navigator.pathfinder.os.path.isdir')
+    def test_del_dirs_after_chdir(self, mock_isdir):
+        mock_isdir.return_value = True
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            try:
+                os.chdir(first)
+                pf = PathFinder({"rel": True})
+                os.chdir(second)
+                pf.del_dir("rel")
+                self.assertEqual(pf.directories, {})
+                self.assertEqual(pf.directories._root.children, {})
+                pf.add_dir("rel", True)
+                pf.add_dir(os.path.join(first, "rel", "sub"), False)
+            finally:
+                os.chdir(cwd)
+
+    @patch('file_navigator.pathfinder.os.path.isdir')
+    def test_add_dirs_bulk(self, mock_isdir):
+        mock_isdir.return_value = True
+        directories = {f"/bulk/{i % 100}/{i}": bool(i % 2) for i in range(20000)}
+        pf = PathFinder(directories)
+        self.assertEqual(len(pf.directories), 20000)
+        with self.assertRaises(ValueError):
+            pf.add_dir("/bulk/7", True)
+        pf.del_dirs([f"/bulk/7/{i}" for i in range(7, 20000, 100)])
+        pf.add_dir("/bulk/7", True)
+        self.assertTrue(pf.directories["/bulk/7"])
+
     @patch('file_navigator.pathfinder.os.path.isdir')     
     def test_del_dirs_iterable_arg(self, mock_isdir):
         directories =  {"/folder1": True,
@@ -254,6 +318,431 @@ class TestPathFinder(unittest.TestCase):
                 result = [p[0] for p in pf.find(*arg).paths]
                 self.assertCountEqual(result, expected[arg])
     
+    def test_find_processes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(6):
+                sub = os.path.join(tmp, f'sub{i}', 'nested')
+                os.makedirs(sub)
+                for f in ('EURGBP_H4.csv', 'audcad.txt', f'file{i}.csv'):
+                    Path(sub, f).touch()
+                    Path(tmp, f'sub{i}', f).touch()
+            Path(tmp, 'top.csv').touch()
+            
+            pf = PathFinder({tmp: True})
+            sequential = pf.find('.*', 'csv', 'regex', 'eq')
+            parallel = pf.find('.*', 'csv', 'regex', 'eq', processes=2)
+            self.assertEqual(len(parallel), 25)
+            self.assertCountEqual(parallel.paths, sequential.paths)
+            with self.assertRaises(ValueError):
+                pf.find('.*', 'csv', 'regex', 'eq', processes=0)
+
+    def test_find_stat(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'sub'))
+            for i, f in enumerate(('small.csv', 'large.csv', os.path.join('sub', 'old.csv'))):
+                Path(tmp, f).write_bytes(b'x' * 10 ** i)
+            old = os.path.join(tmp, 'sub', 'old.csv')
+            os.utime(old, (0, 86400))
+            
+            pf = PathFinder({tmp: True})
+            result = [p[0] for p in pf.find('*', 'csv', 'glob', size=(5, None)).paths]
+            self.assertCountEqual(result, ['large.csv', 'old.csv'])
+            result = [p[0] for p in pf.find('*', 'csv', 'glob', age=(None, 3600)).paths]
+            self.assertCountEqual(result, ['small.csv', 'large.csv'])
+            result = pf.find('*', 'csv', 'glob', mtime=(None, 86400), processes=2)
+            self.assertEqual(result.paths, [('old.csv', os.path.join(tmp, 'sub'))])
+            with patch('file_navigator.pathfinder.os.stat') as mock_stat:
+                result = pf.find('*', 'csv', 'glob', stat=True).select_paths(size=(None, 10))
+                mock_stat.assert_not_called()
+            self.assertCountEqual([p[0] for p in result.paths], ['small.csv', 'large.csv'])
+            with self.assertRaises(TypeError):
+                pf.find('*', 'csv', 'glob', size=5)
+
+    def test_refresh(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            sub = os.path.join(tmp, 'sub')
+            os.makedirs(sub)
+            for f in ('a.csv', 'b.txt', os.path.join('sub', 'c.csv'), os.path.join('sub', 'd.csv')):
+                Path(tmp, f).touch()
+
+            pf = PathFinder({tmp: True})
+            result = pf.find('*', 'csv', 'glob', track=True)
+            self.assertEqual(len(result), 3)
+            Path(sub, 'e.csv').touch()
+            os.remove(os.path.join(sub, 'd.csv'))
+            os.utime(sub, ns=(0, os.stat(sub).st_mtime_ns + 10 ** 9))
+
+            with patch('file_navigator.pathfinder.os.scandir', wraps=os.scandir) as mock_scandir:
+                refreshed, added, removed = result.refresh()
+                mock_scandir.assert_called_once_with(sub)
+            self.assertCountEqual([p[0] for p in refreshed.paths], ['a.csv', 'c.csv', 'e.csv'])
+            self.assertEqual(added.paths, [('e.csv', sub)])
+            self.assertEqual(removed.paths, [('d.csv', sub)])
+            self.assertEqual(refreshed.refresh()[1:], (None, None))
+
+            os.makedirs(os.path.join(tmp, 'new', 'nested'))
+            Path(tmp, 'new', 'nested', 'f.csv').touch()
+            os.utime(tmp, ns=(0, os.stat(tmp).st_mtime_ns + 10 ** 9))
+            _, added, removed = refreshed.refresh()
+            self.assertEqual(added.paths, [('f.csv', os.path.join(tmp, 'new', 'nested'))])
+            self.assertIsNone(removed)
+
+            untracked = pf.find('*', 'csv', 'glob')
+            self.assertCountEqual(untracked.refresh()[0].paths, refreshed.refresh()[0].paths)
+            with self.assertRaises(ValueError):
+                untracked.select_paths(tmp).refresh()
+
+            # deleting every match leaves an empty result that keeps following the filesystem
+            matches = pf.find('a', 'csv', track=True)
+            os.remove(os.path.join(tmp, 'a.csv'))
+            os.utime(tmp, ns=(0, os.stat(tmp).st_mtime_ns + 2 * 10 ** 9))
+            empty, added, removed = matches.refresh()
+            self.assertEqual((len(empty), added, removed.paths), (0, None, [('a.csv', tmp)]))
+            Path(tmp, 'a.csv').touch()
+            os.utime(tmp, ns=(0, os.stat(tmp).st_mtime_ns + 3 * 10 ** 9))
+            refreshed, added, removed = empty.refresh()
+            self.assertEqual((refreshed.paths, added.paths, removed),
+                             ([('a.csv', tmp)], [('a.csv', tmp)], None))
+
+    def test_snapshot_diff(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data = os.path.join(tmp, 'data')
+            os.makedirs(os.path.join(data, 'sub'))
+            for f in ('a.csv', 'b.csv', 'c.txt', os.path.join('sub', 'd.csv')):
+                Path(data, f).write_bytes(b'x')
+
+            pf = PathFinder({data: True})
+            old_path = os.path.join(tmp, 'old.fnss')
+            old = pf.snapshot(Q.ext('csv'), old_path, inode=True, chunk_size=2)
+            self.assertEqual(len(old), 3)
+            self.assertEqual([r[:2] for r in old], [(data, 'a.csv'), (data, 'b.csv'),
+                                                    (os.path.join(data, 'sub'), 'd.csv')])
+            self.assertEqual(sorted(os.listdir(tmp)), ['data', 'old.fnss'])
+
+            os.remove(os.path.join(data, 'a.csv'))
+            Path(data, 'b.csv').write_bytes(b'xx')
+            Path(data, 'sub', 'e.csv').touch()
+            new = pf.snapshot(Q.ext('csv'), inode=True)
+            added, removed, modified = pf.diff(old_path, new)
+            self.assertEqual(added.paths, [('e.csv', os.path.join(data, 'sub'))])
+            self.assertEqual(removed.paths, [('a.csv', data)])
+            self.assertEqual(modified.paths, [('b.csv', data)])
+            self.assertEqual(pf.diff(new, new), (None, None, None))
+            self.assertEqual(len(pf.snapshot()), 4)
+
+            temporary = new.path
+            del new
+            self.assertFalse(os.path.exists(temporary))
+            with self.assertRaises(ValueError):
+                pf.diff(os.path.join(data, 'c.txt'), old)
+
+    def test_stream(self):
+        loader = BaseLoader({lambda path: Path(path).read_text(): '.csv'})
+        with tempfile.TemporaryDirectory() as tmp:
+            data = os.path.join(tmp, 'data')
+            os.makedirs(data)
+            checkpoint = os.path.join(tmp, 'stream.json')
+            Path(data, 'a.csv').write_text('a')
+            Path(data, 'a.txt').write_text('a')
+            pf = PathFinder({data: False})
+            stream = lambda polls, settle = 1: list(pf.stream(
+                '*', 'csv', 'glob', loader=loader, interval=0.01, settle=settle,
+                checkpoint=checkpoint, polls=polls))
+
+            self.assertEqual(stream(2), [(('a.csv', data), 'a')])
+            self.assertEqual(stream(2), [])
+            Path(data, 'b.csv').write_text('b')
+            self.assertEqual(stream(1), [])
+            Path(data, 'b.csv').write_text('bb')
+            self.assertEqual(stream(1), [])
+            self.assertEqual(stream(1), [(('b.csv', data), 'bb')])
+            Path(data, 'c.csv').write_text('c')
+            with patch('file_navigator.pathfinder.os.scandir', wraps=os.scandir) as mock_scandir:
+                self.assertEqual(stream(1, 0), [(('c.csv', data), 'c')])
+                self.assertEqual(stream(1, 0), [])
+                mock_scandir.assert_called_once_with(data)
+
+            # idle polls append nothing to the checkpoint
+            with patch('file_navigator.pathfinder._append_checkpoint') as mock_append:
+                self.assertEqual(stream(3, 0), [])
+                self.assertEqual([c[0][1] for c in mock_append.call_args_list], [[], [], []])
+            processed, pending, _ = _read_checkpoint(checkpoint)
+            self.assertEqual(processed, {(data, n) for n in ('a.csv', 'b.csv', 'c.csv')})
+            self.assertEqual(pending, {})
+
+            # checkpoints of the previous format are still read
+            with open(checkpoint, 'w') as file:
+                json.dump({'version': 1, 'processed': [[data, 'a.csv']], 'pending': [],
+                           'mtimes': None}, file)
+            self.assertEqual(sorted(stream(1, 0)), [(('b.csv', data), 'bb'), (('c.csv', data), 'c')])
+
+            with self.assertRaises(TypeError):
+                next(pf.stream('*', 'csv', 'glob', loader=len))
+            with self.assertRaises(ValueError):
+                next(pf.stream('*', 'csv', 'glob', loader=loader, settle=-1))
+
+    def test_afind(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(3):
+                os.makedirs(os.path.join(tmp, f'sub{i}', 'nested'))
+                for f in ('a.csv', 'b.txt', os.path.join('nested', 'c.csv')):
+                    Path(tmp, f'sub{i}', f).write_bytes(b'x' * i)
+            pf = PathFinder({tmp: True})
+            loop = asyncio.new_event_loop()
+            self.addCleanup(loop.close)
+
+            result = loop.run_until_complete(pf.afind('*', 'csv', 'glob', limit=2))
+            self.assertCountEqual(result.paths, pf.find('*', 'csv', 'glob').paths)
+            result = loop.run_until_complete(pf.afind(Q.ext('csv') & Q.size(min=1), stat=True))
+            self.assertEqual(len(result), 4)
+            self.assertEqual(len(result._stats), 4)
+
+            async def first(buffer):
+                found = pf.aiter_find('*', 'csv', 'glob', buffer=buffer)
+                try:
+                    return await found.__anext__()
+                finally:
+                    await found.aclose()
+            with patch('file_navigator.pathfinder.os.scandir', wraps=os.scandir) as mock_scandir:
+                self.assertEqual(loop.run_until_complete(first(1))[0], 'a.csv')
+                self.assertLess(mock_scandir.call_count, 7)
+
+            # the number of tasks doesn't grow with the number of directories
+            for i in range(40):
+                os.makedirs(os.path.join(tmp, 'wide', str(i)))
+                Path(tmp, 'wide', str(i), 'w.csv').touch()
+            tasks = []
+            def factory(loop, coro):
+                tasks.append(asyncio.Task(coro, loop=loop))
+                return tasks[-1]
+            loop.set_task_factory(factory)
+            result = loop.run_until_complete(pf.afind('*', 'csv', 'glob', limit=2))
+            loop.set_task_factory(None)
+            self.assertEqual(len(result), 46)
+            self.assertLess(len(tasks), 10)
+
+            with self.assertRaises(ValueError):
+                loop.run_until_complete(pf.afind('*', 'csv', 'glob', limit=0))
+            with self.assertRaises(ValueError):
+                loop.run_until_complete(PathFinder().afind('*', 'csv', 'glob'))
+
+    def test_find_timeout(self):
+        def slow(string, pattern):
+            if pattern in string:
+                time.sleep(1)
+            return True
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for d in ('fast', 'slow'):
+                os.makedirs(os.path.join(tmp, d))
+                Path(tmp, d, f'{d}.csv').touch()
+            pf = PathFinder({os.path.join(tmp, 'fast'): True, os.path.join(tmp, 'slow'): False})
+            query = Q.ext('csv') & Q.path('slow', matching.FunctionMatcher(slow))
+
+            start = time.monotonic()
+            result = pf.find(query, dir_timeout=0.2, track=True)
+            self.assertLess(time.monotonic() - start, 0.8)
+            self.assertEqual(result.paths, [('fast.csv', os.path.join(tmp, 'fast'))])
+            self.assertEqual(result.timed_out, (os.path.join(tmp, 'slow'),))
+            self.assertEqual(list(result._mtimes), [os.path.join(tmp, 'fast')])
+
+            result = pf.find(query, timeout=5)
+            self.assertEqual(len(result), 2)
+            self.assertEqual(result.timed_out, ())
+
+            pf.del_dir(os.path.join(tmp, 'fast'))
+            with self.assertRaises(TimeoutError):
+                pf.find(query, timeout=0.2)
+            with self.assertRaises(ValueError):
+                pf.find(query, timeout=0)
+            with self.assertRaises(ValueError):
+                pf.find(query, timeout=1, processes=2)
+
+    def test_refresh_timeout(self):
+        delay = [0]
+        def slow(string, pattern):
+            if pattern in string:
+                time.sleep(delay[0])
+            return True
+
+        with tempfile.TemporaryDirectory() as tmp:
+            fast, stalled = os.path.join(tmp, 'fast'), os.path.join(tmp, 'slow')
+            for d in (fast, stalled):
+                os.makedirs(d)
+                Path(d, 'a.csv').touch()
+            pf = PathFinder({fast: False, stalled: False})
+            query = Q.ext('csv') & Q.path('slow', matching.FunctionMatcher(slow))
+            result = pf.find(query, dir_timeout=0.5, track=True)
+            self.assertEqual(len(result), 2)
+
+            delay[0] = 1
+            time.sleep(0.01)
+            Path(fast, 'b.csv').touch()
+            Path(stalled, 'b.csv').touch()
+            start = time.monotonic()
+            refreshed, added, _ = result.refresh()
+            self.assertLess(time.monotonic() - start, 0.9)
+            self.assertEqual(refreshed.timed_out, (stalled,))
+            self.assertEqual(added.paths, [('b.csv', fast)])
+            self.assertIn(('a.csv', stalled), refreshed.paths)
+
+    def test_claim(self):
+        class SlowSet(set):
+            def __contains__(self, key):
+                found = super().__contains__(key)
+                time.sleep(0.05)
+                return found
+
+        visited, claimed = SlowSet(), []
+        threads = [threading.Thread(target=lambda: claimed.append(_claim(visited, (1, 2))))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        self.assertEqual(sorted(claimed), [False, False, False, True])
+        self.assertEqual(visited, {(1, 2)})
+
+    def test_run_isolated(self):
+        active, peak, lock = [0], [0], threading.Lock()
+        def task(seconds):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(seconds)
+            with lock:
+                active[0] -= 1
+            return seconds
+
+        results, timed_out = _run_isolated([partial(task, 0.05) for _ in range(6)], workers=2)
+        self.assertEqual(results, [(True, 0.05)] * 6)
+        self.assertEqual((peak[0], timed_out), (2, []))
+
+        ran = []
+        tasks = [partial(task, 1), partial(task, 0.01), lambda: ran.append(1)]
+        results, timed_out = _run_isolated(tasks, timeout=0.3, dir_timeout=0.2, workers=1)
+        self.assertEqual(timed_out, [0])
+        self.assertEqual(results[1:], [(True, 0.01), (True, None)])
+        results, timed_out = _run_isolated([partial(task, 1), ran.append], timeout=0.2,
+                                           workers=1)
+        self.assertEqual(timed_out, [0, 1])
+        time.sleep(1)
+        self.assertEqual(ran, [1])
+
+    def test_find_symlinks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'data', 'sub'))
+            os.makedirs(os.path.join(tmp, 'other'))
+            Path(tmp, 'data', 'sub', 'a.csv').touch()
+            Path(tmp, 'other', 'b.csv').touch()
+            os.link(os.path.join(tmp, 'data', 'sub', 'a.csv'), os.path.join(tmp, 'data', 'c.csv'))
+            os.symlink(os.path.join(tmp, 'data'), os.path.join(tmp, 'data', 'sub', 'loop'))
+            os.symlink(os.path.join(tmp, 'other'), os.path.join(tmp, 'data', 'link'))
+            pf = PathFinder({os.path.join(tmp, 'data'): True})
+
+            result = pf.find(Q.ext('csv'))
+            self.assertEqual(len(result), 2)
+
+            result = pf.find(Q.ext('csv'), follow_symlinks=True)
+            self.assertEqual(sorted(f for f, _ in result.paths), ['a.csv', 'b.csv', 'c.csv'])
+
+            result = pf.find(Q.ext('csv'), follow_symlinks=True, dedupe='inode')
+            files = {f for f, _ in result.paths}
+            self.assertEqual(len(result), 2)
+            self.assertIn('b.csv', files)
+            self.assertEqual(len(files & {'a.csv', 'c.csv'}), 1)
+
+            result = pf.find(Q.ext('csv'), follow_symlinks=True, processes=2)
+            self.assertEqual(len(result), 3)
+
+            # threads of an isolated scan claim a physical directory only once
+            alias = os.path.join(tmp, 'alias')
+            os.symlink(os.path.join(tmp, 'other'), alias)
+            roots, barrier, stat = {os.path.join(tmp, 'other'), alias}, threading.Barrier(2), os.stat
+            def synced_stat(path, *args, **kwargs):
+                if path in roots:
+                    barrier.wait(5)
+                return stat(path, *args, **kwargs)
+            pf = PathFinder(dict.fromkeys(roots, True))
+            with patch('file_navigator.pathfinder.os.stat', synced_stat):
+                result = pf.find(Q.ext('csv'), follow_symlinks=True, dir_timeout=10)
+            self.assertEqual([f for f, _ in result.paths], ['b.csv'])
+
+            with self.assertRaises(ValueError):
+                pf.find(Q.ext('csv'), dedupe='path')
+
+    def test_find_archives(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, 'plain.csv').write_text('a,b\n1,2\n')
+            with zipfile.ZipFile(os.path.join(tmp, 'bundle.zip'), 'w') as archive:
+                archive.writestr('eur/rates.csv', 'a,b\n3,4\n')
+                archive.writestr('notes.txt', 'x')
+            with tarfile.open(os.path.join(tmp, 'bundle.tar.gz'), 'w:gz') as archive:
+                source = Path(tmp, 'source.csv')
+                source.write_text('a,b\n5,6\n')
+                archive.add(str(source), arcname='./usd/rates.csv')
+                source.unlink()
+            pf = PathFinder({tmp: False})
+
+            self.assertEqual(pf.find(Q.ext('csv')).paths, [('plain.csv', tmp)])
+
+            result = pf.find(Q.ext('csv'), archives=True)
+            self.assertEqual(sorted(result.paths),
+                             [('plain.csv', tmp),
+                              ('rates.csv', os.path.join(tmp, 'bundle.tar.gz', 'usd')),
+                              ('rates.csv', os.path.join(tmp, 'bundle.zip', 'eur'))])
+            self.assertEqual(len(result.select_paths(Q.path('.zip', 'isin'))), 1)
+            self.assertEqual(len(result.select_paths(size=(8, 8))), 3)
+
+            loader = BaseLoader({lambda path: path.read().decode()
+                                 if hasattr(path, 'read') else Path(path).read_text(): '.csv'})
+            self.assertEqual(sorted(result.load(loader)),
+                             ['a,b\n1,2\n', 'a,b\n3,4\n', 'a,b\n5,6\n'])
+
+            result = pf.find(Q.name('rates') & Q.size(max=8), archives=True)
+            self.assertEqual(len(result), 2)
+
+            # indexed tar members are opened without scanning the headers again
+            path = os.path.join(tmp, 'many.tar')
+            with tarfile.open(path, 'w') as archive:
+                for i in range(5):
+                    source = Path(tmp, f'{i}.txt')
+                    source.write_text(str(i))
+                    archive.add(str(source), arcname=f'{i}.txt')
+                    source.unlink()
+            self.assertEqual(len(_archive_members(path)['']), 5)
+            with patch.object(tarfile.TarFile, '__iter__', side_effect=AssertionError):
+                for i in range(5):
+                    with _open_member(path, f'{i}.txt') as file:
+                        self.assertEqual(file.read(), str(i).encode())
+
+    def test_load_groups(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, size in (('a.csv', 1), ('b.csv', 30), ('c.txt', 20), ('d.txt', 10)):
+                Path(tmp, name).write_text('x' * size)
+            groups = PathFinder({tmp: False}).find('*', '*', 'glob', 'glob').groupby('ext')
+
+            order = []
+            def read(path):
+                order.append(os.path.basename(path))
+                return [Path(path).stat().st_size]
+            loader = BaseLoader({read: ['.csv', '.txt']})
+
+            result = PathFinder.load_groups(groups, loader, workers=1)
+            self.assertEqual(order, ['b.csv', 'c.txt', 'd.txt', 'a.csv'])
+            self.assertEqual(sorted(result['.csv']), [1, 30])
+            self.assertEqual(sorted(result['.txt']), [10, 20])
+
+            result = PathFinder.load_groups(groups, loader, concat=False)
+            self.assertEqual(sorted(result['.csv']), [[1], [30]])
+            result = PathFinder.load_groups(groups, loader, concat=len)
+            self.assertEqual(result, {'.csv': 2, '.txt': 2})
+
+            with self.assertRaises(TypeError):
+                PathFinder.load_groups(groups, BaseLoader({len: ['.csv', '.txt']}))
+            with self.assertRaises(TypeError):
+                PathFinder.load_groups(groups, read)
+
     def test_empty_find(self):
         pf = PathFinder()
         with self.assertRaises(ValueError):
@@ -271,11 +760,28 @@ def suite():
     suite.addTest(TestPathFinder('test_init_bad_arg_5'))
     suite.addTest(TestPathFinder('test_init_bad_arg_6'))
     suite.addTest(TestPathFinder('test_add_dirs'))
+    suite.addTest(TestPathFinder('test_add_dirs_sibling_names'))
+    suite.addTest(TestPathFinder('test_add_dirs_after_del_dirs'))
+    suite.addTest(TestPathFinder('test_del_dirs_after_chdir'))
+    suite.addTest(TestPathFinder('test_add_dirs_bulk'))
     suite.addTest(TestPathFinder('test_del_dirs_iterable_arg'))
     suite.addTest(TestPathFinder('test_del_dirs_bad_arg'))
     suite.addTest(TestPathFinder('test_find_arg_validation'))
     suite.addTest(TestPathFinder('test_find_nested_dir'))
     suite.addTest(TestPathFinder('test_find_flat_dir'))
+    suite.addTest(TestPathFinder('test_find_processes'))
+    suite.addTest(TestPathFinder('test_find_stat'))
+    suite.addTest(TestPathFinder('test_refresh'))
+    suite.addTest(TestPathFinder('test_snapshot_diff'))
+    suite.addTest(TestPathFinder('test_stream'))
+    suite.addTest(TestPathFinder('test_afind'))
+    suite.addTest(TestPathFinder('test_find_timeout'))
+    suite.addTest(TestPathFinder('test_refresh_timeout'))
+    suite.addTest(TestPathFinder('test_claim'))
+    suite.addTest(TestPathFinder('test_run_isolated'))
+    suite.addTest(TestPathFinder('test_find_symlinks'))
+    suite.addTest(TestPathFinder('test_find_archives'))
+    suite.addTest(TestPathFinder('test_load_groups'))
     suite.addTest(TestPathFinder('test_empty_find'))
     return suite
 
@@ -1,6 +1,15 @@
 import unittest
-from file_navigator.pathfinder import _PathManager
+import asyncio
+import gc
+import os
+import threading
+import time
+import tempfile
+from datetime import datetime, timedelta
+from file_navigator.pathfinder import PathFinder, _PathManager, _FileStat
 from file_navigator.abc_loader import ABLoader
+from file_navigator.loaders import PDLoader
+from file_navigator.telemetry import LoadTelemetry
 
 class Test_PathManager(unittest.TestCase):
        
@@ -60,6 +69,151 @@ class Test_PathManager(unittest.TestCase):
         
 
     
+    def test_select_paths_stat(self):
+        now = datetime.now().timestamp()
+        mock_stats = {
+            (r"C:\mock_directory", 'Forex.xlsx'): _FileStat(2048, now - 60, now - 60, 1, 1),
+            (r"C:\mock_directory", 'audcad.txt'): _FileStat(10, now - 7200, now - 7200, 2, 1),
+            (r"C:\mock_directory\CURR", 'EURGBP_H4.csv'): _FileStat(512, 0.0, 0.0, 3, 1)
+            }
+        pm = _PathManager(list(mock_stats), mock_stats)
+        args = [
+            {'size': (100, None)},
+            {'age': (None, timedelta(hours=1))},
+            {'mtime': (datetime(2000, 1, 1), None), 'size': (None, 100)},
+            {'pattern': r"C:\mock_directory", 'ctime': (1.0, None)}
+            ]
+        expected = [
+            ['Forex.xlsx', 'EURGBP_H4.csv'],
+            ['Forex.xlsx'],
+            ['audcad.txt'],
+            ['Forex.xlsx', 'audcad.txt']
+            ]
+        for arg, exp in zip(args, expected):
+            with self.subTest(arg = arg):
+                self.assertCountEqual([p[0] for p in pm.select_paths(**arg).paths], exp)
+        self.assertIs(pm.select_paths(size=(0, None))._stats, mock_stats)
+
+    def test_top(self):
+        mock_stats = {
+            (r"C:\mock_directory\EUR", 'eurgbp.txt'): _FileStat(30, 5.0, 5.0, 1, 1),
+            (r"C:\mock_directory\EUR", 'eurjpy.txt'): _FileStat(10, 7.0, 7.0, 2, 1),
+            (r"C:\mock_directory\EUR", 'eurchf.txt'): _FileStat(20, 1.0, 1.0, 3, 1),
+            (r"C:\mock_directory\USD", 'usdjpy.txt'): _FileStat(40, 3.0, 3.0, 4, 1),
+            (r"C:\mock_directory\USD", 'usdpln.txt'): _FileStat(50, 9.0, 9.0, 5, 1)
+            }
+        pm = _PathManager(list(mock_stats), mock_stats)
+        args = [
+            (2, 'mtime', True),
+            (2, 'size', False),
+            (1, 'name', True),
+            (10, 'size', True)
+            ]
+        expected = [
+            ['usdpln.txt', 'eurjpy.txt'],
+            ['eurjpy.txt', 'eurchf.txt'],
+            ['usdpln.txt'],
+            ['usdpln.txt', 'usdjpy.txt', 'eurgbp.txt', 'eurchf.txt', 'eurjpy.txt']
+            ]
+        for arg, exp in zip(args, expected):
+            with self.subTest(arg = arg):
+                self.assertEqual([p[0] for p in pm.top(*arg).paths], exp)
+        result = {k: [p[0] for p in v.paths] for k, v in pm.top_by('path', 1).items()}
+        self.assertEqual(result, {r"C:\mock_directory\EUR": ['eurjpy.txt'],
+                                  r"C:\mock_directory\USD": ['usdpln.txt']})
+        with self.assertRaises(ValueError):
+            pm.top(0)
+        with self.assertRaises(ValueError):
+            pm.top(1, by='atime')
+
+    def test_duplicates(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            contents = {
+                'a.bin': b'x' * 10000 + b'1',
+                'b.bin': b'x' * 10000 + b'1',
+                'c.bin': b'x' * 5000 + b'y' + b'x' * 4999 + b'1',
+                'd.bin': b'short',
+                'e.bin': b'short',
+                'f.bin': b'other',
+                'g.bin': b'',
+                'h.bin': b''
+                }
+            for f, content in contents.items():
+                with open(os.path.join(tmp, f), 'wb') as file:
+                    file.write(content)
+            pm = _PathManager([(tmp, f) for f in contents])
+            result = [sorted(p[0] for p in g.paths) for g in pm.duplicates(workers=2, sample=64)]
+            self.assertCountEqual(result, [['a.bin', 'b.bin'], ['d.bin', 'e.bin'],
+                                           ['g.bin', 'h.bin']])
+
+            # files removed after the paths were found are skipped
+            os.remove(os.path.join(tmp, 'a.bin'))
+            pm = _PathManager([(tmp, f) for f in contents])
+            result = [sorted(p[0] for p in g.paths) for g in pm.duplicates(sample=64)]
+            self.assertCountEqual(result, [['d.bin', 'e.bin'], ['g.bin', 'h.bin']])
+
+    def test_save_open(self):
+        mock_stats = {
+            (r"C:\mock_directory\EUR", 'eurgbp.txt'): _FileStat(30, 5.5, 5.0, 1, 1),
+            (r"C:\mock_directory\EUR", 'eurjpy.txt'): _FileStat(10, 7.0, 7.0, 2, 1),
+            (r"C:\mock_directory\ŻÓŁW", 'żółw €.csv'): _FileStat(0, 1.0, 1.0, 3, 2)
+            }
+        pm = _PathManager(list(mock_stats), mock_stats)
+        with tempfile.TemporaryDirectory() as tmp:
+            for stat in (True, False):
+                with self.subTest(stat = stat):
+                    path = os.path.join(tmp, f'paths_{stat}.fnpm')
+                    pm.save(path, stat)
+                    opened = _PathManager.open(path)
+                    self.assertEqual(len(opened), 3)
+                    self.assertEqual(opened.paths, pm.paths)
+                    self.assertEqual([p[0] for p in opened.select_paths(
+                        r"C:\mock_directory\EUR").paths], ['eurgbp.txt', 'eurjpy.txt'])
+                    if stat:
+                        self.assertEqual(dict(opened._stats), mock_stats)
+                        self.assertEqual(opened.top(1, 'size').paths, [('eurgbp.txt',
+                                         r"C:\mock_directory\EUR")])
+                    else:
+                        self.assertEqual(opened._stats, {})
+                    del opened
+            (pm - pm).save(os.path.join(tmp, 'empty.fnpm'))
+            self.assertEqual(len(_PathManager.open(os.path.join(tmp, 'empty.fnpm'))), 0)
+            with open(os.path.join(tmp, 'bad.fnpm'), 'wb') as file:
+                file.write(b'x' * 64)
+            with self.assertRaises(ValueError):
+                _PathManager.open(os.path.join(tmp, 'bad.fnpm'))
+
+    def test_set_operations(self):
+        mock_dir = r"C:\mock_directory"
+        left = _PathManager([(mock_dir, 'eurgbp.txt'), (mock_dir, 'eurjpy.txt'),
+                             (mock_dir, 'eurpln.txt')],
+                            {(mock_dir, f): _FileStat(1, 1.0, 1.0, i, 1) for i, f in
+                             enumerate(['eurgbp.txt', 'eurjpy.txt', 'eurpln.txt'])})
+        right = _PathManager([(mock_dir, 'eurpln.txt'), (mock_dir, 'gbpcad.txt')],
+                             {(mock_dir, 'gbpcad.txt'): _FileStat(2, 2.0, 2.0, 2, 1)})
+
+        self.assertEqual([p[0] for p in (left | right).paths],
+                         ['eurgbp.txt', 'eurjpy.txt', 'eurpln.txt', 'gbpcad.txt'])
+        self.assertEqual((left & right).paths, [('eurpln.txt', mock_dir)])
+        self.assertEqual([p[0] for p in left - right], ['eurgbp.txt', 'eurjpy.txt'])
+        self.assertEqual((left | right).top(1, 'size').paths, [('gbpcad.txt', mock_dir)])
+
+        self.assertIn(('eurjpy.txt', mock_dir), left)
+        self.assertIn(os.path.join(mock_dir, 'eurjpy.txt'), left)
+        self.assertNotIn(('gbpcad.txt', mock_dir), left)
+        self.assertNotIn(3, left)
+
+        # empty results are routine and compose like any other result
+        empty = left - left
+        self.assertEqual((len(empty), empty.paths), (0, []))
+        self.assertEqual(len(left & _PathManager((mock_dir, 'usdjpy.txt'))), 0)
+        self.assertEqual((empty | right).paths, right.paths)
+        self.assertEqual((right - empty).paths, right.paths)
+        self.assertNotIn(('eurjpy.txt', mock_dir), empty)
+        self.assertEqual((len(empty.top(1)), empty.groupby('ext')), (0, {}))
+        with self.assertRaises(TypeError):
+            left | [(mock_dir, 'gbpcad.txt')]
+
     def test_groupby(self):
         mock_dir = r"C:\mock_directory"        
         mock_files = ['Forex.xlsx','EURGBP_H4.csv','EURGBP_M5.csv',
@@ -395,6 +549,76 @@ class Test_PathManager(unittest.TestCase):
         pm = _PathManager(mock_paths)
         self.assertCountEqual(pm.load(MockLoader(), **kwargs), expected)
         
+    def test_load_lazy(self):
+
+        class CountingLoader(ABLoader):
+            def __init__(self):
+                self.calls = []
+
+            def load(self, path, **kwargs):
+                self.calls.append(path)
+                return f"{path} with {kwargs}"
+
+        loader = CountingLoader()
+        pm = _PathManager([('dir', 'a.csv'), ('dir', 'b.csv'), ('dir', 'c.csv')])
+        handles = pm.load_lazy(loader, key1='value1')
+        self.assertEqual(len(handles), 3)
+        self.assertEqual(loader.calls, [])
+        self.assertFalse(handles[1].loaded)
+
+        path = os.path.join('dir', 'b.csv')
+        self.assertEqual(handles[1].path, path)
+        self.assertEqual(handles[1].load(), f"{path} with {{'key1': 'value1'}}")
+        self.assertEqual(handles[1].load(), f"{path} with {{'key1': 'value1'}}")
+        self.assertTrue(handles[1].loaded)
+        self.assertEqual(loader.calls, [path])
+
+        handles[1].release()
+        self.assertFalse(handles[1].loaded)
+        handles[1].load()
+        self.assertEqual(loader.calls, [path, path])
+        with self.assertRaises(TypeError):
+            pm.load_lazy(None)
+
+        # load forwards every keyword argument to the loader
+        self.assertEqual(pm.load(loader, lazy=True)[1], f"{path} with {{'lazy': True}}")
+
+    def test_load_telemetry(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, content in (('a.csv', 'x\n1\n2\n'), ('b.csv', 'x\n3\n'), ('c.txt', 'x\n4\n')):
+                with open(os.path.join(tmp, name), 'w') as file:
+                    file.write(content)
+            pm = _PathManager([(tmp, 'a.csv'), (tmp, 'b.csv'), (tmp, 'c.txt')])
+            telemetry = LoadTelemetry()
+            PDLoader.telemetry = telemetry
+            self.addCleanup(setattr, PDLoader, 'telemetry', None)
+            objects = pm.load(PDLoader)
+            self.assertEqual([len(df) for df in objects], [2, 1, 1])
+            self.assertEqual([r.size for r in telemetry.records], [6, 4, 4])
+            self.assertEqual({r.function for r in telemetry.records}, {'_read_csv'})
+            summary = telemetry.summary()
+            self.assertEqual(summary.loc['.csv', 'files'], 2)
+            self.assertEqual(summary.loc['.csv', 'size'], 10)
+
+            # results of the loader cache are not recorded
+            pm.load(PDLoader)
+            self.assertEqual(len(telemetry), 3)
+            handles = pm.load_lazy(PDLoader, nrows=1)
+            handles[0].load()
+            self.assertEqual(len(telemetry), 4)
+
+        class EchoLoader(ABLoader):
+            def load(self, path, **kwargs):
+                return kwargs
+
+        # other loaders are measured when they have a telemetry attribute
+        loader = EchoLoader()
+        pm = _PathManager([('dir', 'a.csv')])
+        self.assertEqual(pm.load(loader, telemetry='metrics'), [{'telemetry': 'metrics'}])
+        loader.telemetry = telemetry
+        self.assertEqual(pm.load(loader), [{}])
+        self.assertEqual(telemetry.records[-1].function, 'EchoLoader.load')
+
     def test_load_bad_loader(self):
         
         class MockLoader:
@@ -407,15 +631,137 @@ class Test_PathManager(unittest.TestCase):
         with self.assertRaises(TypeError):
             pm.load(MockLoader(), **kwargs)
         
+    def test_schemas(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            contents = {'a.csv': 'x,y\n1,2\n', 'b.csv': 'x,y\n3,4\n',
+                        'c.csv': 'x,y\n1.5,a\n', 'd.txt': 'x;y\n1;2\n', 'e.json': '{}'}
+            for name, content in contents.items():
+                with open(os.path.join(tmp, name), 'w') as file:
+                    file.write(content)
+            pm = _PathManager([(tmp, name) for name in sorted(contents)])
+
+            groups = pm.schemas(PDLoader, nrows=10)
+            self.assertEqual(len(groups), 4)
+            self.assertEqual(groups[(('x', 'int64'), ('y', 'int64'))].paths,
+                             [('a.csv', tmp), ('b.csv', tmp)])
+            self.assertEqual(groups[None].paths, [('e.json', tmp)])
+            groups = pm.schemas(PDLoader, sep=';')
+            self.assertEqual(groups[(('x', 'int64'), ('y', 'int64'))].paths, [('d.txt', tmp)])
+            self.assertEqual(len(groups), 3)
+
+            class MockLoader(ABLoader):
+                def load(self, path):
+                    return path
+
+            with self.assertRaises(NotImplementedError):
+                pm.schemas(MockLoader())
+            with self.assertRaises(TypeError):
+                pm.schemas(None)
+
+    def test_load_compact(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, 'a.csv'), 'w') as file:
+                file.write('city,count,price\n')
+                for i in range(200):
+                    file.write(f'{"Paris" if i % 2 else "Rome"},{i},{i / 3}\n')
+            pm = _PathManager([(tmp, 'a.csv')])
+
+            objects, report = pm.load_compact(PDLoader, sample=50, float32=True)
+            df = objects[0]
+            self.assertEqual(len(df), 200)
+            self.assertEqual(str(df['city'].dtype), 'category')
+            self.assertEqual(str(df['count'].dtype), 'uint8')
+            self.assertEqual(str(df['price'].dtype), 'float32')
+            self.assertGreater(report.saved, 0)
+            self.assertEqual(report.spilled, 0)
+
+            with self.assertRaises(MemoryError):
+                pm.load_compact(PDLoader, budget=100)
+            objects, report = pm.load_compact(PDLoader, budget=100, spill=tmp)
+            self.assertEqual(objects[0].num_rows, 200)
+            self.assertEqual(report.spilled, report.compacted)
+            spilled = [f for f in os.listdir(tmp) if f.endswith('.feather')]
+            self.assertEqual(len(spilled), 1)
+            del objects
+            gc.collect()
+            self.assertFalse(os.path.exists(os.path.join(tmp, spilled[0])))
+            with self.assertRaises(TypeError):
+                pm.load_compact(None)
+            with self.assertRaises(ValueError):
+                pm.load_compact(PDLoader, budget=0)
+
+
+    def test_aload(self):
+        class SlowLoader(ABLoader):
+            def __init__(self):
+                self.active = self.peak = 0
+                self.lock = threading.Lock()
+
+            def load(self, path, **kwargs):
+                with self.lock:
+                    self.active += 1
+                    self.peak = max(self.peak, self.active)
+                time.sleep(0.01)
+                with self.lock:
+                    self.active -= 1
+                return os.path.basename(path) + kwargs.get('suffix', '')
+
+        files = [f'{i}.csv' for i in range(10)]
+        pm = _PathManager([(r"C:\mock_directory", f) for f in files])
+        loader = SlowLoader()
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        result = loop.run_until_complete(pm.aload(loader, limit=3, suffix='!'))
+        self.assertEqual(result, [f + '!' for f in files])
+        self.assertEqual(loader.peak, 3)
+
+        async def collect():
+            return [item async for item in pm.aiter_load(loader, limit=2)]
+        result = loop.run_until_complete(collect())
+        self.assertCountEqual(result, [((f, r"C:\mock_directory"), f) for f in files])
+
+        with self.assertRaises(TypeError):
+            loop.run_until_complete(pm.aload(len))
+        with self.assertRaises(ValueError):
+            loop.run_until_complete(pm.aload(loader, limit=0))
+
+    def test_aload_find_result(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(3):
+                with open(os.path.join(tmp, f'x{i}.csv'), 'w') as file:
+                    file.write(f'a\n{i}\n')
+            pm = PathFinder({tmp: False}).find('x', 'csv', 'isin')
+            loop = asyncio.new_event_loop()
+            self.addCleanup(loop.close)
+
+            async def collect():
+                return [item async for item in pm.aiter_load(PDLoader, limit=2)]
+            result = loop.run_until_complete(collect())
+            self.assertCountEqual([(p, df['a'].tolist()) for p, df in result],
+                                  [((f'x{i}.csv', tmp), [i]) for i in range(3)])
+            result = loop.run_until_complete(pm.aload(PDLoader))
+            self.assertEqual([df['a'].tolist() for df in result],
+                             [[int(name[1])] for name, _ in pm.paths])
 
-    
 def suite():
     suite = unittest.TestSuite()
     suite.addTest(Test_PathManager('test_empty_init'))
     suite.addTest(Test_PathManager('test_select_paths'))
+    suite.addTest(Test_PathManager('test_select_paths_stat'))
+    suite.addTest(Test_PathManager('test_top'))
+    suite.addTest(Test_PathManager('test_duplicates'))
+    suite.addTest(Test_PathManager('test_save_open'))
+    suite.addTest(Test_PathManager('test_set_operations'))
     suite.addTest(Test_PathManager('test_groupby'))
     suite.addTest(Test_PathManager('test_load'))
+    suite.addTest(Test_PathManager('test_load_lazy'))
+    suite.addTest(Test_PathManager('test_load_telemetry'))
     suite.addTest(Test_PathManager('test_load_bad_loader'))
+    suite.addTest(Test_PathManager('test_schemas'))
+    suite.addTest(Test_PathManager('test_load_compact'))
+    suite.addTest(Test_PathManager('test_aload'))
+    suite.addTest(Test_PathManager('test_aload_find_result'))
     return suite
 
 if __name__ == '__main__':
@@ -0,0 +1,131 @@
+import unittest
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+from file_navigator import PathFinder, Q, Query
+from file_navigator.pathfinder import _PathManager
+from file_navigator.query import _Plan
+
+class TestQuery(unittest.TestCase):
+
+    def test_build(self):
+        query = Q.ext('.csv') & (Q.name('^EUR', 'regex') | ~Q.size(max=1024)) & Q.path('data', 'isin')
+        self.assertIsInstance(query, Query)
+        self.assertEqual(len(query.children), 3)
+        self.assertEqual(query.children[0].pattern, 'csv')
+        self.assertEqual(Q.size(1, None).pattern, (1, None))
+        with self.assertRaises(ValueError):
+            Q.name('EUR', 'unknown')
+        with self.assertRaises(TypeError):
+            Q.name('EUR') & 'csv'
+
+    def test_plan_order(self):
+        query = Q.size(min=1) & Q.name('^EUR', 'regex') & Q.ext('csv')
+        plan = _Plan(query)
+        self.assertEqual([c.field for c in plan.query.children], ['ext', 'name', 'size'])
+        self.assertTrue(plan.needs_stat)
+        self.assertFalse(_Plan(Q.ext('csv') | Q.name('EUR')).needs_stat)
+        with self.assertRaises(TypeError):
+            _Plan('csv')
+
+    def test_plan_prune(self):
+        plan = _Plan(Q.ext('csv') & ~Q.path('__skip__', 'isin'))
+        self.assertTrue(plan.prunes(os.path.join('data', '__skip__')))
+        self.assertFalse(plan.prunes('data'))
+        self.assertFalse(_Plan(Q.ext('csv') | ~Q.path('__skip__', 'isin')).prunes('__skip__'))
+
+        # directories that no path below can match are pruned
+        x = os.path.join('data', 'x')
+        plan = _Plan(Q.ext('csv') & Q.path(x, 'startswith'))
+        self.assertFalse(plan.prunes('data'))
+        self.assertFalse(plan.prunes(os.path.join(x, 'deep')))
+        self.assertTrue(plan.prunes(os.path.join('data', 'y')))
+        self.assertFalse(plan.prunes(os.path.join('data', 'xy')))
+        self.assertFalse(_Plan(Q.path(x, 'startswith') | Q.ext('csv')).prunes('other'))
+        plan = _Plan(Q.path(x))
+        self.assertFalse(plan.prunes('data'))
+        self.assertTrue(plan.prunes(os.path.join(x, 'deep')))
+        self.assertTrue(plan.prunes(os.path.join('data', 'xy')))
+        # a directory deeper down can always contain the pattern
+        self.assertFalse(_Plan(Q.path(x, 'isin')).prunes(os.path.join('data', 'y')))
+
+    def test_find_query(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, '__skip__', 'nested'))
+            os.makedirs(os.path.join(tmp, 'keep'))
+            files = {('keep', 'EURGBP.csv'): 10, ('keep', 'usd.csv'): 0, ('keep', 'EURUSD.txt'): 5,
+                     ('__skip__', 'EURJPY.csv'): 1, (os.path.join('__skip__', 'nested'), 'EURCHF.csv'): 1,
+                     ('.', 'EURPLN.csv'): 3}
+            for (root, file), size in files.items():
+                Path(tmp, root, file).write_bytes(b'x' * size)
+            pf = PathFinder({tmp: True})
+
+            query = Q.ext('csv') & Q.name('^EUR', 'regex') & ~Q.path('__skip__', 'isin')
+            expected = ['EURGBP.csv', 'EURPLN.csv']
+            self.assertCountEqual([p[0] for p in pf.find(query).paths], expected)
+            self.assertCountEqual([p[0] for p in pf.find(query, processes=2).paths], expected)
+            self.assertCountEqual([p[0] for p in pf.find(query, size=(5, None)).paths],
+                                  ['EURGBP.csv'])
+
+            query = Q.ext('txt') | (Q.size(max=0) & Q.path('keep', 'endswith'))
+            self.assertCountEqual([p[0] for p in pf.find(query).paths], ['EURUSD.txt', 'usd.csv'])
+
+            with self.assertRaises(TypeError):
+                pf.find(Q.name('EURGBP'), 'csv')
+            with self.assertRaises(TypeError):
+                pf.find('EURGBP')
+
+    def test_find_prune_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for root in ('x', os.path.join('x', 'deep'), 'y', os.path.join('y', 'deep'), 'xy'):
+                os.makedirs(os.path.join(tmp, root), exist_ok=True)
+                Path(tmp, root, 'a.csv').touch()
+            x = os.path.join(tmp, 'x')
+            pf = PathFinder({tmp: True})
+
+            y = ['y', os.path.join('y', 'deep')]
+            for match_type, expected, pruned in (
+                    ('startswith', [x, os.path.join(x, 'deep'), x + 'y'], y),
+                    ('eq', [x], y + [os.path.join('x', 'deep'), 'xy'])):
+                for kwargs in ({}, {'track': True}, {'dir_timeout': 10}):
+                    with self.subTest(match_type = match_type, kwargs = kwargs):
+                        with patch('file_navigator.pathfinder.os.scandir',
+                                   wraps=os.scandir) as scandir:
+                            result = pf.find(Q.ext('csv') & Q.path(x, match_type), **kwargs)
+                        self.assertCountEqual([p[1] for p in result.paths], expected)
+                        scanned = {os.fspath(c.args[0]) for c in scandir.call_args_list}
+                        self.assertIn(tmp, scanned)
+                        self.assertFalse(scanned & {os.path.join(tmp, d) for d in pruned})
+
+    def test_select_paths_query(self):
+        pm = _PathManager([('data', 'EURGBP.csv'), ('data', 'eurusd.txt'), ('other', 'EURPLN.csv')])
+        query = Q.path('data') & (Q.ext('csv') | Q.name('usd', 'isin'))
+        self.assertEqual(pm.select_paths(query).paths,
+                         [('EURGBP.csv', 'data'), ('eurusd.txt', 'data')])
+        self.assertEqual(pm.select_paths(~Q.path('data')).paths, [('EURPLN.csv', 'other')])
+
+    def test_compound_ext(self):
+        pm = _PathManager([('data', 'events.csv.gz'), ('data', 'report.2019.csv'),
+                           ('data', 'dump.gz'), ('data', 'events.json.zst')])
+        self.assertEqual(pm.select_paths(Q.ext('.csv.gz')).paths, [('events.csv.gz', 'data')])
+        self.assertEqual(pm.select_paths(Q.ext('csv')).paths, [('report.2019.csv', 'data')])
+        self.assertEqual(pm.select_paths(Q.name('events') & Q.ext('csv.gz|.json.zst', 'regex')).paths,
+                         [('events.csv.gz', 'data'), ('events.json.zst', 'data')])
+        self.assertEqual(pm.select_paths(Q.ext('gz')).paths, [('dump.gz', 'data')])
+        self.assertCountEqual(pm.groupby('ext'), ['.csv.gz', '.csv', '.gz', '.json.zst'])
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(TestQuery('test_build'))
+    suite.addTest(TestQuery('test_plan_order'))
+    suite.addTest(TestQuery('test_plan_prune'))
+    suite.addTest(TestQuery('test_find_query'))
+    suite.addTest(TestQuery('test_find_prune_path'))
+    suite.addTest(TestQuery('test_select_paths_query'))
+    suite.addTest(TestQuery('test_compound_ext'))
+    return suite
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())